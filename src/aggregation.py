@@ -0,0 +1,282 @@
+"""
+Spatial Aggregation Module
+Bins buildings into a square or hexagonal grid and summarizes attributes
+per cell, for city-wide overview maps.
+
+Cells are assigned by vectorized integer binning of the building centroids
+(no geometric predicates). The grid is anchored at the origin of the
+coordinate system, so cell ids are stable across datasets. The binning is
+computed once per grid shape and cell size and reused for every metric.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+
+GRID_SHAPES = ('square', 'hex')
+
+SQRT3 = np.sqrt(3.0)
+
+
+# ============================================================================
+# Binning
+# ============================================================================
+
+def square_bins(coords: np.ndarray, cell: float) -> np.ndarray:
+    """
+    Integer column/row of the square cell containing each point.
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        (n, 2) array of x, y coordinates
+    cell : float
+        Cell width in CRS units
+
+    Returns
+    -------
+    np.ndarray
+        (n, 2) int64 array of cell indices
+    """
+    return np.floor(coords / cell).astype(np.int64)
+
+
+def hex_bins(coords: np.ndarray, cell: float) -> np.ndarray:
+    """
+    Axial coordinates of the pointy-top hexagon containing each point.
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        (n, 2) array of x, y coordinates
+    cell : float
+        Distance between neighbouring hexagon centres (flat-to-flat width)
+
+    Returns
+    -------
+    np.ndarray
+        (n, 2) int64 array of axial (q, r) coordinates
+    """
+    size = cell / SQRT3  # circumradius
+    q = (SQRT3 / 3 * coords[:, 0] - coords[:, 1] / 3) / size
+    r = (2 / 3 * coords[:, 1]) / size
+    s = -q - r
+
+    # Cube rounding: round all three, then fix the one that moved most
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return np.column_stack((rq, rr)).astype(np.int64)
+
+
+def cell_centers(cells: np.ndarray, cell: float, shape: str) -> np.ndarray:
+    """Centre coordinates of grid cells given by `square_bins`/`hex_bins`."""
+    if shape == 'hex':
+        size = cell / SQRT3
+        x = size * (SQRT3 * cells[:, 0] + SQRT3 / 2 * cells[:, 1])
+        y = size * 1.5 * cells[:, 1]
+        return np.column_stack((x, y))
+    return (cells + 0.5) * cell
+
+
+def cell_polygons(cells: np.ndarray, cell: float, shape: str) -> np.ndarray:
+    """
+    Polygons of grid cells (vectorized construction).
+
+    Returns
+    -------
+    np.ndarray
+        Shapely polygons, one per cell
+    """
+    if shape == 'hex':
+        centers = cell_centers(cells, cell, shape)
+        angles = np.radians(30 + 60 * np.arange(7))  # closed ring
+        size = cell / SQRT3
+        rings = np.stack((
+            centers[:, 0:1] + size * np.cos(angles),
+            centers[:, 1:2] + size * np.sin(angles),
+        ), axis=-1)
+        return shapely.polygons(rings)
+
+    lower = cells * cell
+    return shapely.box(lower[:, 0], lower[:, 1], lower[:, 0] + cell, lower[:, 1] + cell)
+
+
+# ============================================================================
+# Aggregation
+# ============================================================================
+
+class GridAggregator:
+    """
+    Aggregate building attributes over square or hexagonal grids.
+
+    The cell assignment of every building is computed once per
+    (shape, cell size) and kept in a small LRU cache, so aggregating
+    further metrics on the same grid only costs one `np.bincount` each.
+    """
+
+    def __init__(
+        self,
+        buildings_gdf: gpd.GeoDataFrame,
+        cache_size: int = 16,
+        centroids: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize the aggregator.
+
+        Parameters
+        ----------
+        buildings_gdf : gpd.GeoDataFrame
+            Buildings in a projected CRS
+        cache_size : int
+            Number of grid binnings kept in memory
+        centroids : np.ndarray, optional
+            Precomputed (n, 2) centroid coordinates (NaN for buildings
+            without geometry)
+        """
+        self.buildings = buildings_gdf
+        self.crs = buildings_gdf.crs
+        if centroids is None:
+            points = shapely.centroid(buildings_gdf.geometry.values)
+            self.coords = shapely.get_coordinates(points)
+            self._valid = ~shapely.is_empty(points) & ~shapely.is_missing(points)
+        else:
+            centroids = np.asarray(centroids, dtype=float)
+            self._valid = np.isfinite(centroids).all(axis=1)
+            self.coords = centroids[self._valid]
+        self.cache_size = cache_size
+        self._bins: "OrderedDict[Tuple[str, float], Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bins(self, cell: float, shape: str = 'square') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cell assignment of the buildings.
+
+        Parameters
+        ----------
+        cell : float
+            Cell size in CRS units
+        shape : str
+            'square' or 'hex'
+
+        Returns
+        -------
+        cells : np.ndarray
+            (m, 2) int64 indices of the non-empty cells
+        inverse : np.ndarray
+            Cell number of each building (-1 for buildings without geometry)
+        """
+        if shape not in GRID_SHAPES:
+            raise ValueError(f"Unknown grid shape: {shape}")
+        if not cell > 0:
+            raise ValueError("Cell size must be positive")
+
+        key = (shape, float(cell))
+        with self._lock:
+            if key in self._bins:
+                self._bins.move_to_end(key)
+                return self._bins[key]
+
+        binner = hex_bins if shape == 'hex' else square_bins
+        indices = binner(self.coords, cell)
+        cells, inverse = np.unique(indices, axis=0, return_inverse=True)
+        full_inverse = np.full(len(self.buildings), -1, dtype=np.int64)
+        full_inverse[self._valid] = inverse.ravel()
+
+        result = (cells, full_inverse)
+        with self._lock:
+            self._bins[key] = result
+            self._bins.move_to_end(key)
+            while len(self._bins) > self.cache_size:
+                self._bins.popitem(last=False)
+        return result
+
+    def aggregate(
+        self,
+        cell: float,
+        metrics: Sequence[str],
+        shape: str = 'square'
+    ) -> gpd.GeoDataFrame:
+        """
+        Count buildings and sum/average metrics per grid cell.
+
+        Parameters
+        ----------
+        cell : float
+            Cell size in CRS units (meters for EPSG:28992)
+        metrics : Sequence[str]
+            Numeric columns to summarize
+        shape : str
+            'square' or 'hex'
+
+        Returns
+        -------
+        gpd.GeoDataFrame
+            One row per non-empty cell with `cell_x`, `cell_y` (cell
+            indices), `count`, and `<metric>_sum` / `<metric>_mean`
+            (mean over buildings with a value), with the cell polygons
+        """
+        missing = [m for m in metrics if m not in self.buildings.columns]
+        if missing:
+            raise KeyError(f"Unknown metric: {', '.join(missing)}")
+
+        cells, inverse = self.bins(cell, shape)
+        valid = inverse >= 0
+        bins = inverse[valid]
+
+        data: Dict[str, np.ndarray] = {
+            "cell_x": cells[:, 0],
+            "cell_y": cells[:, 1],
+            "count": np.bincount(bins, minlength=len(cells)),
+        }
+        for metric in metrics:
+            values = pd.to_numeric(self.buildings[metric], errors='coerce').to_numpy(dtype=float)[valid]
+            present = ~np.isnan(values)
+            sums = np.bincount(bins, weights=np.where(present, values, 0.0), minlength=len(cells))
+            counts = np.bincount(bins, weights=present, minlength=len(cells))
+            data[f"{metric}_sum"] = sums
+            with np.errstate(invalid='ignore', divide='ignore'):
+                data[f"{metric}_mean"] = np.where(counts > 0, sums / counts, np.nan)
+
+        return gpd.GeoDataFrame(
+            data, geometry=cell_polygons(cells, cell, shape), crs=self.crs
+        )
+
+
+def aggregate_buildings(
+    buildings_gdf: gpd.GeoDataFrame,
+    cell: float,
+    metrics: Optional[List[str]] = None,
+    shape: str = 'square'
+) -> gpd.GeoDataFrame:
+    """
+    Aggregate buildings over a grid (one-off helper around GridAggregator).
+
+    Parameters
+    ----------
+    buildings_gdf : gpd.GeoDataFrame
+        Buildings in a projected CRS
+    cell : float
+        Cell size in CRS units
+    metrics : List[str], optional
+        Numeric columns to summarize (default: solar_potential_kwh)
+    shape : str
+        'square' or 'hex'
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        Per-cell counts, sums and means with cell polygons
+    """
+    return GridAggregator(buildings_gdf).aggregate(
+        cell, metrics or ['solar_potential_kwh'], shape
+    )
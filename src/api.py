@@ -4,56 +4,392 @@ Provides a geodata service for querying solar suitability results.
 """
 
 import os
+import base64
+import gzip
+import hmac
 import json
+import threading
+import time
+from functools import lru_cache, wraps
 from pathlib import Path
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, g, has_request_context, jsonify, request, send_file, stream_with_context
 from flask_cors import CORS
 import geopandas as gpd
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import numpy as np
+from pyproj import Transformer
+from shapely.geometry import Point, box
+
+from src.aggregation import GRID_SHAPES
+from src.dataset import BuildingsDataset, FileWatcher, load_buildings_dataset
+from src.http_cache import (
+    CachedResponse,
+    ResponseCache,
+    available_encodings,
+    choose_encoding,
+    iter_compressed,
+    make_etag,
+    normalize_query
+)
+from src.export import (
+    ARROW_STREAM_CONTENT_TYPE,
+    COLUMNAR_MEDIA_TYPES,
+    GEOJSON_SEQ_CONTENT_TYPE,
+    NDJSON_CONTENT_TYPE,
+    PARQUET_CONTENT_TYPE,
+    PYARROW_AVAILABLE,
+    feature_collection,
+    geometry_columns,
+    iter_arrow_stream,
+    iter_feature_collection,
+    iter_feature_lines,
+    iter_record_lines,
+    to_arrow_table,
+    to_parquet_bytes
+)
+from src.tiles import (
+    MVT_CONTENT_TYPE,
+    TILE_CONTENT_TYPES,
+    DirectoryTileStore,
+    is_valid_tile,
+    open_tile_store
+)
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for cross-origin requests
 
-# Global data storage
-buildings_data: Optional[gpd.GeoDataFrame] = None
-DATA_PATH = Path("data")
+# Global data storage: loaded lazily, exactly once per process
+DATA_PATH = Path(os.environ.get("SOLAR_API_DATA", "data"))
+_dataset: Optional[BuildingsDataset] = None
+_dataset_lock = threading.Lock()
+_threads_lock = threading.Lock()  # guards starting the loader/reload threads
+_load_thread: Optional[threading.Thread] = None
+_load_error: Optional[str] = None
+_process_start = time.perf_counter()
+
+# Hot reload: triggered by POST /admin/reload or by watching the ranked buildings file
+ADMIN_TOKEN = os.environ.get("SOLAR_API_ADMIN_TOKEN")
+WATCH_INTERVAL = float(os.environ.get("SOLAR_API_WATCH_INTERVAL", "5"))
+_reload_lock = threading.Lock()
+_reload_thread: Optional[threading.Thread] = None
+_reload_error: Optional[str] = None
+_file_watcher: Optional[FileWatcher] = None
+
+# Memory-mapped columnar dataset shared by all worker processes (see src.columnar)
+COLUMNAR_PATH = os.environ.get("SOLAR_API_COLUMNAR")
+
+# Vector tiles are rendered on demand; set SOLAR_API_TILE_CACHE to also keep them on disk
+TILE_CACHE_DIR = os.environ.get("SOLAR_API_TILE_CACHE")
 
+# Responses change only when the dataset is reloaded: cache them in memory
+# (SOLAR_API_CACHE_MB, 0 disables) and let clients revalidate with ETags
+CACHE_MAX_AGE = int(os.environ.get("SOLAR_API_CACHE_MAX_AGE", "60"))
+response_cache = ResponseCache(int(float(os.environ.get("SOLAR_API_CACHE_MB", "64")) * 1024 * 1024))
 
-def load_buildings_data():
-    """Load processed buildings data on startup."""
-    global buildings_data
+# Pre-generated tile pyramid (directory or .mbtiles) served as static files
+TILE_STORE_PATH = os.environ.get("SOLAR_API_TILES")
+tile_store = open_tile_store(TILE_STORE_PATH) if TILE_STORE_PATH else None
+
+
+def load_buildings_data(build_indexes: bool = False) -> bool:
+    """
+    Load processed buildings data and serve it.
     
-    # Try to load ranked buildings first (most complete dataset)
-    data_files = [
-        DATA_PATH / "ranked_buildings.json",
-        DATA_PATH / "buildings_with_solar_analysis.json",
-        DATA_PATH / "processed_buildings.json",
-        DATA_PATH / "ranked_test_buildings.json"  # Fallback to test data
-    ]
+    With `build_indexes`, all derived indexes are built before the new
+    dataset is swapped in, so no request pays for them.
+    """
+    global _dataset
+    dataset = load_buildings_dataset(
+        DATA_PATH, tile_cache_dir=TILE_CACHE_DIR, columnar_path=COLUMNAR_PATH
+    )
+    if build_indexes:
+        start = time.perf_counter()
+        dataset.build_indexes()
+        print(f"✓ Built dataset indexes in {time.perf_counter() - start:.2f}s")
     
-    for data_file in data_files:
-        if data_file.exists():
-            try:
-                buildings_data = gpd.read_file(data_file)
-                print(f"✓ Loaded {len(buildings_data)} buildings from {data_file}")
-                return True
-            except Exception as e:
-                print(f"✗ Failed to load {data_file}: {e}")
-                continue
+    # Single reference assignment: requests already holding the old dataset
+    # keep using it, new requests see the new one
+    _dataset = dataset
+    response_cache.clear()
+    return not dataset.is_empty
+
+
+def reload_buildings_data() -> BuildingsDataset:
+    """Reload the data off the request path and swap it in atomically."""
+    global _reload_error
+    with _reload_lock:
+        try:
+            load_buildings_data(build_indexes=True)
+            _reload_error = None
+        except Exception as e:
+            _reload_error = str(e)
+            raise
+    return _dataset
+
+
+def start_reload() -> bool:
+    """Start a background reload; returns False if one is already running."""
+    global _reload_thread
+    with _threads_lock:
+        if _reload_thread is not None and _reload_thread.is_alive():
+            return False
+        _reload_thread = threading.Thread(
+            target=_background_reload, name="dataset-reload", daemon=True
+        )
+        _reload_thread.start()
+    return True
+
+
+def _background_reload():
+    try:
+        dataset = reload_buildings_data()
+        print(f"✓ Reloaded {len(dataset)} buildings (version {dataset.version})")
+    except Exception as e:
+        print(f"✗ Reload failed, still serving the previous data: {e}")
+
+
+def start_file_watcher(interval: float = WATCH_INTERVAL) -> FileWatcher:
+    """Reload the data whenever the ranked buildings file changes."""
+    global _file_watcher
+    if _file_watcher is None:
+        if COLUMNAR_PATH:
+            watched = Path(COLUMNAR_PATH) / "meta.json"
+        else:
+            watched = DATA_PATH / "ranked_buildings.json"
+        _file_watcher = FileWatcher(watched, start_reload, interval).start()
+    return _file_watcher
+
+
+def get_dataset() -> BuildingsDataset:
+    """
+    Get the served dataset, loading it on first use.
     
-    print("⚠ No buildings data found. API will return empty results.")
-    buildings_data = gpd.GeoDataFrame()
-    return False
+    Concurrent callers wait for the same load, so the data is parsed
+    exactly once per process. Within a request the first dataset returned
+    is kept in `flask.g`, so a reload landing mid-request does not mix
+    snapshots (e.g. a cache key of one version with the body of another).
+    """
+    if has_request_context() and 'dataset' in g:
+        return g.dataset
+    if _dataset is None:
+        with _dataset_lock:
+            if _dataset is None:
+                load_buildings_data()
+    dataset = _dataset
+    if has_request_context():
+        g.dataset = dataset
+    return dataset
+
+
+def get_buildings_data() -> gpd.GeoDataFrame:
+    """Get the served buildings GeoDataFrame."""
+    return get_dataset().frame
 
 
-# Load data when module is imported
-load_buildings_data()
+def _background_load():
+    global _load_error
+    try:
+        with _dataset_lock:
+            if _dataset is None:
+                load_buildings_data(build_indexes=True)
+        print(f"✓ Data ready {time.perf_counter() - _process_start:.2f}s after startup")
+    except Exception as e:
+        _load_error = str(e)
+        print(f"✗ Background data loading failed: {e}")
+
+
+def start_background_loading() -> threading.Thread:
+    """Start loading the dataset on a background thread (once)."""
+    global _load_thread
+    with _threads_lock:
+        if _load_thread is None:
+            _load_thread = threading.Thread(
+                target=_background_load, name="dataset-loader", daemon=True
+            )
+            _load_thread.start()
+    return _load_thread
+
+
+def serialize_buildings(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert buildings to JSON-ready records, excluding geometry.
+    
+    Geometry columns are dropped up front and the remaining columns are
+    converted in one vectorized pass instead of row by row.
+    """
+    return pd.DataFrame(frame.drop(columns=geometry_columns(frame))).to_dict(orient='records')
+
+
+def stream_response(chunks, mimetype: str, **headers) -> Response:
+    """Stream generated chunks to the client as they are produced."""
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers.update(headers)
+    return response
+
+
+def requested_format(default: str) -> str:
+    """
+    Output format of a bulk export.
+    
+    The `format` query parameter wins; otherwise the Arrow/Parquet media
+    types are honored when listed explicitly in the Accept header.
+    """
+    output_format = request.args.get('format', type=str)
+    if output_format:
+        return output_format.lower()
+    for mimetype, quality in request.accept_mimetypes:
+        if quality > 0 and mimetype in COLUMNAR_MEDIA_TYPES:
+            return COLUMNAR_MEDIA_TYPES[mimetype]
+    return default
+
+
+def columnar_response(frame: pd.DataFrame, output_format: str,
+                      include_geometry: bool, **headers) -> Response:
+    """Send buildings as an Arrow IPC stream or a (Geo)Parquet file."""
+    if not PYARROW_AVAILABLE:
+        return jsonify({"error": "Arrow and Parquet output require pyarrow"}), 406
+    
+    if output_format == 'arrow':
+        table = to_arrow_table(frame, include_geometry=include_geometry)
+        return stream_response(iter_arrow_stream(table), ARROW_STREAM_CONTENT_TYPE, **headers)
+    
+    response = Response(
+        to_parquet_bytes(frame, include_geometry=include_geometry),
+        mimetype=PARQUET_CONTENT_TYPE
+    )
+    response.headers.update(headers)
+    return response
+
+
+def _cache_while_streaming(chunks, key: str, entry: CachedResponse, version: str):
+    """
+    Yield the chunks of a streamed body while copying them into the cache.
+    
+    Chunks are sent as soon as they are produced. The copied body is
+    cached only once the stream has completed within the entry size limit;
+    larger or aborted streams are not cached, and neither are streams that
+    finish after the dataset `version` they were built from was replaced.
+    """
+    copied = []
+    size = 0
+    for chunk in chunks:
+        if copied is not None:
+            size += len(chunk)
+            if size <= response_cache.max_entry_bytes:
+                copied.append(chunk)
+            else:
+                copied = None
+        yield chunk
+    
+    # A reload has cleared the cache: the old version's key is never hit again
+    if copied is not None and _dataset is not None and _dataset.version == version:
+        entry.body = b"".join(copied)
+        response_cache.put(key, entry)
+
+
+def _set_cache_headers(response: Response, etag: str) -> Response:
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = CACHE_MAX_AGE
+    response.vary.add('Accept')
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def _send_cached(key: str, entry: CachedResponse, cache_status: str) -> Response:
+    """Send a cached body, compressed once per encoding and kept in the cache."""
+    encoding = choose_encoding(request.accept_encodings, entry.mimetype, len(entry.body))
+    if encoding is None:
+        body = entry.body
+    else:
+        body = response_cache.get_encoded(key, entry, encoding)
+    
+    response = Response(body, mimetype=entry.mimetype)
+    response.headers.update(entry.headers)
+    if encoding is not None:
+        # Each representation gets its own strong ETag
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f"{entry.etag}-{encoding}")
+    response.headers['X-Cache'] = cache_status
+    return response
+
+
+def _send_uncached(response: Response) -> Response:
+    """Send a body too large for the cache, compressing it while it streams."""
+    encoding = choose_encoding(request.accept_encodings, response.mimetype)
+    if encoding is not None:
+        etag, _ = response.get_etag()
+        response.response = iter_compressed(response.iter_encoded(), encoding)
+        response.headers.pop('Content-Length', None)
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f"{etag}-{encoding}")
+    response.headers['X-Cache'] = 'MISS'
+    return response
+
+
+def cached_response(view):
+    """
+    Serve a GET endpoint from the in-process response cache, with ETags.
+    
+    The ETag is derived from the dataset version, the path, the normalized
+    query parameters and the negotiated format, so it is known before the
+    view runs: `If-None-Match` requests are answered with 304 directly, and
+    successful responses are cached until they are evicted or the dataset
+    is reloaded. Streamed bodies are sent as they are produced and copied
+    into the cache on the way. Bodies are compressed according to
+    `Accept-Encoding`; the compressed variants of cached bodies are cached
+    too, so each is only compressed once.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        dataset = get_dataset()  # pinned for the view through flask.g
+        key = "\x1f".join((
+            dataset.version,
+            request.path,
+            normalize_query(request.args.items(multi=True)),
+            requested_format('')
+        ))
+        etag = make_etag(key)
+        
+        for tag in [etag] + [f"{etag}-{encoding}" for encoding in available_encodings()]:
+            if request.if_none_match.contains(tag):
+                return _set_cache_headers(Response(status=304), tag)
+        
+        entry = response_cache.get(key)
+        if entry is not None:
+            return _send_cached(key, entry, 'HIT')
+        
+        response = app.make_response(view(*args, **kwargs))
+        if response.status_code != 200:
+            return response
+        _set_cache_headers(response, etag)
+        
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name not in ('Content-Type', 'Content-Length')
+        }
+        entry = CachedResponse(b"", response.mimetype, etag, headers)
+        if response.is_streamed:
+            # Keep streaming; the body is cached once it has been sent
+            response.response = _cache_while_streaming(
+                response.iter_encoded(), key, entry, dataset.version
+            )
+            return _send_uncached(response)
+        
+        entry.body = response.get_data()
+        if not response_cache.put(key, entry):
+            return _send_uncached(response)
+        return _send_cached(key, entry, 'MISS')
+    
+    return wrapper
 
 
 @app.route('/')
 def home():
     """API home endpoint with documentation."""
+    # Report the current state without waiting for the data to load
+    buildings_data = _dataset.frame if _dataset is not None else None
     return jsonify({
         "name": "Solar Panel Suitability API",
         "version": "0.1.0",
@@ -64,12 +400,20 @@ def home():
             "/": "API documentation (this page)",
             "/health": "Health check endpoint",
             "/buildings": "Get all buildings with suitability scores (supports filtering)",
+            "/buildings/nearest": "Get the k buildings nearest to a WGS84 point",
+            "/buildings/within": "Get buildings within a radius (data CRS units) of a WGS84 point",
+            "/buildings/bbox": "Get buildings intersecting a WGS84 bounding box",
+            "/buildings/batch": "Get suitability records for a list of building IDs (POST)",
             "/buildings/<id>": "Get specific building details by ID",
             "/buildings/<id>/suitability": "Get detailed suitability analysis for a building",
             "/buildings/<id>/geojson": "Get building geometry as GeoJSON",
             "/priority": "Get priority list of top suitable buildings",
             "/stats": "Get summary statistics of the dataset",
-            "/map/geojson": "Export filtered buildings as GeoJSON for mapping"
+            "/map/geojson": "Export filtered buildings as GeoJSON for mapping",
+            "/aggregate": "Building counts, sums and means per square or hex grid cell",
+            "/admin/reload": "Reload the served dataset without downtime (POST)",
+            "/tiles/<z>/<x>/<y>.mvt": "Building footprints as Mapbox Vector Tiles",
+            "/tiles/<z>/<x>/<y>.png": "Pre-rendered choropleth raster tiles"
         },
         "query_parameters": {
             "/buildings": {
@@ -79,10 +423,32 @@ def home():
                 "min_energy": "Minimum energy potential (kWh)",
                 "category": "Suitability category (Excellent, Good, Moderate, Poor, Unsuitable)",
                 "limit": "Maximum number of results",
-                "offset": "Offset for pagination"
+                "offset": "Offset for pagination",
+                "cursor": "Keyset pagination cursor (empty for the first page)",
+                "format": "json, ndjson, arrow or parquet"
+            },
+            "/aggregate": {
+                "cell": "Cell size in meters (default 250)",
+                "metric": "Numeric column(s) to aggregate (default solar_potential_kwh)",
+                "shape": "square (default) or hex"
             },
             "/priority": {
                 "top_n": "Number of top buildings to return (default 100)"
+            },
+            "/buildings/nearest": {
+                "lon": "Longitude (WGS84)",
+                "lat": "Latitude (WGS84)",
+                "k": "Number of buildings (default 10)"
+            },
+            "/buildings/within": {
+                "lon": "Longitude (WGS84)",
+                "lat": "Latitude (WGS84)",
+                "radius": "Search radius in data CRS units (meters for EPSG:28992)",
+                "limit": "Maximum number of results (default 1000)"
+            },
+            "/buildings/bbox": {
+                "min_lon, min_lat, max_lon, max_lat": "Bounding box (WGS84)",
+                "limit": "Maximum number of results (default 1000)"
             }
         }
     })
@@ -90,11 +456,131 @@ def home():
 
 @app.route('/health')
 def health_check():
-    """Health check endpoint."""
+    """
+    Health check endpoint.
+    
+    Reports readiness without blocking: the first call starts loading the
+    data in the background and returns 503 until it is ready.
+    """
+    dataset = _dataset
+    if dataset is None:
+        start_background_loading()
+        status = "failed" if _load_error else "loading"
+        return jsonify({
+            "status": status,
+            "ready": False,
+            "data_loaded": False,
+            "buildings_count": 0,
+            "error": _load_error
+        }), 503
+    
     return jsonify({
         "status": "healthy",
-        "data_loaded": buildings_data is not None and len(buildings_data) > 0,
-        "buildings_count": len(buildings_data) if buildings_data is not None else 0
+        "ready": True,
+        "data_loaded": not dataset.is_empty,
+        "buildings_count": len(dataset),
+        "data_source": str(dataset.source) if dataset.source else None,
+        "load_seconds": round(dataset.load_seconds, 3),
+        "data_version": dataset.version,
+        "reloading": _reload_thread is not None and _reload_thread.is_alive(),
+        "reload_error": _reload_error,
+        "response_cache": response_cache.info()
+    })
+
+
+# Maximum page size of keyset pagination
+MAX_PAGE_SIZE = 10000
+
+
+def filter_mask(frame: pd.DataFrame, min_score: Optional[float] = None,
+                max_score: Optional[float] = None, min_area: Optional[float] = None,
+                min_energy: Optional[float] = None,
+                category: Optional[str] = None) -> np.ndarray:
+    """Boolean mask of the rows matching the /buildings attribute filters."""
+    mask = np.ones(len(frame), dtype=bool)
+    
+    if min_score is not None and 'suitability_score' in frame.columns:
+        mask &= (frame['suitability_score'] >= min_score).to_numpy()
+    
+    if max_score is not None and 'suitability_score' in frame.columns:
+        mask &= (frame['suitability_score'] <= max_score).to_numpy()
+    
+    if min_area is not None and 'roof_area_m2' in frame.columns:
+        mask &= (frame['roof_area_m2'] >= min_area).to_numpy()
+    
+    if min_energy is not None and 'solar_potential_kwh' in frame.columns:
+        mask &= (frame['solar_potential_kwh'] >= min_energy).to_numpy()
+    
+    if category and 'category' in frame.columns:
+        mask &= (frame['category'] == category).to_numpy()
+    
+    return mask
+
+
+def encode_cursor(score: float, building_id: str) -> str:
+    """Opaque pagination cursor for the key of the last building of a page."""
+    payload = json.dumps([score, building_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    """Decode a pagination cursor into (score, building_id); raises ValueError."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        score, building_id = json.loads(payload)
+        return float(score), str(building_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_page(dataset: BuildingsDataset, cursor: str, limit: int,
+                filters: Dict[str, Any]):
+    """
+    Build a /buildings page by keyset pagination.
+    
+    Pages walk the precomputed (score descending, building id) order from
+    the position of the cursor key, filtering chunk by chunk, so a page
+    costs O(page size) however deep it is. Cursors hold the key rather
+    than a position and stay valid across dataset reloads.
+    """
+    buildings_data = dataset.frame
+    limit = max(0, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        try:
+            start = dataset.keyset_position(*decode_cursor(cursor))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+    else:
+        start = 0
+    
+    order, neg_scores, ids = dataset.keyset
+    selected = []
+    count = 0
+    position = start
+    chunk_size = max(4 * limit, 256)
+    while count < limit and position < len(order):
+        chunk = order[position:position + chunk_size]
+        matched = np.flatnonzero(filter_mask(buildings_data.iloc[chunk], **filters))
+        take = matched[:limit - count]
+        selected.append(position + take)
+        count += len(take)
+        position = position + take[-1] + 1 if count >= limit else position + len(chunk)
+    
+    keys = np.concatenate(selected) if selected else np.array([], dtype=np.int64)
+    page = buildings_data.iloc[order[keys]]
+    results = serialize_buildings(page)
+    
+    next_cursor = None
+    if count >= limit and len(keys) > 0 and position < len(order):
+        last = keys[-1]
+        next_cursor = encode_cursor(float(-neg_scores[last]), str(ids[last]))
+    
+    return jsonify({
+        "limit": limit,
+        "cursor": cursor,
+        "next_cursor": next_cursor,
+        "count": len(results),
+        "buildings": results
     })
 
 
@@ -109,51 +595,59 @@ def get_buildings():
     - min_area: Minimum roof area (m²)
     - min_energy: Minimum energy potential (kWh)
     - category: Suitability category
-    - limit: Maximum number of results (default 100)
+    - limit: Maximum number of results (default 100; all rows for ndjson)
     - offset: Offset for pagination (default 0)
+    - cursor: Keyset pagination by score (descending) and building id;
+      pass an empty cursor for the first page, then `next_cursor`
+      (JSON only, not combined with offset)
+    - format: `json` (default), `ndjson` to stream one record per line,
+      or `arrow` / `parquet` for columnar output (also selected with the
+      Accept header)
     """
+    buildings_data = get_buildings_data()
     if buildings_data is None or len(buildings_data) == 0:
         return jsonify({"error": "No data loaded", "buildings": []}), 404
     
+    output_format = requested_format('json')
+    if output_format not in ('json', 'ndjson', 'arrow', 'parquet'):
+        return jsonify({"error": f"Unsupported format: {output_format}"}), 400
+    bulk_export = output_format != 'json'
+    
     # Get query parameters
     min_score = request.args.get('min_score', type=float)
     max_score = request.args.get('max_score', type=float)
     min_area = request.args.get('min_area', type=float)
     min_energy = request.args.get('min_energy', type=float)
     category = request.args.get('category', type=str)
-    limit = request.args.get('limit', 100, type=int)
+    limit = request.args.get('limit', None if bulk_export else 100, type=int)
     offset = request.args.get('offset', 0, type=int)
     
-    # Filter data
-    filtered = buildings_data.copy()
-    
-    if min_score is not None and 'suitability_score' in filtered.columns:
-        filtered = filtered[filtered['suitability_score'] >= min_score]
-    
-    if max_score is not None and 'suitability_score' in filtered.columns:
-        filtered = filtered[filtered['suitability_score'] <= max_score]
+    filters = dict(min_score=min_score, max_score=max_score, min_area=min_area,
+                   min_energy=min_energy, category=category)
     
-    if min_area is not None and 'roof_area_m2' in filtered.columns:
-        filtered = filtered[filtered['roof_area_m2'] >= min_area]
+    cursor = request.args.get('cursor', type=str)
+    if cursor is not None:
+        if output_format != 'json':
+            return jsonify({"error": "Parameter 'cursor' is only supported with format=json"}), 400
+        if 'offset' in request.args:
+            return jsonify({"error": "Parameters 'cursor' and 'offset' cannot be combined"}), 400
+        return keyset_page(get_dataset(), cursor, limit, filters)
     
-    if min_energy is not None and 'solar_potential_kwh' in filtered.columns:
-        filtered = filtered[filtered['solar_potential_kwh'] >= min_energy]
-    
-    if category and 'category' in filtered.columns:
-        filtered = filtered[filtered['category'] == category]
+    # Filter data (boolean masks yield new frames; the served data is never modified)
+    filtered = buildings_data[filter_mask(buildings_data, **filters)]
     
     # Apply pagination
     total_results = len(filtered)
-    filtered = filtered.iloc[offset:offset+limit]
+    filtered = filtered.iloc[offset:offset + limit if limit is not None else None]
+    
+    headers = {'X-Total-Count': str(total_results)}
+    if output_format == 'ndjson':
+        return stream_response(iter_record_lines(filtered), NDJSON_CONTENT_TYPE, **headers)
+    if output_format in ('arrow', 'parquet'):
+        return columnar_response(filtered, output_format, include_geometry=False, **headers)
     
     # Convert to dict (exclude geometry for performance)
-    results = []
-    for idx, row in filtered.iterrows():
-        building = row.to_dict()
-        # Remove geometry from response
-        if 'geometry' in building:
-            del building['geometry']
-        results.append(building)
+    results = serialize_buildings(filtered)
     
     return jsonify({
         "total": total_results,
@@ -164,29 +658,148 @@ def get_buildings():
     })
 
 
+@lru_cache(maxsize=8)
+def get_transformer(crs: str) -> Transformer:
+    """Get a cached WGS84 -> data CRS transformer."""
+    return Transformer.from_crs("EPSG:4326", crs, always_xy=True)
+
+
+def _query_point(buildings_data: gpd.GeoDataFrame):
+    """Parse lon/lat query parameters into a point in the data CRS."""
+    lon = request.args.get('lon', type=float)
+    lat = request.args.get('lat', type=float)
+    if lon is None or lat is None:
+        return None
+    x, y = get_transformer(buildings_data.crs.to_string()).transform(lon, lat)
+    return Point(x, y)
+
+
+def _spatial_response(buildings_data, frame, distances=None, **query):
+    """Build the response for spatial queries (same records as /buildings)."""
+    results = serialize_buildings(frame[buildings_data.columns])
+    if distances is not None:
+        for building, distance in zip(results, distances):
+            building['distance_m'] = float(distance)
+    
+    return jsonify({
+        "query": query,
+        "count": len(results),
+        "buildings": results
+    })
+
+
+def _spatial_unavailable(buildings_data: gpd.GeoDataFrame):
+    """Return an error response if spatial queries cannot be served."""
+    if buildings_data is None or len(buildings_data) == 0:
+        return jsonify({"error": "No data loaded", "buildings": []}), 404
+    if buildings_data.crs is None:
+        return jsonify({"error": "Dataset has no CRS; spatial queries unavailable"}), 400
+    return None
+
+
+@app.route('/buildings/nearest', methods=['GET'])
+def get_nearest_buildings():
+    """
+    Get the buildings nearest to a point.
+    
+    Query parameters:
+    - lon, lat: Query point (WGS84)
+    - k: Number of buildings to return (default 10)
+    """
+    dataset = get_dataset()
+    buildings_data = dataset.frame
+    error = _spatial_unavailable(buildings_data)
+    if error:
+        return error
+    
+    point = _query_point(buildings_data)
+    k = request.args.get('k', 10, type=int)
+    if point is None:
+        return jsonify({"error": "Parameters 'lon' and 'lat' are required"}), 400
+    if k <= 0:
+        return jsonify({"error": "Parameter 'k' must be positive"}), 400
+    
+    nearest = dataset.spatial_index.find_nearest_neighbors(point, k=min(k, len(buildings_data)))
+    return _spatial_response(
+        buildings_data, nearest, nearest['distance'],
+        lon=request.args.get('lon', type=float), lat=request.args.get('lat', type=float), k=k
+    )
+
+
+@app.route('/buildings/within', methods=['GET'])
+def get_buildings_within():
+    """
+    Get buildings whose centroid lies within a radius of a point.
+    
+    Query parameters:
+    - lon, lat: Query point (WGS84)
+    - radius: Search radius in the units of the dataset CRS (meters for
+      the projected EPSG:28992 data); it is not converted
+    - limit: Maximum number of results (default 1000)
+    """
+    dataset = get_dataset()
+    buildings_data = dataset.frame
+    error = _spatial_unavailable(buildings_data)
+    if error:
+        return error
+    
+    point = _query_point(buildings_data)
+    radius = request.args.get('radius', type=float)
+    limit = request.args.get('limit', 1000, type=int)
+    if point is None or radius is None:
+        return jsonify({"error": "Parameters 'lon', 'lat' and 'radius' are required"}), 400
+    if radius < 0:
+        return jsonify({"error": "Parameter 'radius' must not be negative"}), 400
+    
+    nearby = dataset.spatial_index.find_within_radius(point, radius).head(limit)
+    return _spatial_response(
+        buildings_data, nearby, nearby['distance'],
+        lon=request.args.get('lon', type=float), lat=request.args.get('lat', type=float),
+        radius=radius
+    )
+
+
+@app.route('/buildings/bbox', methods=['GET'])
+def get_buildings_in_bbox():
+    """
+    Get buildings whose footprint intersects a bounding box.
+    
+    Query parameters:
+    - min_lon, min_lat, max_lon, max_lat: Bounding box (WGS84)
+    - limit: Maximum number of results (default 1000)
+    """
+    dataset = get_dataset()
+    buildings_data = dataset.frame
+    error = _spatial_unavailable(buildings_data)
+    if error:
+        return error
+    
+    names = ('min_lon', 'min_lat', 'max_lon', 'max_lat')
+    bounds = [request.args.get(name, type=float) for name in names]
+    limit = request.args.get('limit', 1000, type=int)
+    if any(v is None for v in bounds):
+        return jsonify({"error": "Parameters 'min_lon', 'min_lat', 'max_lon' and 'max_lat' are required"}), 400
+    if bounds[0] > bounds[2] or bounds[1] > bounds[3]:
+        return jsonify({"error": "Invalid bounding box"}), 400
+    
+    transformer = get_transformer(buildings_data.crs.to_string())
+    query_box = box(*transformer.transform_bounds(*bounds))
+    
+    indices = np.sort(dataset.strtree.query(query_box, predicate='intersects'))[:limit]
+    return _spatial_response(buildings_data, buildings_data.iloc[indices], **dict(zip(names, bounds)))
+
+
 @app.route('/buildings/<building_id>', methods=['GET'])
 def get_building(building_id: str):
     """Get detailed information for a specific building."""
+    dataset = get_dataset()
+    buildings_data = dataset.frame
     if buildings_data is None or len(buildings_data) == 0:
         return jsonify({"error": "No data loaded"}), 404
     
-    # Try to find building by ID or index
-    building = None
-    
-    # Try by building_id column if exists
-    if 'building_id' in buildings_data.columns:
-        matches = buildings_data[buildings_data['building_id'].astype(str) == building_id]
-        if len(matches) > 0:
-            building = matches.iloc[0]
-    
-    # Try by index
-    if building is None:
-        try:
-            idx = int(building_id)
-            if 0 <= idx < len(buildings_data):
-                building = buildings_data.iloc[idx]
-        except ValueError:
-            pass
+    # Find building by ID or index
+    position = dataset.find_building(building_id)
+    building = buildings_data.iloc[position] if position is not None else None
     
     if building is None:
         return jsonify({"error": f"Building {building_id} not found"}), 404
@@ -203,6 +816,43 @@ def get_building(building_id: str):
     return jsonify(result)
 
 
+# Suitability record fields: output key -> (column, default)
+SUITABILITY_FIELDS = {
+    "suitability_score": ('suitability_score', 0.0),
+    "category": ('category', 'Unknown'),
+    "energy_potential_kwh": ('solar_potential_kwh', 0.0),
+    "roof_area_m2": ('roof_area_m2', 0.0),
+    "solar_irradiance": ('solar_irradiance', 0.0),
+    "shading_factor": ('shading_factor', 0.0),
+    "roof_orientation_deg": ('roof_orientation_deg', 0.0),
+    "annual_savings_eur": ('annual_savings_eur', 0.0),
+    "payback_period_years": ('payback_period_years', 0.0),
+}
+
+# Maximum number of ids per POST /buildings/batch request
+MAX_BATCH_SIZE = 10000
+
+
+def suitability_records(buildings_data: pd.DataFrame, positions,
+                        building_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Build suitability records for the buildings at the given row positions.
+    
+    Each field is extracted as one column array instead of row by row.
+    """
+    rows = buildings_data.iloc[np.asarray(positions, dtype=np.int64)]
+    fields = {"building_id": list(building_ids)}
+    for key, (column, default) in SUITABILITY_FIELDS.items():
+        if column not in rows.columns:
+            fields[key] = [default] * len(rows)
+        elif isinstance(default, str):
+            fields[key] = rows[column].astype(str).to_list()
+        else:
+            fields[key] = rows[column].to_numpy(dtype=float).tolist()
+    
+    return [dict(zip(fields, values)) for values in zip(*fields.values())]
+
+
 @app.route('/buildings/<building_id>/suitability', methods=['GET'])
 def get_building_suitability(building_id: str):
     """
@@ -219,75 +869,81 @@ def get_building_suitability(building_id: str):
     - annual_savings_eur: Annual cost savings
     - payback_period_years: Investment payback period
     """
+    dataset = get_dataset()
+    buildings_data = dataset.frame
     if buildings_data is None or len(buildings_data) == 0:
         return jsonify({"error": "No data loaded"}), 404
     
     # Find building
-    building = None
-    if 'building_id' in buildings_data.columns:
-        matches = buildings_data[buildings_data['building_id'].astype(str) == building_id]
-        if len(matches) > 0:
-            building = matches.iloc[0]
-    
-    if building is None:
-        try:
-            idx = int(building_id)
-            if 0 <= idx < len(buildings_data):
-                building = buildings_data.iloc[idx]
-        except ValueError:
-            pass
-    
-    if building is None:
+    position = dataset.find_building(building_id)
+    if position is None:
         return jsonify({"error": f"Building {building_id} not found"}), 404
     
     # Extract suitability metrics
-    suitability = {
-        "building_id": building_id,
-        "suitability_score": float(building.get('suitability_score', 0)),
-        "category": str(building.get('category', 'Unknown')),
-        "energy_potential_kwh": float(building.get('solar_potential_kwh', 0)),
-        "roof_area_m2": float(building.get('roof_area_m2', 0)),
-        "solar_irradiance": float(building.get('solar_irradiance', 0)),
-        "shading_factor": float(building.get('shading_factor', 0)),
-        "roof_orientation_deg": float(building.get('roof_orientation_deg', 0)),
-        "annual_savings_eur": float(building.get('annual_savings_eur', 0)),
-        "payback_period_years": float(building.get('payback_period_years', 0))
-    }
+    suitability = suitability_records(buildings_data, [position], [building_id])[0]
     
     return jsonify(suitability)
 
 
+@app.route('/buildings/batch', methods=['POST'])
+def get_buildings_batch():
+    """
+    Get the suitability records of many buildings in one request.
+    
+    Request body: `{"ids": [...]}` (or a JSON list of ids), at most
+    MAX_BATCH_SIZE ids. The ids are resolved with one vectorized lookup;
+    records are returned in request order, unknown ids in `not_found`.
+    """
+    payload = request.get_json(silent=True)
+    building_ids = payload.get('ids') if isinstance(payload, dict) else payload
+    if not isinstance(building_ids, list):
+        return jsonify({"error": "Request body must be a JSON list of ids or {\"ids\": [...]}"}), 400
+    if len(building_ids) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} ids per request"}), 400
+    
+    dataset = get_dataset()
+    buildings_data = dataset.frame
+    if buildings_data is None or len(buildings_data) == 0:
+        return jsonify({"error": "No data loaded", "buildings": []}), 404
+    
+    building_ids = [str(building_id) for building_id in building_ids]
+    positions = dataset.find_buildings(building_ids)
+    found = positions >= 0
+    
+    results = suitability_records(
+        buildings_data, positions[found],
+        [building_id for building_id, ok in zip(building_ids, found) if ok]
+    )
+    
+    return jsonify({
+        "requested": len(building_ids),
+        "count": len(results),
+        "buildings": results,
+        "not_found": [building_id for building_id, ok in zip(building_ids, found) if not ok]
+    })
+
+
 @app.route('/buildings/<building_id>/geojson', methods=['GET'])
+@cached_response
 def get_building_geojson(building_id: str):
     """Get building geometry as GeoJSON."""
+    dataset = get_dataset()
+    buildings_data = dataset.frame
     if buildings_data is None or len(buildings_data) == 0:
         return jsonify({"error": "No data loaded"}), 404
     
     # Find building
-    building = None
-    if 'building_id' in buildings_data.columns:
-        matches = buildings_data[buildings_data['building_id'].astype(str) == building_id]
-        if len(matches) > 0:
-            building = matches.iloc[0:1]  # Keep as GeoDataFrame
-    
-    if building is None or len(building) == 0:
-        try:
-            idx = int(building_id)
-            if 0 <= idx < len(buildings_data):
-                building = buildings_data.iloc[idx:idx+1]
-        except ValueError:
-            pass
-    
-    if building is None or len(building) == 0:
+    position = dataset.find_building(building_id)
+    if position is None:
         return jsonify({"error": f"Building {building_id} not found"}), 404
+    building = buildings_data.iloc[position:position+1]  # Keep as GeoDataFrame
     
     # Convert to GeoJSON
-    geojson = json.loads(building.to_json())
-    
-    return jsonify(geojson)
+    return Response(feature_collection(building), mimetype='application/json')
 
 
 @app.route('/priority', methods=['GET'])
+@cached_response
 def get_priority_list():
     """
     Get priority list of buildings for solar panel installation.
@@ -295,21 +951,16 @@ def get_priority_list():
     Query parameters:
     - top_n: Number of top buildings to return (default 100)
     """
+    dataset = get_dataset()
+    buildings_data = dataset.frame
     if buildings_data is None or len(buildings_data) == 0:
         return jsonify({"error": "No data loaded", "buildings": []}), 404
     
     top_n = request.args.get('top_n', 100, type=int)
     top_n = min(top_n, len(buildings_data))  # Cap at available buildings
     
-    # Sort by suitability score
-    if 'suitability_score' in buildings_data.columns:
-        sorted_buildings = buildings_data.sort_values('suitability_score', ascending=False)
-    elif 'rank' in buildings_data.columns:
-        sorted_buildings = buildings_data.sort_values('rank', ascending=True)
-    else:
-        sorted_buildings = buildings_data
-    
-    top_buildings = sorted_buildings.head(top_n)
+    # Precomputed order: suitability score (descending), else rank
+    top_buildings = buildings_data.iloc[dataset.score_order[:max(top_n, 0)]]
     
     # Convert to list
     results = []
@@ -340,72 +991,217 @@ def get_priority_list():
 
 
 @app.route('/stats', methods=['GET'])
+@cached_response
 def get_statistics():
     """Get summary statistics of the dataset."""
-    if buildings_data is None or len(buildings_data) == 0:
+    dataset = get_dataset()
+    if dataset.is_empty:
         return jsonify({"error": "No data loaded"}), 404
     
-    stats = {
-        "total_buildings": len(buildings_data),
-        "columns": list(buildings_data.columns)
-    }
-    
-    # Calculate statistics for numeric columns
-    numeric_cols = ['suitability_score', 'roof_area_m2', 'solar_potential_kwh', 
-                    'solar_irradiance', 'shading_factor', 'payback_period_years']
-    
-    for col in numeric_cols:
-        if col in buildings_data.columns:
-            stats[col] = {
-                "mean": float(buildings_data[col].mean()),
-                "median": float(buildings_data[col].median()),
-                "min": float(buildings_data[col].min()),
-                "max": float(buildings_data[col].max()),
-                "std": float(buildings_data[col].std())
-            }
+    # Computed once per dataset
+    return jsonify(dataset.stats)
+
+
+@app.route('/aggregate', methods=['GET'])
+@cached_response
+def aggregate_buildings_grid():
+    """
+    Aggregate buildings over a square or hexagonal grid.
+    
+    Query parameters:
+    - cell: Cell size in meters (default 250, between 10 and 10000)
+    - metric: Numeric column(s) to sum and average, comma separated
+      (default solar_potential_kwh)
+    - shape: `square` (default) or `hex`
     
-    # Category distribution
-    if 'category' in buildings_data.columns:
-        stats['category_distribution'] = buildings_data['category'].value_counts().to_dict()
+    Returns a GeoJSON FeatureCollection with one feature per non-empty
+    cell (count, <metric>_sum, <metric>_mean).
+    """
+    dataset = get_dataset()
+    buildings_data = dataset.frame
+    unavailable = _spatial_unavailable(buildings_data)
+    if unavailable is not None:
+        return unavailable
+    if buildings_data.crs.is_geographic:
+        return jsonify({"error": "Aggregation requires a projected CRS"}), 400
+    
+    cell = request.args.get('cell', 250.0, type=float)
+    shape = request.args.get('shape', 'square', type=str).lower()
+    metrics = [
+        m.strip() for m in request.args.get('metric', 'solar_potential_kwh', type=str).split(',')
+        if m.strip()
+    ]
+    if not 10 <= cell <= 10000:
+        return jsonify({"error": "cell must be between 10 and 10000 meters"}), 400
+    if shape not in GRID_SHAPES:
+        return jsonify({"error": f"shape must be one of: {', '.join(GRID_SHAPES)}"}), 400
     
-    return jsonify(stats)
+    if not metrics:
+        return jsonify({"error": "No metric given"}), 400
+    unknown = [
+        m for m in metrics
+        if m not in buildings_data.columns or not pd.api.types.is_numeric_dtype(buildings_data[m])
+    ]
+    if unknown:
+        return jsonify({"error": f"Unknown or non-numeric metric: {', '.join(unknown)}"}), 400
+    
+    cells = dataset.aggregator.aggregate(cell, metrics, shape)
+    return Response(feature_collection(cells), mimetype='application/json')
 
 
 @app.route('/map/geojson', methods=['GET'])
+@cached_response
 def export_geojson():
     """
     Export filtered buildings as GeoJSON for mapping.
     
-    Supports same filters as /buildings endpoint.
+    Supports same filters as /buildings endpoint. The FeatureCollection is
+    streamed in batches of features; `format=ndjson` streams one Feature
+    per line instead, `format=arrow` an Arrow IPC stream with WKB geometry
+    and `format=parquet` a GeoParquet file (all matching rows unless
+    `limit` is given).
     """
+    buildings_data = get_buildings_data()
     if buildings_data is None or len(buildings_data) == 0:
         return jsonify({"error": "No data loaded"}), 404
     
+    output_format = requested_format('geojson')
+    if output_format not in ('geojson', 'ndjson', 'arrow', 'parquet'):
+        return jsonify({"error": f"Unsupported format: {output_format}"}), 400
+    bulk_export = output_format != 'geojson'
+    
     # Get query parameters (same as /buildings)
-    min_score = request.args.get('min_score', type=float)
-    max_score = request.args.get('max_score', type=float)
-    category = request.args.get('category', type=str)
-    limit = request.args.get('limit', 1000, type=int)
+    limit = request.args.get('limit', None if bulk_export else 1000, type=int)
+    filters = dict(
+        min_score=request.args.get('min_score', type=float),
+        max_score=request.args.get('max_score', type=float),
+        category=request.args.get('category', type=str)
+    )
     
     # Filter data
-    filtered = buildings_data.copy()
+    filtered = buildings_data[filter_mask(buildings_data, **filters)]
     
-    if min_score is not None and 'suitability_score' in filtered.columns:
-        filtered = filtered[filtered['suitability_score'] >= min_score]
+    # Apply limit
+    if limit is not None:
+        filtered = filtered.head(limit)
     
-    if max_score is not None and 'suitability_score' in filtered.columns:
-        filtered = filtered[filtered['suitability_score'] <= max_score]
+    if output_format == 'ndjson':
+        return stream_response(iter_feature_lines(filtered), GEOJSON_SEQ_CONTENT_TYPE)
+    if output_format in ('arrow', 'parquet'):
+        return columnar_response(filtered, output_format, include_geometry=True)
     
-    if category and 'category' in filtered.columns:
-        filtered = filtered[filtered['category'] == category]
+    # Features are serialized batch by batch while the response is sent
+    return stream_response(iter_feature_collection(filtered), 'application/json')
+
+
+def serve_stored_tile(z: int, x: int, y: int, fmt: str):
+    """Serve a tile from the pre-generated tile store, or None if it is missing."""
+    if tile_store is None:
+        return None
     
-    # Apply limit
-    filtered = filtered.head(limit)
+    mimetype = TILE_CONTENT_TYPES[fmt]
+    if isinstance(tile_store, DirectoryTileStore):
+        path = tile_store.path(z, x, y, fmt)
+        if not path.exists():
+            return None
+        return send_file(path.resolve(), mimetype=mimetype, conditional=True, max_age=3600)
     
-    # Convert to GeoJSON
-    geojson = json.loads(filtered.to_json())
+    data = tile_store.get(z, x, y, fmt)
+    if data is None:
+        return None
+    
+    response = Response(data, mimetype=mimetype)
+    if fmt == 'mvt':
+        # MBTiles vector tiles are stored gzip-compressed
+        if request.accept_encodings['gzip'] > 0:
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response.set_data(gzip.decompress(data))
+        response.vary.add('Accept-Encoding')
+    response.cache_control.max_age = 3600
+    return response
+
+
+@app.route('/tiles/<int:z>/<int:x>/<int:y>.mvt', methods=['GET'])
+def get_vector_tile(z: int, x: int, y: int):
+    """
+    Get building footprints as a Mapbox Vector Tile.
+    
+    Tiles are served from the pre-generated tile store when configured,
+    otherwise footprints are clipped, simplified and quantized to the tile
+    grid on demand, with the suitability attributes attached.
+    Tiles without buildings return 204.
+    """
+    if not is_valid_tile(z, x, y):
+        return jsonify({"error": f"Tile {z}/{x}/{y} out of range"}), 404
+    
+    stored = serve_stored_tile(z, x, y, 'mvt')
+    if stored is not None:
+        return stored
+    
+    dataset = get_dataset()
+    if dataset.is_empty:
+        return jsonify({"error": "No data loaded"}), 404
+    
+    renderer = dataset.tile_renderer
+    if not renderer.min_zoom <= z <= renderer.max_zoom:
+        return jsonify({"error": f"Tile {z}/{x}/{y} out of range"}), 404
+    
+    tile = renderer.get_tile(z, x, y)
+    if not tile:
+        return Response(status=204)
     
-    return jsonify(geojson)
+    return Response(tile, mimetype=MVT_CONTENT_TYPE)
+
+
+@app.route('/tiles/<int:z>/<int:x>/<int:y>.png', methods=['GET'])
+def get_raster_tile(z: int, x: int, y: int):
+    """
+    Get a pre-rendered choropleth raster tile.
+    
+    Raster tiles are only served from the pre-generated tile store
+    (see `python -m src.tiles`). Missing tiles return 204.
+    """
+    if tile_store is None:
+        return jsonify({"error": "No pre-generated tiles configured"}), 404
+    if not is_valid_tile(z, x, y):
+        return jsonify({"error": f"Tile {z}/{x}/{y} out of range"}), 404
+    
+    stored = serve_stored_tile(z, x, y, 'png')
+    if stored is None:
+        return Response(status=204)
+    return stored
+
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """
+    Reload the served dataset without downtime.
+    
+    The new data and all derived indexes are built on a background thread
+    and swapped in atomically; requests keep being served from the current
+    data meanwhile. Pass `?wait=true` to block until the reload finished.
+    Disabled (404) unless SOLAR_API_ADMIN_TOKEN is set; requires a matching
+    `X-Admin-Token` header.
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({"error": "Endpoint not found"}), 404
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN):
+        return jsonify({"error": "Forbidden"}), 403
+    
+    if request.args.get('wait', 'false').lower() in ('1', 'true', 'yes'):
+        try:
+            dataset = reload_buildings_data()
+        except Exception as e:
+            return jsonify({"status": "failed", "error": str(e)}), 500
+        return jsonify({
+            "status": "reloaded",
+            "data_version": dataset.version,
+            "buildings_count": len(dataset)
+        })
+    
+    started = start_reload()
+    return jsonify({"status": "reloading" if started else "already_reloading"}), 202
 
 
 @app.errorhandler(404)
@@ -426,15 +1222,21 @@ def main():
     print("SOLAR PANEL SUITABILITY API")
     print("=" * 70)
     
-    # Load data
-    load_buildings_data()
+    # Load data in the background so the server starts accepting requests immediately
+    start_background_loading()
+    
+    # Optionally reload whenever the ranked buildings file changes
+    if os.environ.get("SOLAR_API_WATCH", "").lower() in ('1', 'true', 'yes'):
+        watcher = start_file_watcher()
+        print(f"Watching {watcher.path} for changes")
     
     # Run server
     print("\nStarting API server...")
     print("API Documentation: http://localhost:5000/")
     print("=" * 70)
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # No reloader: it would re-run the module in a child process and load the data twice
+    app.run(host='0.0.0.0', port=5000, debug=True, use_reloader=False)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,261 @@
+"""
+ASGI Serving Module
+Serves the Flask API behind an ASGI server (e.g. uvicorn).
+
+The Flask views run on a bounded thread pool. Response bodies are produced
+chunk by chunk on the pool and sent from the event loop, so a thread is
+only busy while it serializes: slow clients downloading large exports wait
+on the event loop without holding a worker thread, and do not block other
+requests.
+
+Usage:
+    python -m src.asgi --port 5000 --threads 16
+    uvicorn src.asgi:application --port 5000
+"""
+
+import argparse
+import asyncio
+import contextvars
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Optional imports for the ASGI server
+try:
+    import uvicorn
+    UVICORN_AVAILABLE = True
+except ImportError:
+    UVICORN_AVAILABLE = False
+
+
+# Worker threads running the Flask views (SOLAR_API_THREADS)
+DEFAULT_THREADS = int(os.environ.get("SOLAR_API_THREADS", str(min(32, (os.cpu_count() or 1) + 4))))
+
+_END = object()
+
+
+def build_environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """
+    Build a WSGI environ from an ASGI HTTP scope.
+
+    Parameters
+    ----------
+    scope : dict
+        ASGI connection scope
+    body : bytes
+        Complete request body
+
+    Returns
+    -------
+    dict
+        WSGI environ
+    """
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    root_path = scope.get("root_path", "")
+    path = scope["path"]
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root_path.encode("utf-8").decode("latin-1"),
+        "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]) if server[1] is not None else "80",
+        "REMOTE_ADDR": str(client[0]),
+        "REMOTE_PORT": str(client[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif name == "CONTENT_LENGTH":
+            environ["CONTENT_LENGTH"] = value
+        else:
+            key = f"HTTP_{name}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    if body and "CONTENT_LENGTH" not in environ:
+        # The body is read completely, so its length is known even for chunked uploads
+        environ["CONTENT_LENGTH"] = str(len(body))
+    return environ
+
+
+class ThreadPoolASGIApp:
+    """
+    ASGI application running a WSGI application on a thread pool.
+
+    Every call into the WSGI application (the view and each `next()` on
+    the response iterator) runs on the pool inside one context per
+    request, so Flask's request context is available to streamed
+    responses. Sending is awaited on the event loop between chunks.
+    """
+
+    def __init__(
+        self,
+        wsgi_app: Callable,
+        max_workers: Optional[int] = None,
+        on_startup: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Initialize the adapter.
+
+        Parameters
+        ----------
+        wsgi_app : callable
+            WSGI application
+        max_workers : int, optional
+            Size of the thread pool (default: SOLAR_API_THREADS)
+        on_startup : callable, optional
+            Called on ASGI lifespan startup
+        """
+        self.wsgi_app = wsgi_app
+        self.max_workers = max_workers or DEFAULT_THREADS
+        self.on_startup = on_startup
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="solar-api"
+            )
+        return self._executor
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    async def _lifespan(self, receive: Callable, send: Callable):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if self.on_startup is not None:
+                    self.on_startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        environ = build_environ(scope, b"".join(chunks))
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        started: List[Tuple[str, List[Tuple[str, str]]]] = []
+
+        def start_response(status, headers, exc_info=None):
+            started[:] = [(status, headers)]
+            return lambda data: None  # legacy write() is not supported
+
+        def run(func, *args):
+            # One context per request, entered by one pool thread at a time
+            return loop.run_in_executor(self.executor, context.run, func, *args)
+
+        result: Iterable[bytes] = await run(self.wsgi_app, environ, start_response)
+        try:
+            iterator = iter(result)
+            chunk = await run(next, iterator, _END)
+
+            status, headers = started[0]
+            await send({
+                "type": "http.response.start",
+                "status": int(status.split(" ", 1)[0]),
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in headers
+                ],
+            })
+            while chunk is not _END:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                chunk = await run(next, iterator, _END)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                await run(close)
+
+
+def create_asgi_app(max_workers: Optional[int] = None) -> ThreadPoolASGIApp:
+    """
+    Create the ASGI application serving the solar suitability API.
+
+    Data loading starts in the background on server startup, as with the
+    Flask development server.
+    """
+    from src.api import app, start_background_loading
+
+    return ThreadPoolASGIApp(app, max_workers=max_workers, on_startup=start_background_loading)
+
+
+def __getattr__(name: str):
+    # `src.asgi:application` for ASGI servers, created on first access
+    if name == "application":
+        global application
+        application = create_asgi_app()
+        return application
+    raise AttributeError(name)
+
+
+def main():
+    """Command line entry point: serve the API with uvicorn."""
+    parser = argparse.ArgumentParser(description="Serve the solar suitability API over ASGI")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS,
+                        help="worker threads running the Flask views")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    args = parser.parse_args()
+
+    if not UVICORN_AVAILABLE:
+        print("✗ uvicorn is required for ASGI serving: pip install uvicorn")
+        raise SystemExit(1)
+
+    print("=" * 70)
+    print("SOLAR PANEL SUITABILITY API (ASGI)")
+    print("=" * 70)
+    print(f"Serving on http://{args.host}:{args.port}/ with {args.threads} threads")
+
+    if args.workers == 1:
+        # This module is already imported, so the app is passed directly
+        application = create_asgi_app(max_workers=args.threads)
+    else:
+        # Worker processes import `src.asgi:application` and read the
+        # thread count from the environment
+        os.environ["SOLAR_API_THREADS"] = str(args.threads)
+        application = "src.asgi:application"
+    uvicorn.run(application, host=args.host, port=args.port,
+                workers=args.workers, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Columnar Dataset Module
+Materializes ranked buildings as a memory-mapped columnar dataset so that
+several API worker processes can share one read-only copy of the data.
+
+Layout of a `*.cols` directory:
+- meta.json                      column kinds, dtypes, CRS and dataset version
+- <column>.npy                   numeric / boolean / datetime columns
+- <column>.codes.npy             dictionary-encoded (string) columns
+- <column>.categories.json       dictionary of the encoded column
+- geometry.wkb.npy               WKB geometry buffer (uint8)
+- geometry.offsets.npy           start offset of each geometry in the buffer
+- index.<name>.npy               precomputed indexes (score order, centroids)
+
+Arrays are opened with `np.load(mmap_mode='r')`, so the operating system
+page cache holds a single copy shared by every process that maps them.
+Only the shapely geometry objects (decoded from the shared WKB buffer in
+batches) and the dictionaries of string columns are materialized per
+process.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+from src.ranking import score_order
+
+
+COLUMNAR_FORMAT_VERSION = 1
+
+# Geometries decoded per slice of the WKB buffer
+GEOMETRY_BATCH_SIZE = 65536
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def _column_file(root: Path, column: str, suffix: str) -> Path:
+    """File of a column; names are escaped so any column name is a valid file."""
+    safe = "".join(c if c.isalnum() or c in "-_" else f"%{ord(c):02x}" for c in column)
+    return root / f"{safe}.{suffix}"
+
+
+def _codes_dtype(n_categories: int) -> np.dtype:
+    """Smallest signed integer dtype for dictionary codes (as pandas uses)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+# ============================================================================
+# Writing
+# ============================================================================
+
+def write_columnar_dataset(
+    buildings_gdf: gpd.GeoDataFrame,
+    output_path: Union[str, Path],
+    version: Optional[str] = None,
+    source: Optional[Union[str, Path]] = None
+) -> Path:
+    """
+    Write buildings as a memory-mappable columnar dataset.
+
+    The dataset is written to a temporary directory and renamed into place,
+    so readers never observe a partially written dataset.
+
+    Parameters
+    ----------
+    buildings_gdf : gpd.GeoDataFrame
+        Buildings to materialize
+    output_path : str or Path
+        Output directory (conventionally `*.cols`)
+    version : str, optional
+        Dataset version recorded in the metadata (default: random)
+    source : str or Path, optional
+        Original data file, recorded in the metadata
+
+    Returns
+    -------
+    Path
+        Output directory
+    """
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.mkdir(parents=True)
+
+    geometry_name = getattr(buildings_gdf, '_geometry_column_name', None)
+    if geometry_name not in buildings_gdf.columns:
+        geometry_name = None
+    columns = []
+
+    try:
+        for column in buildings_gdf.columns:
+            if column == geometry_name:
+                continue
+            series = buildings_gdf[column]
+            values = series.to_numpy()
+
+            if pd.api.types.is_datetime64_any_dtype(series.dtype) and values.dtype.kind == 'M':
+                np.save(_column_file(tmp_path, column, 'npy'), values.view('i8'))
+                columns.append({"name": column, "kind": "datetime", "dtype": str(values.dtype)})
+            elif values.dtype.kind in 'biuf':
+                np.save(_column_file(tmp_path, column, 'npy'), np.ascontiguousarray(values))
+                columns.append({"name": column, "kind": "numeric", "dtype": str(values.dtype)})
+            else:
+                # Dictionary-encode everything else as strings
+                strings = series.astype(object).where(series.notna(), None)
+                strings = strings.map(lambda v: v if v is None else str(v))
+                codes, categories = pd.factorize(strings, use_na_sentinel=True)
+                codes = codes.astype(_codes_dtype(len(categories)))
+                np.save(_column_file(tmp_path, column, 'codes.npy'), codes)
+                with open(_column_file(tmp_path, column, 'categories.json'), 'w',
+                          encoding='utf-8') as f:
+                    json.dump(list(categories), f)
+                columns.append({"name": column, "kind": "dictionary"})
+
+        crs = None
+        if geometry_name is not None:
+            wkb = shapely.to_wkb(buildings_gdf.geometry.values, output_dimension=2)
+            lengths = np.fromiter((len(g) if g is not None else 0 for g in wkb),
+                                  dtype=np.int64, count=len(wkb))
+            offsets = np.zeros(len(wkb) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            buffer = np.frombuffer(
+                b"".join(g for g in wkb if g is not None), dtype=np.uint8
+            )
+            np.save(tmp_path / "geometry.wkb.npy", buffer)
+            np.save(tmp_path / "geometry.offsets.npy", offsets)
+            crs = buildings_gdf.crs.to_wkt() if buildings_gdf.crs is not None else None
+
+            centroids = buildings_gdf.geometry.centroid
+            np.save(tmp_path / "index.centroids.npy",
+                    np.column_stack((centroids.x.to_numpy(), centroids.y.to_numpy())))
+
+        np.save(tmp_path / "index.score_order.npy", score_order(buildings_gdf))
+
+        meta = {
+            "format_version": COLUMNAR_FORMAT_VERSION,
+            "version": version or uuid.uuid4().hex[:16],
+            "source": str(source) if source else None,
+            "rows": len(buildings_gdf),
+            "geometry": geometry_name,
+            "order": [str(c) for c in buildings_gdf.columns],
+            "crs": crs,
+            "columns": columns,
+            "created_at": time.time(),
+        }
+        with open(tmp_path / "meta.json", 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+        if output_path.exists():
+            old_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.old")
+            os.replace(output_path, old_path)
+            os.replace(tmp_path, output_path)
+            shutil.rmtree(old_path, ignore_errors=True)
+        else:
+            os.replace(tmp_path, output_path)
+    except Exception:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    return output_path
+
+
+# ============================================================================
+# Reading
+# ============================================================================
+
+class ColumnarDataset:
+    """
+    Read-only view of a columnar dataset backed by memory-mapped arrays.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path / "meta.json", encoding='utf-8') as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        if self.meta.get("format_version") != COLUMNAR_FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar dataset format in {self.path}")
+
+    @property
+    def version(self) -> str:
+        return self.meta["version"]
+
+    def _load(self, path: Path) -> np.ndarray:
+        return np.load(path, mmap_mode='r')
+
+    def column(self, column: Dict[str, Any]):
+        """Memory-mapped values of one column (numpy array or Categorical)."""
+        name = column["name"]
+        if column["kind"] == "numeric":
+            return self._load(_column_file(self.path, name, 'npy'))
+        if column["kind"] == "datetime":
+            return self._load(_column_file(self.path, name, 'npy')).view(column["dtype"])
+
+        codes = self._load(_column_file(self.path, name, 'codes.npy'))
+        with open(_column_file(self.path, name, 'categories.json'), encoding='utf-8') as f:
+            categories = json.load(f)
+        return pd.Categorical.from_codes(
+            codes, dtype=pd.CategoricalDtype(categories), validate=False
+        )
+
+    def index(self, name: str) -> Optional[np.ndarray]:
+        """Memory-mapped precomputed index, or None if it was not written."""
+        path = self.path / f"index.{name}.npy"
+        return self._load(path) if path.exists() else None
+
+    def geometries(self, batch_size: int = GEOMETRY_BATCH_SIZE) -> np.ndarray:
+        """
+        Decode the shared WKB buffer into shapely geometries.
+
+        The buffer is sliced out of the mapping one batch of geometries at a
+        time, so only the WKB of the batch being decoded is copied into
+        process memory (never the whole buffer).
+        """
+        data = self._load(self.path / "geometry.wkb.npy")
+        offsets = self._load(self.path / "geometry.offsets.npy")
+        n = len(offsets) - 1
+        geometries = np.empty(n, dtype=object)
+
+        for start in range(0, n, batch_size):
+            stop = min(start + batch_size, n)
+            base = int(offsets[start])
+            chunk = data[base:int(offsets[stop])].tobytes()
+            bounds = (offsets[start:stop + 1] - base).tolist()
+            # Split the chunk with map/slice (runs in C, no per-row Python code)
+            wkb = np.fromiter(
+                map(chunk.__getitem__, map(slice, bounds[:-1], bounds[1:])),
+                dtype=object, count=stop - start
+            )
+            wkb[np.diff(offsets[start:stop + 1]) == 0] = None  # missing geometries
+            geometries[start:stop] = shapely.from_wkb(wkb)
+        return geometries
+
+    def to_geodataframe(self) -> gpd.GeoDataFrame:
+        """
+        Build a GeoDataFrame whose attribute columns share the mapped memory.
+
+        Returns
+        -------
+        gpd.GeoDataFrame
+            Buildings (attribute columns are read-only views on the mapping)
+        """
+        columns = {column["name"]: column for column in self.meta["columns"]}
+        geometry_name = self.meta.get("geometry")
+        crs = self.meta.get("crs")
+
+        data = {}
+        for name in self.meta["order"]:
+            if name == geometry_name:
+                data[name] = gpd.array.GeometryArray(self.geometries(), crs=crs)
+            else:
+                data[name] = self.column(columns[name])
+
+        if geometry_name is None:
+            return gpd.GeoDataFrame(pd.DataFrame(data, copy=False))
+        return gpd.GeoDataFrame(data, geometry=geometry_name, crs=crs, copy=False)
+
+
+def load_columnar_dataset(path: Union[str, Path]) -> gpd.GeoDataFrame:
+    """
+    Map a columnar dataset read-only and return it as a GeoDataFrame.
+
+    Parameters
+    ----------
+    path : str or Path
+        Columnar dataset directory
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        Buildings backed by the memory-mapped columns
+    """
+    return ColumnarDataset(path).to_geodataframe()
+
+
+def main():
+    """Command line entry point: convert a buildings file to a columnar dataset."""
+    parser = argparse.ArgumentParser(
+        description="Materialize ranked buildings as a memory-mapped columnar dataset"
+    )
+    parser.add_argument("input", nargs="?", default="data/ranked_buildings.json")
+    parser.add_argument("output", nargs="?", default="data/ranked_buildings.cols")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    buildings = gpd.read_file(args.input)
+    write_columnar_dataset(buildings, args.output, source=args.input)
+    print(f"✓ Wrote {len(buildings)} buildings to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
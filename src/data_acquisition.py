@@ -4,18 +4,576 @@ Fetches building footprints, from pdok using WFS services
 
 """
 from shapely.geometry import box
+import shapely
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+import urllib3
+import pandas as pd
 import geopandas as gpd
-from typing import Dict, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 import json
 import numpy as np
+import re
+import shutil
+import sqlite3
+import threading
 import time
 from pathlib import Path
 
+# BAG3D WFS endpoint and fixed GetFeature parameters
+WFS_URL = "https://data.3dbag.nl/api/BAG3D/wfs"
+WFS_PARAMS = {
+    "service": "WFS",
+    "version": "2.0.0",
+    "request": "GetFeature",
+    "typeNames": "BAG3D:lod12",
+    "outputFormat": "json",
+    "srsName": "EPSG:28992",
+}
+# Geometry property of BAG3D:lod12, always requested with a property selection
+WFS_GEOMETRY_PROPERTY = "geom"
+
+# Attributes read downstream (pass as `properties` to fetch only these):
+# building id (tiles, reports), height (maps) and roof height (geometry)
+PIPELINE_PROPERTIES = ["identificatie", "b3_h_max", "b3_h_dak_max"]
+
+# Transient HTTP errors are retried with exponential backoff:
+# RETRY_BACKOFF, 2 * RETRY_BACKOFF, 4 * RETRY_BACKOFF, ... seconds
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_RETRIES = 5
+RETRY_BACKOFF = 1.0
+
+# Unresolvable host names are not transient (urllib3 >= 2)
+_NAME_RESOLUTION_ERRORS = getattr(urllib3.exceptions, "NameResolutionError", ())
+
+#============================================================
+# 0. Retries and Checkpoints
+#============================================================
+
+def request_with_retry(
+    get,
+    url: str,
+    params: Optional[Dict] = None,
+    retries: int = DEFAULT_RETRIES,
+    backoff: Optional[float] = None,
+    **kwargs
+) -> requests.Response:
+    """
+    Send a GET request, retrying transient failures with exponential backoff.
+
+    Connection errors, timeouts and the statuses in RETRY_STATUSES are
+    retried up to `retries` times, waiting `backoff * 2**attempt` seconds
+    (or the server's Retry-After, if longer). Other HTTP errors and host
+    names that cannot be resolved are raised immediately.
+
+    Parameters
+    ----------
+    get : callable
+        `requests.get` or `Session.get`
+    url : str
+        Request URL
+    params : dict, optional
+        Query parameters
+    retries : int
+        Maximum number of retries
+    backoff : float, optional
+        Initial delay in seconds (default: RETRY_BACKOFF)
+
+    Returns
+    -------
+    requests.Response
+        Successful response
+    """
+    backoff = RETRY_BACKOFF if backoff is None else backoff
+    for attempt in range(retries + 1):
+        delay = backoff * 2 ** attempt
+        try:
+            r = get(url, params=params, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            reason = getattr(e.args[0], "reason", None) if e.args else None
+            if attempt == retries or isinstance(reason, _NAME_RESOLUTION_ERRORS):
+                raise
+        else:
+            if r.status_code not in RETRY_STATUSES or attempt == retries:
+                r.raise_for_status()
+                return r
+            retry_after = r.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+        time.sleep(delay)
+
+
+class DownloadCheckpoint:
+    """
+    Manifest of completed download units, for resuming interrupted downloads.
+
+    The checkpoint is a directory with a `manifest.jsonl`: a header line
+    with the signature of the download, then one line per completed unit
+    (a WFS page or tile, a PVGIS grid point), appended and flushed as soon
+    as the unit completes. Large payloads such as pages of features are
+    stored in files next to the manifest. A checkpoint left by a different
+    download (other signature) is discarded.
+    """
+
+    MANIFEST = "manifest.jsonl"
+
+    def __init__(self, directory: Union[str, Path], signature: Dict):
+        """
+        Open or create a checkpoint.
+
+        Parameters
+        ----------
+        directory : str or Path
+            Checkpoint directory
+        signature : dict
+            Parameters identifying the download (area, page size, ...)
+        """
+        self.directory = Path(directory)
+        self.signature = json.loads(json.dumps(signature))
+        self._entries: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / self.MANIFEST
+
+    def _load(self):
+        lines = []
+        if self.manifest_path.exists():
+            lines = self.manifest_path.read_text(encoding="utf-8").splitlines()
+        header = _parse_json_line(lines[0]) if lines else None
+
+        if header is not None and header.get("signature") == self.signature:
+            for line in lines[1:]:
+                entry = _parse_json_line(line)  # None for a line cut off by a crash
+                if entry is not None and "key" in entry:
+                    self._entries[entry["key"]] = entry.get("value")
+        elif header is not None:
+            print(f"⚠ Checkpoint {self.directory} belongs to a different download, starting over")
+            self._remove_payloads()
+
+        # Rewrite the manifest without partial lines before appending to it
+        content = [json.dumps({"signature": self.signature})]
+        content += [json.dumps({"key": key, "value": value}) for key, value in self._entries.items()]
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text("\n".join(content) + "\n", encoding="utf-8")
+        tmp_path.replace(self.manifest_path)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, default=None):
+        """Value recorded for a completed unit."""
+        return self._entries.get(key, default)
+
+    def add(self, key: str, value=None):
+        """Record a unit as completed (with a small JSON value)."""
+        line = json.dumps({"key": key, "value": value}) + "\n"
+        with self._lock:
+            with open(self.manifest_path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._entries[key] = value
+
+    def _payload_path(self, key: str) -> Path:
+        return self.directory / (re.sub(r"[^A-Za-z0-9_.-]", "_", key) + ".json")
+
+    def store(self, key: str, payload):
+        """Write the payload of a unit to its own file and record the unit."""
+        path = self._payload_path(key)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        tmp_path.replace(path)
+        self.add(key, {"file": path.name})
+
+    def load(self, key: str):
+        """Read the payload stored for a completed unit."""
+        with open(self.directory / self._entries[key]["file"], encoding="utf-8") as f:
+            return json.load(f)
+
+    def _remove_payloads(self):
+        for path in self.directory.glob("*.json"):
+            path.unlink()
+
+    def remove(self):
+        """Delete the checkpoint (after the download completed)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._entries.clear()
+
+
+def _parse_json_line(line: str) -> Optional[Dict]:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _wfs_checkpoint(
+    checkpoint: Optional[Union[str, Path]],
+    area_proj: gpd.GeoDataFrame,
+    page_size: int,
+    url: str,
+    tile_size: Optional[float],
+    properties: Optional[List[str]] = None,
+) -> Optional[DownloadCheckpoint]:
+    """Open the checkpoint of a building download, if requested."""
+    if checkpoint is None:
+        return None
+    return DownloadCheckpoint(checkpoint, {
+        "kind": "wfs",
+        "url": url,
+        "typeNames": WFS_PARAMS["typeNames"],
+        "bbox": [round(float(v), 3) for v in area_proj.total_bounds],
+        "page_size": page_size,
+        "tile_size": tile_size,
+        "properties": properties,
+    })
+
 #============================================================
 # 1. Fetch Building Footprints from PDOK BAG3D WFS
 #============================================================
 
+def _pooled_session(concurrency: int) -> requests.Session:
+    """Session with a connection pool sized for `concurrency` requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _project_features(features: List[Dict], properties: List[str]) -> List[Dict]:
+    """Keep only the given attributes of features (in place)."""
+    keep = set(properties)
+    for feature in features:
+        attributes = feature.get("properties") or {}
+        feature["properties"] = {k: v for k, v in attributes.items() if k in keep}
+    return features
+
+
+def _number_matched(data: Dict) -> Optional[int]:
+    """Total number of features reported by the WFS (None if unknown)."""
+    matched = data.get("numberMatched")
+    try:
+        return int(matched)
+    except (TypeError, ValueError):
+        return None  # absent or "unknown"
+
+
+def iter_wfs_pages(
+    bbox: Tuple[float, float, float, float],
+    page_size: int = 1000,
+    concurrency: int = 1,
+    url: str = WFS_URL,
+    session: Optional[requests.Session] = None,
+    checkpoint: Optional[DownloadCheckpoint] = None,
+    retries: int = DEFAULT_RETRIES,
+    properties: Optional[List[str]] = None,
+    geometry_property: str = WFS_GEOMETRY_PROPERTY,
+) -> Iterator[List[Dict]]:
+    """
+    Page through the BAG3D WFS and yield the features page by page.
+
+    With `concurrency` > 1, up to that many `startIndex` offsets are
+    requested in parallel through one pooled session. Pages are yielded
+    in offset order, so the features come out in the same order as a
+    sequential fetch. The end of the result set is detected from
+    `numberMatched` when the server reports it, and otherwise from the
+    first page shorter than `page_size`; pages requested beyond the end
+    are discarded.
+
+    With a `checkpoint`, every fetched page is stored in it and pages
+    already in it are read back instead of requested again.
+
+    With `properties`, only those attributes (plus the geometry) are
+    requested with the WFS `propertyName` selection, and any other
+    attributes the server still returns are dropped on arrival.
+
+    Parameters
+    ----------
+    bbox : tuple
+        (minx, miny, maxx, maxy) in EPSG:28992
+    page_size : int
+        Features per request
+    concurrency : int
+        Maximum number of requests in flight
+    url : str
+        WFS endpoint
+    session : requests.Session, optional
+        Session to send the requests through (default: a pooled session
+        when concurrent, plain `requests.get` otherwise)
+    checkpoint : DownloadCheckpoint, optional
+        Checkpoint recording the completed pages
+    retries : int
+        Retries of transient HTTP errors per page
+    properties : List[str], optional
+        Attributes to fetch (default: all)
+    geometry_property : str
+        Name of the geometry property in the feature type
+
+    Yields
+    ------
+    List[Dict]
+        GeoJSON features of one page
+    """
+    minx, miny, maxx, maxy = bbox
+
+    def page_params(start_index: int) -> Dict:
+        params = WFS_PARAMS.copy()
+        params.update({
+            "bbox": f"{minx},{miny},{maxx},{maxy}",
+            "count": page_size,
+            "startIndex": start_index,
+        })
+        if properties is not None:
+            params["propertyName"] = ",".join([geometry_property] + list(properties))
+        return params
+
+    def fetch_page(start_index: int, get) -> Tuple[List[Dict], Optional[int]]:
+        key = f"page-{start_index}"
+        if checkpoint is not None and key in checkpoint:
+            data = checkpoint.load(key)
+        else:
+            r = request_with_retry(get, url, params=page_params(start_index), retries=retries)
+            data = r.json()
+            if properties is not None:
+                _project_features(data.get("features", []), properties)
+            if checkpoint is not None:
+                checkpoint.store(key, {
+                    "features": data.get("features", []),
+                    "numberMatched": data.get("numberMatched"),
+                })
+        return data.get("features", []), _number_matched(data)
+
+    if concurrency <= 1:
+        get = session.get if session is not None else requests.get
+        start_index = 0
+        while True:
+            batch, _ = fetch_page(start_index, get)
+            if not batch:
+                break
+            yield batch
+            start_index += len(batch)
+
+            # if server returned fewer than requested, we've reached the end
+            if len(batch) < page_size:
+                break
+        return
+
+    own_session = session is None
+    if own_session:
+        session = _pooled_session(concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+        next_page = 0
+        last_page = None  # known once the server reports numberMatched
+        page = 0
+        try:
+            while True:
+                # Keep the window of in-flight pages full
+                while len(pending) < concurrency and (last_page is None or next_page <= last_page):
+                    pending[next_page] = executor.submit(
+                        fetch_page, next_page * page_size, session.get
+                    )
+                    next_page += 1
+                if page not in pending:
+                    break
+
+                batch, matched = pending.pop(page).result()
+                if matched is not None:
+                    last_page = -(-matched // page_size) - 1
+                if batch:
+                    yield batch
+                if len(batch) < page_size:
+                    break
+                page += 1
+        finally:
+            for future in pending.values():
+                future.cancel()
+            if own_session:
+                session.close()
+
+
+def wfs_tiles(
+    area: gpd.GeoDataFrame,
+    tile_size: float,
+) -> List[Tuple[float, float, float, float]]:
+    """
+    Split a study area into a grid of square request tiles.
+
+    The grid covers the bounds of the area and is aligned to multiples of
+    `tile_size`; tiles that do not intersect the area are dropped.
+
+    Parameters
+    ----------
+    area : gpd.GeoDataFrame
+        Study area in EPSG:28992
+    tile_size : float
+        Tile width in meters
+
+    Returns
+    -------
+    List[Tuple[float, float, float, float]]
+        Tile bboxes (minx, miny, maxx, maxy), row by row from the south-west
+    """
+    if not tile_size > 0:
+        raise ValueError("tile_size must be positive")
+
+    minx, miny, maxx, maxy = area.total_bounds
+    xs = np.arange(np.floor(minx / tile_size), np.ceil(maxx / tile_size)) * tile_size
+    ys = np.arange(np.floor(miny / tile_size), np.ceil(maxy / tile_size)) * tile_size
+    if len(xs) == 0:
+        xs = np.array([np.floor(minx / tile_size) * tile_size])
+    if len(ys) == 0:
+        ys = np.array([np.floor(miny / tile_size) * tile_size])
+
+    gx, gy = np.meshgrid(xs, ys)
+    tiles = shapely.box(gx.ravel(), gy.ravel(), gx.ravel() + tile_size, gy.ravel() + tile_size)
+    keep = shapely.intersects(tiles, shapely.union_all(area.geometry.values))
+    return [tuple(bounds) for bounds in shapely.bounds(tiles[keep]).tolist()]
+
+
+def iter_wfs_tiles(
+    tiles: List[Tuple[float, float, float, float]],
+    page_size: int = 1000,
+    concurrency: int = 4,
+    url: str = WFS_URL,
+    checkpoint: Optional[DownloadCheckpoint] = None,
+    retries: int = DEFAULT_RETRIES,
+    properties: Optional[List[str]] = None,
+) -> Iterator[List[Dict]]:
+    """
+    Fetch WFS tiles in parallel and yield the features tile by tile.
+
+    Each tile is paged sequentially on a worker thread; up to
+    `concurrency` tiles are fetched at a time through one pooled session.
+    Tiles are yielded in the given order. Buildings crossing tile borders
+    are returned for every tile they intersect.
+
+    Parameters
+    ----------
+    tiles : list
+        Tile bboxes in EPSG:28992 (see `wfs_tiles`)
+    page_size : int
+        Features per request
+    concurrency : int
+        Maximum number of tiles fetched at a time
+    url : str
+        WFS endpoint
+    checkpoint : DownloadCheckpoint, optional
+        Checkpoint recording the completed tiles
+    retries : int
+        Retries of transient HTTP errors per page
+    properties : List[str], optional
+        Attributes to fetch (default: all)
+
+    Yields
+    ------
+    List[Dict]
+        GeoJSON features of one tile
+    """
+    concurrency = max(1, concurrency)
+    session = _pooled_session(concurrency)
+
+    def fetch_tile(tile):
+        key = "tile-{:.3f}-{:.3f}-{:.3f}-{:.3f}".format(*tile)
+        if checkpoint is not None and key in checkpoint:
+            return checkpoint.load(key)
+        features = [
+            feature
+            for page in iter_wfs_pages(
+                tile, page_size=page_size, url=url, session=session, retries=retries,
+                properties=properties
+            )
+            for feature in page
+        ]
+        if checkpoint is not None:
+            checkpoint.store(key, features)
+        return features
+
+    with session, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+        try:
+            for i, tile in enumerate(tiles):
+                # Bound the tiles in flight (and held in memory) to the window
+                pending[i] = executor.submit(fetch_tile, tile)
+                if len(pending) >= concurrency:
+                    yield pending.pop(min(pending)).result()
+            while pending:
+                yield pending.pop(min(pending)).result()
+        finally:
+            for future in pending.values():
+                future.cancel()
+
+
+def _feature_id(feature: Dict):
+    """Identifier of a WFS feature (feature id, else BAG identificatie)."""
+    feature_id = feature.get("id")
+    if feature_id is None:
+        feature_id = (feature.get("properties") or {}).get("identificatie")
+    return feature_id
+
+
+def _study_area(area) -> gpd.GeoDataFrame:
+    """Normalise a study area input to a GeoDataFrame in EPSG:28992."""
+    if isinstance(area, tuple):
+        area_gdf = gpd.GeoDataFrame(geometry=[box(*area)], crs="EPSG:4326")
+    elif isinstance(area, (str, Path)):
+        area_gdf = gpd.read_file(area)
+    elif isinstance(area, (gpd.GeoDataFrame, gpd.GeoSeries)):
+        area_gdf = gpd.GeoDataFrame(geometry=area.geometry)
+    else:
+        raise TypeError("Unsupported area input type")
+
+    # target CRS for BAG3D WFS is EPSG:28992
+    return area_gdf.to_crs("EPSG:28992")
+
+
+def _iter_wfs_batches(
+    area_proj: gpd.GeoDataFrame,
+    page_size: int,
+    concurrency: int,
+    url: str,
+    tile_size: Optional[float],
+    checkpoint: Optional[DownloadCheckpoint] = None,
+    retries: int = DEFAULT_RETRIES,
+    properties: Optional[List[str]] = None,
+) -> Iterator[List[Dict]]:
+    """Yield batches of unique features (pages, or tiles when tiling)."""
+    if tile_size:
+        batches = iter_wfs_tiles(
+            wfs_tiles(area_proj, tile_size), page_size=page_size, concurrency=concurrency,
+            url=url, checkpoint=checkpoint, retries=retries, properties=properties
+        )
+    else:
+        batches = iter_wfs_pages(
+            tuple(area_proj.total_bounds), page_size=page_size, concurrency=concurrency,
+            url=url, checkpoint=checkpoint, retries=retries, properties=properties
+        )
+
+    seen = set()
+    for batch in batches:
+        unique = []
+        for feature in batch:
+            # Buildings on tile borders are returned by every tile they touch
+            feature_id = _feature_id(feature)
+            if feature_id is not None:
+                if feature_id in seen:
+                    continue
+                seen.add(feature_id)
+            unique.append(feature)
+        if unique:
+            yield unique
+
+
 def fetch_pdok_buildings(
     area: Union[
         Tuple[float, float, float, float],  # bbox (WGS84)
@@ -25,6 +583,12 @@ def fetch_pdok_buildings(
     ],
     output_path: Optional[str] = "buildings.geojson",
     page_size: int = 1000,
+    concurrency: int = 1,
+    url: str = WFS_URL,
+    tile_size: Optional[float] = None,
+    checkpoint: Optional[Union[str, Path]] = None,
+    retries: int = DEFAULT_RETRIES,
+    properties: Optional[List[str]] = None,
 ) -> gpd.GeoDataFrame:
     """
     Fetch BAG3D LoD1.2 buildings intersecting `area` using the WFS API.
@@ -32,63 +596,42 @@ def fetch_pdok_buildings(
     This implementation uses the WFS bbox parameter + paging (count/startIndex)
     to fetch *all* features that intersect the study area. Results are fetched
     in the BAG3D native CRS (EPSG:28992) and clipped to the exact area.
-    """
 
-   
-    # Normalise study area : if the input was 
+    With `concurrency` > 1 several pages are requested in parallel through a
+    pooled session (see `iter_wfs_pages`); the result is the same as with a
+    sequential fetch.
 
-    if isinstance(area, tuple):
-        area_gdf = gpd.GeoDataFrame(geometry=[box(*area)], crs="EPSG:4326")
-    elif isinstance(area, (str, Path)):
-        area_gdf = gpd.read_file(area)
-    elif isinstance(area, (gpd.GeoDataFrame, gpd.GeoSeries)):
-        area_gdf = gpd.GeoDataFrame(geometry=area.geometry)
-    else:
-        raise TypeError("Unsupported area input type")
-
-    # target CRS for BAG3D WFS is EPSG:28992
-    area_proj = area_gdf.to_crs("EPSG:28992")
-    minx, miny, maxx, maxy = area_proj.total_bounds
+    With `tile_size` (meters), the study area is split into a grid of
+    sub-bboxes that are fetched in parallel (`concurrency` tiles at a time)
+    instead of paging through one large bbox, which keeps the server-side
+    offsets shallow. Buildings crossing tile borders are deduplicated by
+    feature id and the result is clipped once at the end.
 
-    
-    # Page through WFS using bbox :
-   
-    url = "https://data.3dbag.nl/api/BAG3D/wfs"
-    params_base = {
-        "service": "WFS",
-        "version": "2.0.0",
-        "request": "GetFeature",
-        "typeNames": "BAG3D:lod12",
-        "outputFormat": "json",
-        "srsName": "EPSG:28992",
-    }
-
-    features = []
-    start_index = 0
+    With a `checkpoint` directory, completed pages (or tiles) are recorded
+    as they arrive and an interrupted download resumes from them when
+    called again with the same arguments; the checkpoint is deleted once
+    the download completes. Transient HTTP errors are retried up to
+    `retries` times with exponential backoff.
 
-    while True:
-        params = params_base.copy()
-        params.update({
-            "bbox": f"{minx},{miny},{maxx},{maxy}",
-            "count": page_size,
-            "startIndex": start_index,
-        })
+    With a `properties` whitelist (e.g. PIPELINE_PROPERTIES), only those
+    attributes are requested from the WFS (`propertyName`) and kept, which
+    shrinks the download and the parsed features; the geometry is always
+    included.
 
-        r = requests.get(url, params=params)
-        r.raise_for_status()
+    For large areas, `stream_pdok_buildings` writes the buildings to disk
+    as they arrive instead of holding them in memory.
+    """
+    area_proj = _study_area(area)
+    state = _wfs_checkpoint(checkpoint, area_proj, page_size, url, tile_size, properties)
 
-        data = r.json()
-        batch = data.get("features", [])
-        if not batch:
-            break
+    # Page through WFS using bbox :
 
+    features = []
+    for batch in _iter_wfs_batches(
+        area_proj, page_size, concurrency, url, tile_size, checkpoint=state, retries=retries,
+        properties=properties
+    ):
         features.extend(batch)
-        batch_len = len(batch)
-        start_index += batch_len
-
-        # if server returned fewer than requested, we've reached the end
-        if batch_len < page_size:
-            break
 
     # -----------------------------
     # Build GeoDataFrame and clip to exact area
@@ -104,14 +647,548 @@ def fetch_pdok_buildings(
     if output_path:
         buildings.to_file(output_path, driver="GeoJSON")
 
+    if state is not None:
+        state.remove()
+
     return buildings
 
 
+def _clip_features(features: List[Dict], mask) -> List[str]:
+    """
+    Clip a batch of features to the study area and serialize them.
+
+    Returns one GeoJSON Feature string per building intersecting `mask`,
+    with the WFS id and properties and the clipped geometry.
+    """
+    batch = gpd.GeoDataFrame.from_features(features, crs="EPSG:28992")
+    clipped = gpd.clip(batch, mask).sort_index()  # keep the WFS order
+    geometries = shapely.to_geojson(clipped.geometry.values)
+    lines = []
+    for position, geometry in zip(clipped.index, geometries):
+        feature = features[position]
+        lines.append('{"type": "Feature", "id": %s, "properties": %s, "geometry": %s}' % (
+            json.dumps(feature.get("id")), json.dumps(feature.get("properties") or {}), geometry
+        ))
+    return lines
+
+
+def stream_pdok_buildings(
+    area: Union[
+        Tuple[float, float, float, float],  # bbox (WGS84)
+        str,                                 # geojson / shp
+        gpd.GeoDataFrame,
+        gpd.GeoSeries
+    ],
+    output_path: str = "buildings.geojsonl",
+    page_size: int = 1000,
+    concurrency: int = 1,
+    url: str = WFS_URL,
+    tile_size: Optional[float] = None,
+    checkpoint: Optional[Union[str, Path]] = None,
+    retries: int = DEFAULT_RETRIES,
+    properties: Optional[List[str]] = None,
+) -> int:
+    """
+    Fetch BAG3D LoD1.2 buildings intersecting `area` straight to disk.
+
+    Same fetch as `fetch_pdok_buildings`, but every page (or tile) is
+    clipped to the study area and appended to a newline-delimited GeoJSON
+    file (GeoJSONSeq, one Feature per line, EPSG:28992) as soon as it
+    arrives. Memory use is bounded by the pages in flight plus the set of
+    feature ids kept for deduplication, independent of the area size.
+
+    The file is written to `<output_path>.part` and renamed when complete.
+    Read it back with `read_streamed_buildings`. With a `checkpoint`, an
+    interrupted download resumes from the pages already fetched (see
+    `fetch_pdok_buildings`).
+
+    Parameters
+    ----------
+    area : tuple, str, gpd.GeoDataFrame or gpd.GeoSeries
+        Study area (WGS84 bbox, file path or geometries)
+    output_path : str
+        Output GeoJSONSeq file
+    page_size : int
+        Features per request
+    concurrency : int
+        Maximum number of requests (or tiles) in flight
+    url : str
+        WFS endpoint
+    tile_size : float, optional
+        Tile size in meters (see `fetch_pdok_buildings`)
+    checkpoint : str or Path, optional
+        Checkpoint directory for resuming
+    retries : int
+        Retries of transient HTTP errors per page
+    properties : List[str], optional
+        Attributes to fetch (default: all)
+
+    Returns
+    -------
+    int
+        Number of buildings written
+    """
+    area_proj = _study_area(area)
+    state = _wfs_checkpoint(checkpoint, area_proj, page_size, url, tile_size, properties)
+    mask = shapely.union_all(area_proj.geometry.values)
+    shapely.prepare(mask)
+
+    output_path = Path(output_path)
+    part_path = output_path.with_name(output_path.name + ".part")
+    written = 0
+    with open(part_path, "w", encoding="utf-8") as f:
+        for batch in _iter_wfs_batches(
+            area_proj, page_size, concurrency, url, tile_size, checkpoint=state, retries=retries,
+            properties=properties
+        ):
+            lines = _clip_features(batch, mask)
+            f.write("".join(line + "\n" for line in lines))
+            f.flush()
+            written += len(lines)
+    part_path.replace(output_path)
+    if state is not None:
+        state.remove()
+    return written
+
+
+def _iter_streamed_features(path: Union[str, Path]) -> Iterator[Dict]:
+    """Features of a GeoJSONSeq file, one per line."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip().lstrip("\x1e")  # also accept RFC 8142 record separators
+            if line:
+                yield json.loads(line)
+
+
+def _features_to_gdf(features: List[Dict]) -> gpd.GeoDataFrame:
+    if not features:
+        return gpd.GeoDataFrame(columns=["geometry"], geometry="geometry", crs="EPSG:28992")
+    return gpd.GeoDataFrame.from_features(features, crs="EPSG:28992")
+
+
+def read_streamed_buildings(path: str) -> gpd.GeoDataFrame:
+    """Read buildings written by `stream_pdok_buildings` (EPSG:28992)."""
+    return _features_to_gdf(list(_iter_streamed_features(path)))
+
+
+# ------------------------------------------------------------
+# Incremental refresh
+# ------------------------------------------------------------
+
+def _building_key(feature: Dict):
+    """Stable key of a building (BAG identificatie, else feature id)."""
+    key = (feature.get("properties") or {}).get("identificatie")
+    if key is None:
+        key = feature.get("id")
+    return key
+
+
+def feature_hash(feature: Dict) -> str:
+    """
+    Hash of the attributes and geometry of a GeoJSON feature.
+
+    Key order does not matter; any change of a property value or
+    coordinate changes the hash.
+    """
+    canonical = json.dumps(
+        {"properties": feature.get("properties") or {}, "geometry": feature.get("geometry")},
+        sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def snapshot_hashes(path: Union[str, Path]) -> Dict:
+    """Building key -> `feature_hash` of a GeoJSONSeq building snapshot."""
+    hashes = {}
+    for feature in _iter_streamed_features(path):
+        key = _building_key(feature)
+        if key is not None:
+            hashes[key] = feature_hash(feature)
+    return hashes
+
+
+class BuildingDelta:
+    """
+    Changes between two building snapshots.
+
+    Only keys are held; the features of added and changed buildings are
+    read back from the new snapshot by `updated_buildings()`, so call it
+    before the snapshot is refreshed again.
+
+    Attributes
+    ----------
+    added : List
+        Keys (BAG identificatie) of new buildings
+    changed : List
+        Keys of buildings whose attributes or geometry changed
+    removed : List
+        Keys of buildings that are gone
+    snapshot_path : Path, optional
+        New snapshot holding the added and changed buildings
+    """
+
+    def __init__(self, added=None, changed=None, removed=None, snapshot_path=None, rows=None):
+        self.added: List = list(added or [])
+        self.changed: List = list(changed or [])
+        self.removed: List = list(removed or [])
+        self.snapshot_path = Path(snapshot_path) if snapshot_path is not None else None
+        # Line numbers of the added and changed buildings in the snapshot
+        self._rows: Set[int] = set(rows or [])
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def __repr__(self) -> str:
+        return (f"BuildingDelta(added={len(self.added)}, changed={len(self.changed)}, "
+                f"removed={len(self.removed)})")
+
+    @property
+    def stale_keys(self) -> List:
+        """Keys of buildings whose previous results must be dropped."""
+        return self.changed + self.removed
+
+    def updated_buildings(self) -> gpd.GeoDataFrame:
+        """Added and changed buildings, to be (re)processed downstream (EPSG:28992)."""
+        if self.snapshot_path is None or not self._rows:
+            return _features_to_gdf([])
+        return _features_to_gdf([
+            feature for row, feature in enumerate(_iter_streamed_features(self.snapshot_path))
+            if row in self._rows
+        ])
+
+
+def refresh_pdok_buildings(
+    area: Union[
+        Tuple[float, float, float, float],  # bbox (WGS84)
+        str,                                 # geojson / shp
+        gpd.GeoDataFrame,
+        gpd.GeoSeries
+    ],
+    snapshot_path: str = "buildings.geojsonl",
+    page_size: int = 1000,
+    concurrency: int = 1,
+    url: str = WFS_URL,
+    tile_size: Optional[float] = None,
+    checkpoint: Optional[Union[str, Path]] = None,
+    retries: int = DEFAULT_RETRIES,
+    properties: Optional[List[str]] = None,
+) -> BuildingDelta:
+    """
+    Refresh a building snapshot and report what changed.
+
+    Streams the buildings of `area` like `stream_pdok_buildings` into a
+    new snapshot at `snapshot_path`, comparing every feature with the
+    previous snapshot at that path by BAG identificatie and
+    `feature_hash` as the pages arrive. Features are not kept: memory
+    holds the keys and hashes of the previous snapshot and the keys of
+    the buildings in the delta, and the updated buildings are read back
+    from the new snapshot. Without a previous snapshot, every building is
+    reported as added.
+
+    Downstream stages then only need to process
+    `delta.updated_buildings()` and merge the results into the previous
+    ones with `apply_building_delta`.
+
+    Parameters
+    ----------
+    area : tuple, str, gpd.GeoDataFrame or gpd.GeoSeries
+        Study area (WGS84 bbox, file path or geometries)
+    snapshot_path : str
+        GeoJSONSeq snapshot, read as the previous state and replaced
+    page_size : int
+        Features per request
+    concurrency : int
+        Maximum number of requests (or tiles) in flight
+    url : str
+        WFS endpoint
+    tile_size : float, optional
+        Tile size in meters (see `fetch_pdok_buildings`)
+    checkpoint : str or Path, optional
+        Checkpoint directory for resuming
+    retries : int
+        Retries of transient HTTP errors per page
+    properties : List[str], optional
+        Attributes to fetch (default: all); changing the whitelist between
+        refreshes reports every building as changed
+
+    Returns
+    -------
+    BuildingDelta
+        Added, changed and removed buildings
+    """
+    snapshot_path = Path(snapshot_path)
+    previous = snapshot_hashes(snapshot_path) if snapshot_path.exists() else {}
+
+    area_proj = _study_area(area)
+    state = _wfs_checkpoint(checkpoint, area_proj, page_size, url, tile_size, properties)
+    mask = shapely.union_all(area_proj.geometry.values)
+    shapely.prepare(mask)
+
+    delta = BuildingDelta()
+    seen = set()
+    row = 0
+    part_path = snapshot_path.with_name(snapshot_path.name + ".part")
+    with open(part_path, "w", encoding="utf-8") as f:
+        for batch in _iter_wfs_batches(
+            area_proj, page_size, concurrency, url, tile_size, checkpoint=state, retries=retries,
+            properties=properties
+        ):
+            lines = _clip_features(batch, mask)
+            f.write("".join(line + "\n" for line in lines))
+            f.flush()
+            for line in lines:
+                # Hash the feature as written, like the previous snapshot
+                feature = json.loads(line)
+                key = _building_key(feature)
+                seen.add(key)
+                previous_hash = previous.get(key)
+                if previous_hash is None:
+                    delta.added.append(key)
+                    delta._rows.add(row)
+                elif previous_hash != feature_hash(feature):
+                    delta.changed.append(key)
+                    delta._rows.add(row)
+                row += 1
+    delta.removed = [key for key in previous if key not in seen]
+
+    part_path.replace(snapshot_path)
+    delta.snapshot_path = snapshot_path
+    if state is not None:
+        state.remove()
+    return delta
+
+
+def apply_building_delta(
+    previous: gpd.GeoDataFrame,
+    delta: BuildingDelta,
+    updated: Optional[gpd.GeoDataFrame] = None,
+    id_column: str = "identificatie",
+) -> gpd.GeoDataFrame:
+    """
+    Merge the results for updated buildings into previous results.
+
+    Rows of removed and changed buildings are dropped from `previous`,
+    and the rows of `updated` (the processed `delta.updated_buildings()`)
+    are appended. Rankings are relative, so rank the merged result again.
+
+    Parameters
+    ----------
+    previous : gpd.GeoDataFrame
+        Results of the previous run, with an `id_column`
+    delta : BuildingDelta
+        Delta from `refresh_pdok_buildings`
+    updated : gpd.GeoDataFrame, optional
+        Results for the added and changed buildings
+        (default: `delta.updated_buildings()` unprocessed)
+    id_column : str
+        Column holding the BAG identificatie
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        Merged results
+    """
+    if id_column not in previous.columns:
+        raise KeyError(f"Column '{id_column}' not found in previous results")
+    if updated is None:
+        updated = delta.updated_buildings()
+    if len(updated) and id_column not in updated.columns:
+        raise KeyError(f"Column '{id_column}' not found in updated results")
+
+    kept = previous[~previous[id_column].isin(delta.stale_keys)]
+    if not len(updated):
+        return kept.reset_index(drop=True)
+    if updated.crs is not None and kept.crs is not None and updated.crs != kept.crs:
+        updated = updated.to_crs(kept.crs)
+    merged = pd.concat([kept, updated], ignore_index=True)
+    return gpd.GeoDataFrame(merged, geometry=previous.geometry.name, crs=previous.crs)
+
+
 
 #==============================================================
 # 2. Fetch Solar PV Energy Data from PVGIS PVcalc API
 #==============================================================
 
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are added at `rate` per second up to `burst`; every request
+    takes one token and waits until one is available.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if not rate > 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, waiting as long as needed."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class PVGISCache:
+    """
+    Persistent SQLite cache of PVGIS PVcalc responses.
+
+    Responses are keyed by the coordinates rounded to `precision` decimals
+    (4 decimals is about 10 m) together with peakpower and loss, so runs
+    over overlapping areas only fetch the points they have not seen.
+    Entries older than `ttl_days` are ignored and evicted; beyond
+    `max_entries`, the least recently used entries are evicted.
+    Connections are opened per thread so the cache can be shared by the
+    concurrent fetcher.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = "data/pvgis_cache.sqlite",
+        precision: int = 4,
+        ttl_days: Optional[float] = 30.0,
+        max_entries: Optional[int] = 100000,
+    ):
+        """
+        Open or create a cache.
+
+        Parameters
+        ----------
+        path : str or Path
+            SQLite database file
+        precision : int
+            Decimals the coordinates are rounded to
+        ttl_days : float, optional
+            Maximum age of entries in days (None: no expiry)
+        max_entries : int, optional
+            Maximum number of entries (None: unbounded)
+        """
+        self.path = Path(path)
+        self.precision = precision
+        self.ttl = ttl_days * 86400.0 if ttl_days is not None else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS pvgis ("
+            "precision INTEGER, lat INTEGER, lon INTEGER, peakpower REAL, loss REAL, "
+            "response TEXT, created REAL, accessed REAL, "
+            "PRIMARY KEY (precision, lat, lon, peakpower, loss))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS pvgis_accessed ON pvgis (accessed)")
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def round(self, lat: float, lon: float) -> Tuple[float, float]:
+        """Coordinates as cached (rounded to the cache precision)."""
+        return round(float(lat), self.precision), round(float(lon), self.precision)
+
+    def _key(self, lat, lon, peakpower, loss) -> Tuple:
+        scale = 10 ** self.precision
+        return (self.precision, int(round(float(lat) * scale)), int(round(float(lon) * scale)),
+                float(peakpower), float(loss))
+
+    def get(self, lat: float, lon: float, peakpower: float, loss: float) -> Optional[Dict]:
+        """Cached response for a point, or None if missing or expired."""
+        key = self._key(lat, lon, peakpower, loss)
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT response, created FROM pvgis WHERE precision = ? AND lat = ? AND lon = ? "
+            "AND peakpower = ? AND loss = ?", key
+        ).fetchone()
+        now = time.time()
+        if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+            with self._lock:
+                self.misses += 1
+            return None
+        conn.execute(
+            "UPDATE pvgis SET accessed = ? WHERE precision = ? AND lat = ? AND lon = ? "
+            "AND peakpower = ? AND loss = ?", (now,) + key
+        )
+        conn.commit()
+        with self._lock:
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, lat: float, lon: float, peakpower: float, loss: float, response: Dict):
+        """Cache the response for a point (evicting every 100 insertions)."""
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO pvgis VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            self._key(lat, lon, peakpower, loss) + (json.dumps(response), now, now)
+        )
+        conn.commit()
+        with self._lock:
+            self._puts += 1
+            evict = self._puts % 100 == 0
+        if evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove expired entries and the least recently used ones beyond
+        `max_entries`.
+
+        Returns
+        -------
+        int
+            Number of entries removed
+        """
+        conn = self._connection()
+        removed = 0
+        if self.ttl is not None:
+            removed += conn.execute(
+                "DELETE FROM pvgis WHERE created < ?", (time.time() - self.ttl,)
+            ).rowcount
+        if self.max_entries is not None:
+            removed += conn.execute(
+                "DELETE FROM pvgis WHERE rowid IN (SELECT rowid FROM pvgis "
+                "ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+            ).rowcount
+        conn.commit()
+        return removed
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM pvgis").fetchone()[0]
+
+    def clear(self):
+        """Remove all entries."""
+        conn = self._connection()
+        conn.execute("DELETE FROM pvgis")
+        conn.commit()
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
 class PVGISPVCalcClient:
     """
       PV Energy = Radiation × Panel Physics × System Assumptions
@@ -121,15 +1198,33 @@ class PVGISPVCalcClient:
 
     BASE_URL = "https://re.jrc.ec.europa.eu/api/v5_3/PVcalc"
 
-    def __init__(self, peakpower=1, loss=14, timeout=30):
+    # PVGIS allows 30 requests per second per IP address
+    RATE_LIMIT = 25.0
+
+    def __init__(self, peakpower=1, loss=14, timeout=30, retries=DEFAULT_RETRIES, base_url=None,
+                 cache=None):
         self.peakpower = peakpower
         self.loss = loss
         self.timeout = timeout
+        self.retries = retries
+        self.base_url = base_url or self.BASE_URL
+        # PVGISCache, or the path of its database
+        self.cache = PVGISCache(cache) if isinstance(cache, (str, Path)) else cache
 
-    def _fetch_point(self, lat, lon):
+    def _fetch_point(self, lat, lon, get=None, lookup=True):
         """
         Internal method: fetch PVGIS data for a single point.
+
+        With a cache, the point is rounded to the cache precision and
+        answered from the cache when possible (unless `lookup` is False
+        because the caller already looked it up).
         """
+        if self.cache is not None:
+            lat, lon = self.cache.round(lat, lon)
+            cached = self.cache.get(lat, lon, self.peakpower, self.loss) if lookup else None
+            if cached is not None:
+                return cached
+
         params = {
             "lat": lat,
             "lon": lon,
@@ -138,48 +1233,266 @@ class PVGISPVCalcClient:
             "outputformat": "json",
         }
 
-        r = requests.get(self.BASE_URL, params=params, timeout=self.timeout)
-        r.raise_for_status()
-        return r.json()
+        r = request_with_retry(
+            get or requests.get, self.base_url, params=params, retries=self.retries,
+            timeout=self.timeout
+        )
+        data = r.json()
+        if self.cache is not None:
+            self.cache.put(lat, lon, self.peakpower, self.loss, data)
+        return data
+
+    def _fetch_energy(self, lat, lon, get=None, lookup=True):
+        """Annual PV energy E_y (kWh/year) at a point."""
+        data = self._fetch_point(lat, lon, get=get, lookup=lookup)
+        return data["outputs"]["totals"]["fixed"]["E_y"]
 
-    def fetch_bbox_geojson(self, bbox, step_km=1.0, sleep=0.05):
+    def fetch_points(self, points, concurrency=1, rate=None, sleep=0.05, checkpoint=None):
+        """
+        Fetch the annual PV energy of many points.
+
+        Sequentially (`concurrency` 1) the points are fetched one by one
+        with `sleep` seconds in between. Otherwise up to `concurrency`
+        requests are kept in flight on a thread pool sharing one pooled
+        session, and a token bucket limits the request rate to `rate`
+        requests per second (default: RATE_LIMIT).
+
+        Parameters
+        ----------
+        points : list of (lat, lon)
+            Points to fetch
+        concurrency : int
+            Maximum number of requests in flight
+        rate : float, optional
+            Maximum requests per second when concurrent
+        sleep : float
+            Pause between sequential requests (seconds)
+        checkpoint : DownloadCheckpoint, optional
+            Points already recorded are not fetched again; fetched points
+            are recorded as they complete
+
+        Points found in the client's cache are not requested.
+
+        Returns
+        -------
+        list of float
+            E_y per point, in the order of `points`
+        """
+        def key(lat, lon):
+            return f"{lat:.6f},{lon:.6f}"
+
+        results = [None] * len(points)
+        todo = []
+        for i, (lat, lon) in enumerate(points):
+            if checkpoint is not None and key(lat, lon) in checkpoint:
+                results[i] = checkpoint.get(key(lat, lon))
+                continue
+            if self.cache is not None:
+                # Cached points need neither a request nor a rate-limit token
+                cached = self.cache.get(*self.cache.round(lat, lon), self.peakpower, self.loss)
+                if cached is not None:
+                    results[i] = cached["outputs"]["totals"]["fixed"]["E_y"]
+                    continue
+            todo.append(i)
+
+        if concurrency <= 1:
+            for i in todo:
+                lat, lon = points[i]
+                results[i] = self._fetch_energy(lat, lon, lookup=False)
+                if checkpoint is not None:
+                    checkpoint.add(key(lat, lon), results[i])
+                time.sleep(sleep)
+            return results
+
+        limiter = TokenBucket(rate or self.RATE_LIMIT)
+        session = _pooled_session(concurrency)
+
+        def fetch(i):
+            lat, lon = points[i]
+            limiter.acquire()
+            e_y = self._fetch_energy(lat, lon, get=session.get, lookup=False)
+            if checkpoint is not None:
+                checkpoint.add(key(lat, lon), e_y)
+            return e_y
+
+        with session, ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {}
+            try:
+                for i in todo:
+                    futures[i] = executor.submit(fetch, i)
+                for i, future in futures.items():
+                    results[i] = future.result()
+            finally:
+                for future in futures.values():
+                    future.cancel()
+        return results
+
+    def _checkpoint(self, checkpoint, bbox, kind="pvgis", **params):
+        if checkpoint is None:
+            return None
+        return DownloadCheckpoint(checkpoint, {
+            "kind": kind,
+            "url": self.base_url,
+            "bbox": list(bbox),
+            **params,
+            "peakpower": self.peakpower,
+            "loss": self.loss,
+        })
+
+    def _point_feature(self, feature_id, lat, lon, e_y):
+        return {
+            "type": "Feature",
+            "id": feature_id,
+            "geometry": {
+                "type": "Point",
+                "coordinates": [lon, lat]
+            },
+            "properties": {
+                "E_y": e_y,
+                "loss": self.loss,
+                "source": "PVGIS PVcalc"
+            }
+        }
+
+    def fetch_bbox_geojson(self, bbox, step_km=1.0, sleep=0.05, checkpoint=None,
+                           concurrency=1, rate=None):
         """
         Fetch PVGIS PVcalc results for a bounding box
         and return a GeoJSON FeatureCollection.
 
         bbox = (min_lon, min_lat, max_lon, max_lat)
+
+        With a `checkpoint` directory, every completed grid point is recorded
+        in its manifest and an interrupted run resumes from it when called
+        again with the same arguments; the checkpoint is deleted once the
+        whole grid is fetched.
+
+        With `concurrency` > 1, up to that many points are requested at a
+        time, rate limited to `rate` requests per second (see
+        `fetch_points`). Features are always in grid order.
         """
 
         min_lon, min_lat, max_lon, max_lat = bbox
         step_deg = step_km / 111.0  # km → degrees (approx)
 
-        features = []
-        feature_id = 1
+        state = self._checkpoint(checkpoint, bbox, step_km=step_km)
 
         lats = np.arange(min_lat, max_lat, step_deg)
         lons = np.arange(min_lon, max_lon, step_deg)
+        points = [(lat, lon) for lat in lats for lon in lons]
 
-        for lat in lats:
-            for lon in lons:
-                data = self._fetch_point(lat, lon)
-
-                feature = {
-                    "type": "Feature",
-                    "id": feature_id,
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [lon, lat]
-                    },
-                    "properties": {
-                        "E_y": data["outputs"]["totals"]["fixed"]["E_y"],
-                        "loss": self.loss,
-                        "source": "PVGIS PVcalc"
-                    }
-                }
-
-                features.append(feature)
-                feature_id += 1
-                time.sleep(sleep)
+        energies = self.fetch_points(
+            points, concurrency=concurrency, rate=rate, sleep=sleep, checkpoint=state
+        )
+        features = [
+            self._point_feature(feature_id, lat, lon, e_y)
+            for feature_id, ((lat, lon), e_y) in enumerate(zip(points, energies), start=1)
+        ]
+
+        if state is not None:
+            state.remove()
+
+        return {
+            "type": "FeatureCollection",
+            "features": features
+        }
+
+    def fetch_adaptive_geojson(self, bbox, initial_step_km=2.0, min_step_km=0.25, tolerance=10.0,
+                               sleep=0.05, checkpoint=None, concurrency=1, rate=None):
+        """
+        Fetch PVGIS PVcalc results on an adaptively refined grid.
+
+        Sampling starts with a coarse grid of cells `initial_step_km` wide
+        and refines like a quadtree: a cell whose corner E_y values differ
+        by more than `tolerance` is split into four, down to cells of
+        `min_step_km`. Flat areas keep the coarse spacing while gradients
+        get the fine one, so an interpolation as accurate as a uniform
+        `min_step_km` grid needs far fewer requests. Each refinement level
+        is fetched as one batch (concurrently and rate limited with
+        `concurrency` > 1, see `fetch_points`).
+
+        bbox = (min_lon, min_lat, max_lon, max_lat)
+
+        Returns the same point FeatureCollection as `fetch_bbox_geojson`
+        (ordered by latitude, then longitude), readable by
+        `geometry.load_solar_data`.
+
+        Parameters
+        ----------
+        bbox : tuple
+            (min_lon, min_lat, max_lon, max_lat) in WGS84
+        initial_step_km : float
+            Spacing of the initial grid
+        min_step_km : float
+            Spacing at which refinement stops
+        tolerance : float
+            Maximum E_y difference (kWh/year) within an unrefined cell
+        sleep, checkpoint, concurrency, rate
+            As in `fetch_bbox_geojson`
+        """
+        if not 0 < min_step_km <= initial_step_km:
+            raise ValueError("Require 0 < min_step_km <= initial_step_km")
+
+        min_lon, min_lat, max_lon, max_lat = bbox
+        # Points live on a lattice of min_step_km; cells span 2**levels lattice steps
+        unit = min_step_km / 111.0  # km → degrees (approx)
+        levels = int(np.ceil(np.log2(initial_step_km / min_step_km) - 1e-9))
+        size = 2 ** levels
+        nx = max(1, int(np.ceil((max_lon - min_lon) / (unit * size) - 1e-9)))
+        ny = max(1, int(np.ceil((max_lat - min_lat) / (unit * size) - 1e-9)))
+        # The cells overhang the bbox; lattice indices past its edge are clipped
+        # to the last row/column, which lies on the edge, so no point outside
+        # the bbox is requested
+        last_i = max(1, int(np.ceil((max_lon - min_lon) / unit - 1e-9)))
+        last_j = max(1, int(np.ceil((max_lat - min_lat) / unit - 1e-9)))
+
+        def point(i, j):
+            return min(min_lat + j * unit, max_lat), min(min_lon + i * unit, max_lon)
+
+        state = self._checkpoint(
+            checkpoint, bbox, kind="pvgis-adaptive", initial_step_km=initial_step_km,
+            min_step_km=min_step_km, tolerance=tolerance
+        )
+
+        values: Dict[Tuple[int, int], float] = {}  # (i, j) lattice index → E_y
+
+        def fetch(indices):
+            indices = sorted(set(indices) - values.keys(), key=lambda ij: (ij[1], ij[0]))
+            points = [point(i, j) for i, j in indices]
+            energies = self.fetch_points(
+                points, concurrency=concurrency, rate=rate, sleep=sleep, checkpoint=state
+            )
+            values.update(zip(indices, energies))
+
+        def corners(i, j, n):
+            return [
+                (min(a, last_i), min(b, last_j))
+                for a, b in ((i, j), (i + n, j), (i, j + n), (i + n, j + n))
+            ]
+
+        cells = [(cx * size, cy * size) for cy in range(ny) for cx in range(nx)]
+        fetch([corner for i, j in cells for corner in corners(i, j, size)])
+
+        while size > 1 and cells:
+            refine = []
+            for i, j in cells:
+                energies = [values[corner] for corner in corners(i, j, size)]
+                if max(energies) - min(energies) > tolerance:
+                    refine.append((i, j))
+
+            size //= 2
+            cells = [
+                (i + di * size, j + dj * size) for i, j in refine for dj in (0, 1) for di in (0, 1)
+            ]
+            fetch([corner for i, j in cells for corner in corners(i, j, size)])
+
+        features = [
+            self._point_feature(feature_id, *point(i, j), values[(i, j)])
+            for feature_id, (i, j) in enumerate(sorted(values, key=lambda ij: (ij[1], ij[0])), start=1)
+        ]
+
+        if state is not None:
+            state.remove()
 
         return {
             "type": "FeatureCollection",
@@ -204,7 +1517,10 @@ if __name__ == "__main__":
     amsterdam_full = (4.728, 52.278, 5.079, 52.431)  # ~35km × ~17km (full Amsterdam)
     
     # Fetch full building footprints
-    buildings_full = fetch_pdok_buildings(amsterdam_full, output_path="data/footprints.json")
+    buildings_full = fetch_pdok_buildings(
+        amsterdam_full, output_path="data/footprints.json", concurrency=8, tile_size=1000,
+        checkpoint="data/.footprints.checkpoint"
+    )
     print(f"✓ Saved {len(buildings_full)} buildings to data/footprints.json")
     
     # Fetch full solar data
@@ -212,7 +1528,8 @@ if __name__ == "__main__":
     geojson_full = client.fetch_bbox_geojson(
         bbox=amsterdam_full,
         step_km=1.0,  # 1km grid spacing
-        sleep=0.01
+        checkpoint="data/.solar.checkpoint",
+        concurrency=8
     )
     client.save_geojson(geojson_full, "data/solar.json")
     print(f"✓ Saved {len(geojson_full['features'])} solar points to data/solar.json")
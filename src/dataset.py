@@ -0,0 +1,458 @@
+"""
+Dataset Module
+Loads the ranked buildings served by the API together with the indexes
+derived from them (spatial indexes, vector tile renderer).
+"""
+
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+from src.aggregation import GridAggregator
+from src.columnar import ColumnarDataset
+from src.ranking import score_order as compute_score_order
+from src.spatial_search import SpatialIndex
+from src.tiles import VectorTileRenderer
+
+
+# Candidate data files, most complete dataset first
+DATA_FILES = [
+    "ranked_buildings.json",
+    "buildings_with_solar_analysis.json",
+    "processed_buildings.json",
+    "ranked_test_buildings.json",  # Fallback to test data
+]
+
+# Columns summarized by the statistics cache
+STATS_COLUMNS = [
+    'suitability_score', 'roof_area_m2', 'solar_potential_kwh',
+    'solar_irradiance', 'shading_factor', 'payback_period_years'
+]
+
+
+class BuildingsDataset:
+    """
+    Buildings data served by the API.
+
+    Derived indexes are built lazily on first use and at most once per
+    dataset, or all at once with `build_indexes()`. A dataset is never
+    modified after it is served, so the frame can be swapped as a unit with
+    everything that was computed from it and requests holding a reference
+    keep a consistent snapshot.
+    """
+
+    def __init__(
+        self,
+        frame: gpd.GeoDataFrame,
+        source: Optional[Path] = None,
+        load_seconds: float = 0.0,
+        tile_cache_dir: Optional[Union[str, Path]] = None,
+        version: Optional[str] = None,
+        score_order: Optional[np.ndarray] = None,
+        centroids: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize the dataset.
+
+        Parameters
+        ----------
+        frame : gpd.GeoDataFrame
+            Buildings with suitability results
+        source : Path, optional
+            File the buildings were loaded from
+        load_seconds : float
+            Time spent loading the file
+        tile_cache_dir : str or Path, optional
+            Directory for the on-disk vector tile cache
+        version : str, optional
+            Dataset version (default: derived from the source file)
+        score_order : np.ndarray, optional
+            Precomputed row order by suitability
+        centroids : np.ndarray, optional
+            Precomputed (n, 2) building centroids, used by the spatial
+            index and the grid aggregator
+        """
+        self.frame = frame
+        self.source = source
+        self.load_seconds = load_seconds
+        self.tile_cache_dir = tile_cache_dir
+        self.loaded_at = time.time()
+        self.version = version or _dataset_version(source, frame)
+
+        self._lock = threading.Lock()
+        self._id_map: Optional[pd.Index] = None
+        self._score_order: Optional[np.ndarray] = score_order
+        self._centroids: Optional[np.ndarray] = centroids
+        self._keyset: Optional[tuple] = None
+        self._stats: Optional[Dict[str, Any]] = None
+        self._spatial_index: Optional[SpatialIndex] = None
+        self._strtree: Optional[shapely.STRtree] = None
+        self._tile_renderer: Optional[VectorTileRenderer] = None
+        self._aggregator: Optional[GridAggregator] = None
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self.frame) == 0
+
+    @property
+    def id_map(self) -> pd.Index:
+        """Index of building ids (as strings) to look up row positions."""
+        if self._id_map is None:
+            with self._lock:
+                if self._id_map is None:
+                    if 'building_id' in self.frame.columns:
+                        self._id_map = pd.Index(self.frame['building_id'].astype(str))
+                    else:
+                        self._id_map = pd.Index([], dtype=str)
+        return self._id_map
+
+    @property
+    def score_order(self) -> np.ndarray:
+        """Row positions sorted by suitability (best first)."""
+        if self._score_order is None:
+            with self._lock:
+                if self._score_order is None:
+                    self._score_order = compute_score_order(self.frame)
+        return self._score_order
+
+    @property
+    def keyset(self) -> tuple:
+        """
+        Sort order for keyset pagination: score descending, then building id.
+
+        Returns
+        -------
+        tuple
+            (row positions in key order, negated scores in key order,
+            building ids in key order); missing scores sort last
+        """
+        if self._keyset is None:
+            with self._lock:
+                if self._keyset is None:
+                    self._keyset = self._compute_keyset()
+        return self._keyset
+
+    def _compute_keyset(self) -> tuple:
+        frame = self.frame
+        if 'suitability_score' in frame.columns:
+            scores = frame['suitability_score'].to_numpy(dtype=float)
+        else:
+            scores = np.zeros(len(frame))
+        neg_scores = -np.nan_to_num(scores, nan=-np.inf)
+        if 'building_id' in frame.columns:
+            ids = frame['building_id'].astype(str).to_numpy(dtype=str)
+        else:
+            ids = np.arange(len(frame)).astype(str)
+
+        order = np.lexsort((ids, neg_scores))
+        return order, neg_scores[order], ids[order]
+
+    def keyset_position(self, score: float, building_id: str) -> int:
+        """
+        Position in the keyset order of the first building after a key.
+
+        Parameters
+        ----------
+        score : float
+            Suitability score of the last building of the previous page
+        building_id : str
+            Building id of the last building of the previous page
+
+        Returns
+        -------
+        int
+            Start of the next page in the keyset order (binary search, so
+            it stays valid when the dataset was reloaded in between)
+        """
+        _, neg_scores, ids = self.keyset
+        neg_score = -score if score == score else np.inf  # NaN scores sort last
+        lo = int(np.searchsorted(neg_scores, neg_score, side='left'))
+        hi = int(np.searchsorted(neg_scores, neg_score, side='right'))
+        return lo + int(np.searchsorted(ids[lo:hi], str(building_id), side='right'))
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Summary statistics of the dataset."""
+        if self._stats is None:
+            with self._lock:
+                if self._stats is None:
+                    self._stats = self._compute_stats()
+        return self._stats
+
+    def _compute_stats(self) -> Dict[str, Any]:
+        frame = self.frame
+        stats = {
+            "total_buildings": len(frame),
+            "columns": list(frame.columns)
+        }
+
+        # Calculate statistics for numeric columns
+        for col in STATS_COLUMNS:
+            if col in frame.columns:
+                stats[col] = {
+                    "mean": float(frame[col].mean()),
+                    "median": float(frame[col].median()),
+                    "min": float(frame[col].min()),
+                    "max": float(frame[col].max()),
+                    "std": float(frame[col].std())
+                }
+
+        # Category distribution
+        if 'category' in frame.columns:
+            stats['category_distribution'] = frame['category'].value_counts().to_dict()
+
+        return stats
+
+    def find_building(self, building_id: str) -> Optional[int]:
+        """
+        Find the row position of a building.
+
+        Parameters
+        ----------
+        building_id : str
+            Value of the building_id column, or a numeric row position
+
+        Returns
+        -------
+        int or None
+            Row position, or None if the building does not exist
+        """
+        if len(self.id_map) > 0:
+            position = self.id_map.get_indexer_for([building_id])[0]
+            if position >= 0:
+                return int(position)
+
+        try:
+            idx = int(building_id)
+        except ValueError:
+            return None
+        if 0 <= idx < len(self.frame):
+            return idx
+        return None
+
+    def find_buildings(self, building_ids: List[str]) -> np.ndarray:
+        """
+        Find the row positions of many buildings at once.
+
+        Ids are resolved with one vectorized lookup in the id index; like
+        `find_building`, ids that are not found but are valid row
+        positions resolve to that row.
+
+        Parameters
+        ----------
+        building_ids : List[str]
+            Values of the building_id column, or numeric row positions
+
+        Returns
+        -------
+        np.ndarray
+            Row position per requested id (-1 where it does not exist)
+        """
+        ids = pd.Index([str(building_id) for building_id in building_ids], dtype=object)
+        positions = np.full(len(ids), -1, dtype=np.int64)
+
+        id_map = self.id_map
+        if len(id_map) > 0:
+            if id_map.is_unique:
+                positions = id_map.get_indexer(ids).astype(np.int64)
+            else:
+                # First occurrence wins, as in find_building
+                first = ~id_map.duplicated()
+                found = id_map[first].get_indexer(ids)
+                positions = np.where(found >= 0, np.flatnonzero(first)[found], -1)
+
+        missing = positions < 0
+        if missing.any():
+            numeric = pd.to_numeric(pd.Series(ids[missing]), errors='coerce').to_numpy()
+            valid = (numeric >= 0) & (numeric < len(self.frame)) & (numeric % 1 == 0)
+            positions[np.flatnonzero(missing)[valid]] = numeric[valid].astype(np.int64)
+        return positions
+
+    def build_indexes(self) -> "BuildingsDataset":
+        """
+        Build the lookup indexes up front (before the dataset is served).
+
+        The STRtree, tile renderer and grid aggregator are left lazy: they
+        hold per-process copies of the footprints or centroids, so a worker
+        only builds them when it serves a request that needs them.
+        """
+        if self.is_empty:
+            return self
+        self.id_map
+        self.score_order
+        self.keyset
+        self.stats
+        if self.frame.crs is not None:
+            self.spatial_index
+        return self
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """KD-tree index over building centroids."""
+        if self._spatial_index is None:
+            with self._lock:
+                if self._spatial_index is None:
+                    self._spatial_index = SpatialIndex(self.frame, centroids=self._centroids)
+        return self._spatial_index
+
+    @property
+    def strtree(self) -> shapely.STRtree:
+        """STRtree over building footprints."""
+        if self._strtree is None:
+            with self._lock:
+                if self._strtree is None:
+                    self._strtree = shapely.STRtree(self.frame.geometry.values)
+        return self._strtree
+
+    @property
+    def tile_renderer(self) -> VectorTileRenderer:
+        """Vector tile renderer for the buildings (disk cache kept per version)."""
+        if self._tile_renderer is None:
+            with self._lock:
+                if self._tile_renderer is None:
+                    cache_dir = None
+                    if self.tile_cache_dir is not None:
+                        cache_dir = Path(self.tile_cache_dir) / self.version
+                    self._tile_renderer = VectorTileRenderer(self.frame, cache_dir=cache_dir)
+        return self._tile_renderer
+
+    @property
+    def aggregator(self) -> GridAggregator:
+        """Grid aggregator over building centroids (binning cached per cell size)."""
+        if self._aggregator is None:
+            with self._lock:
+                if self._aggregator is None:
+                    self._aggregator = GridAggregator(self.frame, centroids=self._centroids)
+        return self._aggregator
+
+
+def _dataset_version(source: Optional[Path], frame: gpd.GeoDataFrame) -> str:
+    """Identify a dataset by its source file state (or a unique id in memory)."""
+    if source is not None and Path(source).exists():
+        stat = Path(source).stat()
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}-{len(frame):x}"
+    return f"mem-{uuid.uuid4().hex[:12]}-{len(frame):x}"
+
+
+def load_buildings_dataset(
+    data_path: Union[str, Path] = "data",
+    data_files: Optional[List[str]] = None,
+    tile_cache_dir: Optional[Union[str, Path]] = None,
+    columnar_path: Optional[Union[str, Path]] = None
+) -> BuildingsDataset:
+    """
+    Load the first readable buildings file from the data directory.
+
+    Parameters
+    ----------
+    data_path : str or Path
+        Data directory
+    data_files : List[str], optional
+        Candidate file names in priority order (default: DATA_FILES)
+    tile_cache_dir : str or Path, optional
+        Directory for the on-disk vector tile cache
+    columnar_path : str or Path, optional
+        Memory-mapped columnar dataset (see src.columnar), used instead of
+        the data files when it exists
+
+    Returns
+    -------
+    BuildingsDataset
+        Loaded dataset (empty if no file could be read)
+    """
+    data_path = Path(data_path)
+    start = time.perf_counter()
+
+    if columnar_path is not None and Path(columnar_path).exists():
+        columnar = ColumnarDataset(columnar_path)
+        frame = columnar.to_geodataframe()
+        elapsed = time.perf_counter() - start
+        print(f"✓ Mapped {len(frame)} buildings from {columnar_path} in {elapsed:.2f}s")
+        return BuildingsDataset(
+            frame, Path(columnar_path), elapsed, tile_cache_dir,
+            version=columnar.version,
+            score_order=columnar.index('score_order'),
+            centroids=columnar.index('centroids')
+        )
+
+    for name in data_files or DATA_FILES:
+        data_file = data_path / name
+        if data_file.exists():
+            try:
+                frame = gpd.read_file(data_file)
+                elapsed = time.perf_counter() - start
+                print(f"✓ Loaded {len(frame)} buildings from {data_file} in {elapsed:.2f}s")
+                return BuildingsDataset(frame, data_file, elapsed, tile_cache_dir)
+            except Exception as e:
+                print(f"✗ Failed to load {data_file}: {e}")
+                continue
+
+    print("⚠ No buildings data found. API will return empty results.")
+    return BuildingsDataset(
+        gpd.GeoDataFrame(), None, time.perf_counter() - start, tile_cache_dir
+    )
+
+
+class FileWatcher:
+    """
+    Poll a file and invoke a callback when its modification time changes.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        callback: Callable[[], Any],
+        interval: float = 5.0
+    ):
+        self.path = Path(path)
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_mtime = self._mtime()
+
+    def _mtime(self) -> Optional[int]:
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def check(self) -> bool:
+        """Check the file once; run the callback and return True if it changed."""
+        mtime = self._mtime()
+        if mtime is None or mtime == self._last_mtime:
+            return False
+        self._last_mtime = mtime
+        self.callback()
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"✗ Reload after change of {self.path} failed: {e}")
+
+    def start(self) -> "FileWatcher":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"watch-{self.path.name}", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
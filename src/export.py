@@ -0,0 +1,346 @@
+"""
+Export Module
+Serializes buildings for bulk export by the API.
+
+Records are serialized in row batches by generators, so exports can be
+streamed to the client with constant memory and the first bytes are sent
+as soon as the first batch is encoded. Geometries are encoded to GeoJSON
+with one vectorized shapely call per batch and attributes with one pandas
+call per batch, without building intermediate Python dictionaries.
+
+Columnar exports (Arrow IPC stream, GeoParquet) are converted straight from
+the in-memory frame and require the optional pyarrow package.
+"""
+
+import io
+import json
+from typing import Iterator, List, Optional
+
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+# Optional imports for columnar exports
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Rows serialized per batch by the streaming exports
+EXPORT_BATCH_SIZE = 1000
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+GEOJSON_SEQ_CONTENT_TYPE = 'application/geo+json-seq'
+ARROW_STREAM_CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+PARQUET_CONTENT_TYPE = 'application/vnd.apache.parquet'
+
+# Media types accepted for the columnar formats in the Accept header
+COLUMNAR_MEDIA_TYPES = {
+    ARROW_STREAM_CONTENT_TYPE: 'arrow',
+    PARQUET_CONTENT_TYPE: 'parquet',
+    'application/x-parquet': 'parquet',
+}
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def geometry_columns(frame: pd.DataFrame) -> List[str]:
+    """Names of the geometry-dtype columns of a frame."""
+    return [
+        col for col in frame.columns
+        if isinstance(frame[col].dtype, gpd.array.GeometryDtype)
+    ]
+
+
+def _json_lines(frame: pd.DataFrame) -> List[str]:
+    """Serialize the rows of a frame to one JSON object string per row."""
+    if len(frame) == 0:
+        return []
+    if len(frame.columns) == 0:
+        return ["{}"] * len(frame)
+    text = pd.DataFrame(frame).to_json(
+        orient='records', lines=True, date_format='iso',
+        double_precision=15, default_handler=str
+    )
+    # JSON strings escape newlines, so every line is exactly one record
+    return text.rstrip('\n').split('\n')
+
+
+def _crs_member(frame: gpd.GeoDataFrame) -> Optional[dict]:
+    """GeoJSON `crs` member for non-WGS84 data, as written by geopandas."""
+    crs = getattr(frame, 'crs', None)
+    if crs is None or crs.equals("epsg:4326"):
+        return None
+    authority = crs.to_authority()
+    if authority is None or authority[0] not in ("EDCS", "EPSG", "OGC", "SI", "UCUM"):
+        return None
+    return {"type": "name", "properties": {"name": f"urn:ogc:def:crs:{authority[0]}::{authority[1]}"}}
+
+
+def _batches(frame: pd.DataFrame, batch_size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(frame), batch_size):
+        yield frame.iloc[start:start + batch_size]
+
+
+# ============================================================================
+# Generators
+# ============================================================================
+
+def iter_record_lines(
+    frame: pd.DataFrame,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[str]:
+    """
+    Yield NDJSON chunks of building records (geometry excluded).
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Buildings to export
+    batch_size : int
+        Rows serialized per chunk
+
+    Yields
+    ------
+    str
+        Newline-terminated JSON records of one batch
+    """
+    attributes = frame.drop(columns=geometry_columns(frame))
+    for batch in _batches(attributes, batch_size):
+        yield "".join(line + "\n" for line in _json_lines(batch))
+
+
+def iter_features(
+    frame: gpd.GeoDataFrame,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[List[str]]:
+    """
+    Yield batches of GeoJSON Feature strings.
+
+    Features carry the frame index as `id`, the non-geometry columns as
+    `properties` and the active geometry, like `GeoDataFrame.to_json()`.
+
+    Parameters
+    ----------
+    frame : gpd.GeoDataFrame
+        Buildings to export
+    batch_size : int
+        Features per batch
+
+    Yields
+    ------
+    List[str]
+        Serialized features of one batch
+    """
+    geometry_name = getattr(frame, '_geometry_column_name', None)
+    if geometry_name not in frame.columns:
+        geometry_name = None
+    attributes = frame.drop(columns=geometry_columns(frame))
+
+    for start in range(0, len(frame), batch_size):
+        batch = frame.iloc[start:start + batch_size]
+        properties = _json_lines(attributes.iloc[start:start + batch_size])
+        if geometry_name is not None:
+            geometries = shapely.to_geojson(batch[geometry_name].values)
+        else:
+            geometries = [None] * len(batch)
+        ids = pd.Series(batch.index).astype(str).to_list()
+
+        yield [
+            '{"id": %s, "type": "Feature", "properties": %s, "geometry": %s}' % (
+                json.dumps(feature_id), props,
+                geometry if geometry is not None else "null"
+            )
+            for feature_id, props, geometry in zip(ids, properties, geometries)
+        ]
+
+
+def iter_feature_collection(
+    frame: gpd.GeoDataFrame,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[str]:
+    """
+    Yield a GeoJSON FeatureCollection in chunks of `batch_size` features.
+
+    The document is equivalent to `GeoDataFrame.to_json()`, including the
+    `crs` member for data that is not in WGS84.
+
+    Parameters
+    ----------
+    frame : gpd.GeoDataFrame
+        Buildings to export
+    batch_size : int
+        Features per chunk
+
+    Yields
+    ------
+    str
+        Consecutive pieces of the FeatureCollection document
+    """
+    yield '{"type": "FeatureCollection", "features": ['
+    separator = ""
+    for features in iter_features(frame, batch_size):
+        yield separator + ", ".join(features)
+        separator = ", "
+    crs = _crs_member(frame)
+    if crs is not None:
+        yield '], "crs": %s}' % json.dumps(crs)
+    else:
+        yield ']}'
+
+
+def iter_feature_lines(
+    frame: gpd.GeoDataFrame,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[str]:
+    """
+    Yield newline-delimited GeoJSON features (one Feature per line).
+
+    Parameters
+    ----------
+    frame : gpd.GeoDataFrame
+        Buildings to export
+    batch_size : int
+        Features per chunk
+
+    Yields
+    ------
+    str
+        Newline-terminated features of one batch
+    """
+    for features in iter_features(frame, batch_size):
+        yield "".join(feature + "\n" for feature in features)
+
+
+def feature_collection(
+    frame: gpd.GeoDataFrame,
+    batch_size: Optional[int] = None
+) -> str:
+    """Serialize buildings to a complete GeoJSON FeatureCollection string."""
+    return "".join(iter_feature_collection(frame, batch_size or EXPORT_BATCH_SIZE))
+
+
+# ============================================================================
+# Columnar exports
+# ============================================================================
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Arrow and Parquet exports")
+
+
+def to_arrow_table(frame: pd.DataFrame, include_geometry: bool = True) -> "pa.Table":
+    """
+    Convert buildings to an Arrow table.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Buildings to export
+    include_geometry : bool
+        Keep the active geometry as a GeoArrow WKB column; otherwise all
+        geometry columns are dropped
+
+    Returns
+    -------
+    pa.Table
+        Columnar buildings (the frame index is not included)
+    """
+    _require_pyarrow()
+    if include_geometry and isinstance(frame, gpd.GeoDataFrame) \
+            and getattr(frame, '_geometry_column_name', None) in frame.columns:
+        others = [c for c in geometry_columns(frame) if c != frame.geometry.name]
+        frame = frame.drop(columns=others)
+        if hasattr(frame, 'to_arrow'):
+            return pa.table(frame.to_arrow(index=False))
+        return _geoarrow_wkb_table(frame)  # geopandas < 1.0
+
+    attributes = pd.DataFrame(frame.drop(columns=geometry_columns(frame)))
+    return pa.Table.from_pandas(attributes, preserve_index=False)
+
+
+def _geoarrow_wkb_table(frame: gpd.GeoDataFrame) -> "pa.Table":
+    """Arrow table with a GeoArrow WKB geometry column, as `to_arrow` writes it."""
+    name = frame.geometry.name
+    attributes = pd.DataFrame(frame.drop(columns=[name]))
+    table = pa.Table.from_pandas(attributes, preserve_index=False)
+
+    extension = {"crs": json.loads(frame.crs.to_json())} if frame.crs is not None else {}
+    field = pa.field(name, pa.binary(), metadata={
+        "ARROW:extension:name": "geoarrow.wkb",
+        "ARROW:extension:metadata": json.dumps(extension),
+    })
+    wkb = pa.array(shapely.to_wkb(frame.geometry.values), type=pa.binary())
+    return table.add_column(list(frame.columns).index(name), field, wkb)
+
+
+def iter_arrow_stream(
+    table: "pa.Table",
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield an Arrow IPC stream of a table, one record batch at a time.
+
+    Parameters
+    ----------
+    table : pa.Table
+        Table to send
+    batch_size : int
+        Maximum rows per record batch
+
+    Yields
+    ------
+    bytes
+        Schema message, then one chunk per record batch and end-of-stream
+    """
+    _require_pyarrow()
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, table.schema)
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    yield drain()
+    for batch in table.to_batches(max_chunksize=batch_size):
+        writer.write_batch(batch)
+        yield drain()
+    writer.close()
+    yield drain()
+
+
+def to_parquet_bytes(frame: pd.DataFrame, include_geometry: bool = True) -> bytes:
+    """
+    Serialize buildings to (Geo)Parquet.
+
+    With geometry, the file carries the GeoParquet metadata written by
+    geopandas; without, a plain Parquet file of the attributes is written.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Buildings to export
+    include_geometry : bool
+        Keep the active geometry column
+
+    Returns
+    -------
+    bytes
+        Parquet file contents
+    """
+    _require_pyarrow()
+    buffer = io.BytesIO()
+    if include_geometry and isinstance(frame, gpd.GeoDataFrame) \
+            and getattr(frame, '_geometry_column_name', None) in frame.columns:
+        others = [c for c in geometry_columns(frame) if c != frame.geometry.name]
+        frame.drop(columns=others).to_parquet(buffer, index=False)
+    else:
+        pq.write_table(to_arrow_table(frame, include_geometry=False), buffer)
+    return buffer.getvalue()
@@ -7,11 +7,25 @@ Interpolates solar values for buildings from point data.
 import numpy as np
 import geopandas as gpd
 from shapely.geometry import Polygon, Point
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, Union
 import json
+import os
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 from scipy.interpolate import griddata
 
+# Optional imports for streaming JSON parsing
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+# Roof height attribute: BAG3D WFS name first, then the older 3DBAG export name
+ROOF_HEIGHT_COLUMNS = ['b3_h_dak_max', 'h_dak_max']
+
 
 def calculate_roof_area(geometry: Polygon) -> float:
     """
@@ -134,33 +148,114 @@ def get_roof_vertices(geometry: Polygon) -> np.ndarray:
 # Functional approach: Solar interpolation functions
 # ============================================================================
 
-def load_solar_data(filepath: str = "data/solar.json") -> Tuple[np.ndarray, np.ndarray]:
+def _parse_solar_json(filepath: Union[str, Path]) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse a solar FeatureCollection into preallocated arrays."""
+    with open(filepath, 'rb') as f:
+        features = json.load(f)['features']
+    n = len(features)
+
+    # itemgetter/map/fromiter run in C: no per-feature Python code
+    points = list(map(itemgetter('coordinates'), map(itemgetter('geometry'), features)))
+    if n and (np.fromiter(map(len, points), dtype=np.intp, count=n) != 2).any():
+        raise ValueError(f"Solar points must have 2 coordinates [lon, lat]: {filepath}")
+    coords = np.fromiter(chain.from_iterable(points), dtype=np.float64, count=2 * n).reshape(n, 2)
+
+    e_y = list(map(itemgetter('E_y'), map(itemgetter('properties'), features)))
+    try:
+        values = np.fromiter(e_y, dtype=np.float64, count=n)
+    except TypeError:
+        # Missing values (null E_y) become NaN
+        values = np.array(e_y, dtype=np.float64)
+    return coords, values
+
+
+def _stream_solar_json(filepath: Union[str, Path]) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse a solar FeatureCollection incrementally with ijson."""
+    if not IJSON_AVAILABLE:
+        raise ImportError("ijson is required for streaming solar data parsing")
+
+    def flat_points(points):
+        for point in points:
+            if len(point) != 2:
+                raise ValueError(f"Solar points must have 2 coordinates [lon, lat]: {filepath}")
+            yield from point
+
+    with open(filepath, 'rb') as f:
+        coords = np.fromiter(
+            flat_points(ijson.items(f, 'features.item.geometry.coordinates', use_float=True)),
+            dtype=np.float64
+        ).reshape(-1, 2)
+        f.seek(0)
+        values = np.fromiter(
+            (np.nan if v is None else v
+             for v in ijson.items(f, 'features.item.properties.E_y', use_float=True)),
+            dtype=np.float64
+        )
+    if len(coords) != len(values):
+        raise ValueError(
+            f"{len(coords)} solar points but {len(values)} E_y values in {filepath}"
+        )
+    return coords, values
+
+
+def load_solar_data(
+    filepath: str = "data/solar.json",
+    use_cache: bool = False,
+    cache_path: Optional[str] = None,
+    streaming: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
     """
     Load solar point data from JSON file.
     
+    The parsed FeatureCollection is copied into preallocated NumPy arrays
+    without a per-feature Python loop; the cost of a load is then mostly
+    `json.load` itself. With `use_cache`, the arrays are also saved to a
+    compact `.npz` file on first load and read from it as long as the
+    source file keeps the same modification time and size, which skips
+    JSON parsing entirely: this is the fast path for repeated loads.
+    
     Parameters
     ----------
     filepath : str
         Path to solar data JSON file
+    use_cache : bool
+        Read/write the binary cache
+    cache_path : str, optional
+        Cache file (default: `<filepath>.npz`)
+    streaming : bool
+        Parse incrementally with ijson instead of loading the whole
+        document: bounded memory for very large files, but not faster
     
     Returns
     -------
     Tuple[np.ndarray, np.ndarray]
-        Coordinates (N, 2) and solar energy values (N,)
+        Coordinates (N, 2) as [lon, lat] and solar energy values (N,)
     """
-    with open(filepath, 'r') as f:
-        data = json.load(f)
-    
-    coords = []
-    values = []
-    
-    for feature in data['features']:
-        lon, lat = feature['geometry']['coordinates']
-        e_y = feature['properties']['E_y']
-        coords.append([lon, lat])
-        values.append(e_y)
-    
-    return np.array(coords), np.array(values)
+    parse = _stream_solar_json if streaming else _parse_solar_json
+    if not use_cache:
+        return parse(filepath)
+
+    cache = Path(cache_path) if cache_path else Path(f"{filepath}.npz")
+    source = os.stat(filepath)
+    if cache.exists():
+        try:
+            with np.load(cache) as cached:
+                if (int(cached['mtime_ns']) == source.st_mtime_ns
+                        and int(cached['size']) == source.st_size):
+                    return cached['coords'], cached['values']
+        except (OSError, KeyError, ValueError):
+            pass  # unreadable cache: rebuild it
+
+    coords, values = parse(filepath)
+    tmp = cache.with_name(cache.name + '.tmp')
+    try:
+        with open(tmp, 'wb') as f:
+            np.savez(f, coords=coords, values=values,
+                     mtime_ns=source.st_mtime_ns, size=source.st_size)
+        tmp.replace(cache)
+    except OSError as e:
+        print(f"⚠ Could not write solar data cache {cache}: {e}")
+    return coords, values
 
 
 def interpolate_solar_at_point(point: Point, solar_coords: np.ndarray, 
@@ -299,8 +394,10 @@ class BuildingGeometryProcessor:
         )
         
         # Extract height if available
-        if 'h_dak_max' in self.buildings_gdf.columns:
-            self.buildings_gdf['building_height_m'] = self.buildings_gdf['h_dak_max']
+        for column in ROOF_HEIGHT_COLUMNS:
+            if column in self.buildings_gdf.columns:
+                self.buildings_gdf['building_height_m'] = self.buildings_gdf[column]
+                break
         
         print(f"✓ Computed properties for {len(self.buildings_gdf)} buildings")
         return self.buildings_gdf
@@ -0,0 +1,242 @@
+"""
+HTTP Cache Module
+In-process cache of API responses with ETag support.
+
+Responses only change when the served dataset is reloaded, so a response
+is identified by the dataset version, the request path and the normalized
+query parameters. The same identity is used as the ETag, which lets
+conditional requests be answered with 304 before any work is done.
+
+Compressible bodies are compressed once per encoding (gzip, and brotli
+when the optional brotli package is installed) and the compressed
+variants are cached next to the identity body.
+"""
+
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Optional imports for brotli compression
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+# Media types worth compressing (text formats)
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/geo+json',
+    'application/geo+json-seq',
+    'application/x-ndjson',
+}
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class CachedResponse:
+    """Body and metadata of a cached response."""
+
+    def __init__(self, body: bytes, mimetype: str, etag: str,
+                 headers: Optional[Dict[str, str]] = None):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = etag
+        self.headers = headers or {}
+        self.encodings: Dict[str, bytes] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(data) for data in self.encodings.values())
+
+
+# ============================================================================
+# Compression
+# ============================================================================
+
+def available_encodings() -> Tuple[str, ...]:
+    """Content encodings the server can produce, preferred first."""
+    return ('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)
+
+
+def choose_encoding(accept_encodings, mimetype: str, size: Optional[int] = None) -> Optional[str]:
+    """
+    Negotiate the content encoding of a response.
+
+    Parameters
+    ----------
+    accept_encodings : werkzeug.datastructures.Accept
+        Parsed Accept-Encoding header of the request
+    mimetype : str
+        Media type of the body
+    size : int, optional
+        Body size, if known; small bodies are not compressed
+
+    Returns
+    -------
+    str or None
+        'br' or 'gzip', or None to send the body as is
+    """
+    if mimetype not in COMPRESSIBLE_MIMETYPES:
+        return None
+    if size is not None and size < MIN_COMPRESS_SIZE:
+        return None
+    for encoding in available_encodings():
+        if accept_encodings[encoding] > 0:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a body with the given content encoding."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def iter_compressed(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        compress_chunk, finish = compressor.process, compressor.finish
+    elif encoding == 'gzip':
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+        compress_chunk, finish = compressor.compress, compressor.flush
+    else:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    for chunk in chunks:
+        data = compress_chunk(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+# ============================================================================
+# Response Cache
+# ============================================================================
+
+def normalize_query(args: Iterable[Tuple[str, str]]) -> str:
+    """Canonical form of query parameters (sorted, independent of order)."""
+    return "&".join(f"{key}={value}" for key, value in sorted(args))
+
+
+def make_etag(*parts: str) -> str:
+    """Strong ETag value derived from the given key parts."""
+    digest = hashlib.sha1("\x1f".join(parts).encode('utf-8')).hexdigest()
+    return digest[:32]
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of response bodies.
+
+    The cache is bounded by the total size of the cached bodies; the least
+    recently used responses are evicted first. Responses larger than
+    `max_entry_bytes` are never cached.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024,
+                 max_entry_bytes: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Parameters
+        ----------
+        max_bytes : int
+            Maximum total size of cached bodies (0 disables the cache)
+        max_entry_bytes : int, optional
+            Maximum size of a single body (default: max_bytes / 8)
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 8
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> bool:
+        """
+        Cache a response, evicting the least recently used ones as needed.
+
+        Returns
+        -------
+        bool
+            True if the response was cached
+        """
+        if entry.size > self.max_entry_bytes or entry.size > self.max_bytes:
+            return False
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+        return True
+
+    def get_encoded(self, key: str, entry: CachedResponse, encoding: str) -> bytes:
+        """
+        Get the body of a cached response in a content encoding.
+
+        The body is compressed on first use and the compressed variant is
+        cached with the entry (counting towards the cache size).
+        """
+        data = entry.encodings.get(encoding)
+        if data is not None:
+            return data
+
+        data = compress(entry.body, encoding)
+        with self._lock:
+            if self._entries.get(key) is entry and encoding not in entry.encodings:
+                entry.encodings[encoding] = data
+                self.size += len(data)
+                while self.size > self.max_bytes and len(self._entries) > 1:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.size -= evicted.size
+        return data
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def info(self) -> Dict[str, int]:
+        """Cache statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
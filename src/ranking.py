@@ -92,6 +92,30 @@ def classify_building_suitability(score: float) -> str:
         return "Unsuitable"
 
 
+def score_order(frame: pd.DataFrame) -> np.ndarray:
+    """
+    Row positions sorted by suitability (best first).
+
+    Falls back to the `rank` column (ascending), then to the row order.
+    The sort is stable, so ties keep their row order.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Buildings with `suitability_score` or `rank`
+
+    Returns
+    -------
+    np.ndarray
+        Row positions in suitability order
+    """
+    if 'suitability_score' in frame.columns:
+        return np.argsort(-frame['suitability_score'].to_numpy(dtype=float), kind='stable')
+    if 'rank' in frame.columns:
+        return np.argsort(frame['rank'].to_numpy(dtype=float), kind='stable')
+    return np.arange(len(frame))
+
+
 def rank_buildings(buildings_gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
     Rank buildings by suitability score.
@@ -36,7 +36,7 @@ class SpatialIndex:
     - Query: O(log n) average case
     """
     
-    def __init__(self, buildings_gdf: gpd.GeoDataFrame):
+    def __init__(self, buildings_gdf: gpd.GeoDataFrame, centroids: Optional[np.ndarray] = None):
         """
         Initialize spatial index with building centroids.
         
@@ -44,24 +44,25 @@ class SpatialIndex:
         ----------
         buildings_gdf : gpd.GeoDataFrame
             GeoDataFrame containing building geometries
+        centroids : np.ndarray, optional
+            Precomputed (n, 2) centroid coordinates (e.g. the centroid
+            index of a columnar dataset)
         """
-        self.buildings_gdf = buildings_gdf.copy()
+        # Keep a reference only: results are sliced out of the frame per
+        # query, so a memory-mapped frame stays shared between processes
+        self.buildings_gdf = buildings_gdf
         
         # Extract centroids for KD-tree
-        self.buildings_gdf['centroid'] = self.buildings_gdf.geometry.centroid
-        self.buildings_gdf['x'] = self.buildings_gdf.centroid.x
-        self.buildings_gdf['y'] = self.buildings_gdf.centroid.y
-        
-         # Build KD-tree from centroids
-        x = self.buildings_gdf['x'].to_numpy(dtype=float)
-        y = self.buildings_gdf['y'].to_numpy(dtype=float)
-        self.coordinates = np.column_stack((x, y))
-        
+        if centroids is None:
+            centroid = buildings_gdf.geometry.centroid
+            centroids = np.column_stack((centroid.x.to_numpy(dtype=float),
+                                         centroid.y.to_numpy(dtype=float)))
+        
+        # Build KD-tree from centroids (a float64 C-contiguous array, such as
+        # the mapped centroid index, is used in place without copying)
+        self.coordinates = np.ascontiguousarray(centroids, dtype=np.float64)
         self.kdtree = KDTree(self.coordinates)
-        
-        
 
-        
     def find_nearest_neighbors(
         self,
         point: Point,
@@ -90,10 +91,15 @@ class SpatialIndex:
         
         # KD-tree query: finds k nearest neighbors
         distances, indices = self.kdtree.query(query_point, k=k)
+        distances = np.atleast_1d(distances)
+        indices = np.atleast_1d(indices)
+        
+        # Drop missing neighbours when k exceeds the number of buildings
+        found = indices < len(self.buildings_gdf)
         
         # Return corresponding buildings
-        nearest_buildings = self.buildings_gdf.iloc[indices].copy()
-        nearest_buildings['distance'] = distances
+        nearest_buildings = self.buildings_gdf.iloc[indices[found]].copy()
+        nearest_buildings['distance'] = distances[found]
         
         return nearest_buildings
     
@@ -118,28 +124,21 @@ class SpatialIndex:
         Returns
         -------
         gpd.GeoDataFrame
-            Buildings within radius
+            Buildings within radius, sorted by distance
         """
         query_point = np.array([point.x, point.y])
         
         # KD-tree range query: finds all points within radius
-        indices = self.kdtree.query_ball_point(query_point, radius)
-        result = self.buildings_gdf.iloc[indices].copy()
-        if result.empty:
-           print("No buildings found within radius.")
-        return result
-
-
+        indices = np.asarray(self.kdtree.query_ball_point(query_point, radius), dtype=int)
+        
+        # Calculate actual distances from the indexed centroids
+        distances = np.hypot(*(self.coordinates[indices] - query_point).T)
+        order = np.argsort(distances, kind='stable')
         
         # Return buildings within radius
-        nearby_buildings = self.buildings_gdf.iloc[indices].copy()
-        
-        # Calculate actual distances
-        nearby_buildings['distance'] = nearby_buildings.apply(
-            lambda row: point.distance(row.centroid),
-            axis=1
-        )
-        return nearby_buildings.sort_values('distance')
+        nearby_buildings = self.buildings_gdf.iloc[indices[order]].copy()
+        nearby_buildings['distance'] = distances[order]
+        return nearby_buildings
 
 
 def binary_search_building_by_score(
@@ -0,0 +1,945 @@
+"""
+Vector Tile Module
+Encodes building footprints as Mapbox Vector Tiles (MVT) for web maps.
+
+Footprints are selected per tile through the GeoDataFrame spatial index,
+clipped to the (buffered) tile extent, simplified to the tile resolution and
+quantized to the integer tile grid before being encoded with the suitability
+attributes attached.
+"""
+
+import argparse
+import gzip
+import io
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+from shapely.geometry import Polygon, MultiPolygon, box
+from shapely.geometry.polygon import orient
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Half the circumference of the Web Mercator (EPSG:3857) world in meters
+WEB_MERCATOR_ORIGIN = 20037508.342789244
+
+MVT_CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+
+TILE_CONTENT_TYPES = {
+    'mvt': MVT_CONTENT_TYPE,
+    'png': "image/png",
+}
+
+# Color ramp for choropleth raster tiles (low -> high score)
+CHOROPLETH_COLORS = np.array([
+    [215, 48, 39],    # #d73027
+    [254, 224, 139],  # #fee08b
+    [26, 152, 80],    # #1a9850
+], dtype=float)
+
+# Attributes attached to each feature (only those present in the data are used)
+DEFAULT_TILE_ATTRIBUTES = (
+    'building_id',
+    'identificatie',
+    'suitability_score',
+    'suitability_class',
+    'category',
+    'rank',
+    'solar_potential_kwh',
+    'energy_potential',
+    'roof_area_m2',
+    'roof_area',
+)
+
+
+# ============================================================================
+# Tile Math
+# ============================================================================
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    Calculate the Web Mercator bounds of an XYZ tile.
+
+    Parameters
+    ----------
+    z, x, y : int
+        Tile zoom level and column/row (XYZ scheme, row 0 at the top)
+
+    Returns
+    -------
+    Tuple[float, float, float, float]
+        (minx, miny, maxx, maxy) in EPSG:3857 meters
+    """
+    size = 2 * WEB_MERCATOR_ORIGIN / (2 ** z)
+    minx = -WEB_MERCATOR_ORIGIN + x * size
+    maxy = WEB_MERCATOR_ORIGIN - y * size
+    return (minx, maxy - size, minx + size, maxy)
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    """Check that tile coordinates exist at the given zoom level."""
+    if z < 0:
+        return False
+    n = 2 ** z
+    return 0 <= x < n and 0 <= y < n
+
+
+def tiles_for_bounds(
+    bounds: Tuple[float, float, float, float],
+    z: int
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    Enumerate the XYZ tiles covering Web Mercator bounds at one zoom level.
+
+    Parameters
+    ----------
+    bounds : Tuple[float, float, float, float]
+        (minx, miny, maxx, maxy) in EPSG:3857 meters
+    z : int
+        Zoom level
+
+    Yields
+    ------
+    Tuple[int, int, int]
+        (z, x, y) tile coordinates
+    """
+    n = 2 ** z
+    size = 2 * WEB_MERCATOR_ORIGIN / n
+    minx, miny, maxx, maxy = bounds
+
+    x0 = int(math.floor((minx + WEB_MERCATOR_ORIGIN) / size))
+    x1 = int(math.floor((maxx + WEB_MERCATOR_ORIGIN) / size))
+    y0 = int(math.floor((WEB_MERCATOR_ORIGIN - maxy) / size))
+    y1 = int(math.floor((WEB_MERCATOR_ORIGIN - miny) / size))
+
+    for x in range(max(x0, 0), min(x1, n - 1) + 1):
+        for y in range(max(y0, 0), min(y1, n - 1) + 1):
+            yield (z, x, y)
+
+
+def score_colors(values: np.ndarray, vmin: float = 0.0, vmax: float = 100.0) -> np.ndarray:
+    """
+    Map values onto the red-yellow-green choropleth ramp.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values to color (NaN maps to the lowest color)
+    vmin, vmax : float
+        Value range mapped onto the ramp
+
+    Returns
+    -------
+    np.ndarray
+        RGB colors (N, 3) as uint8
+    """
+    span = vmax - vmin if vmax > vmin else 1.0
+    t = np.clip((np.nan_to_num(values, nan=vmin) - vmin) / span, 0.0, 1.0)
+    positions = np.linspace(0.0, 1.0, len(CHOROPLETH_COLORS))
+    rgb = np.column_stack([
+        np.interp(t, positions, CHOROPLETH_COLORS[:, channel]) for channel in range(3)
+    ])
+    return np.round(rgb).astype(np.uint8)
+
+
+# ============================================================================
+# Protobuf / MVT Encoding
+# ============================================================================
+
+def _varint(value: int) -> bytes:
+    """Encode a non-negative integer as a protobuf varint."""
+    out = bytearray()
+    while True:
+        bits = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(bits | 0x80)
+        else:
+            out.append(bits)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    """ZigZag-encode a signed integer (MVT geometry parameters)."""
+    return (value << 1) ^ (value >> 31)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _length_delimited(field: int, payload: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _packed(field: int, values: Iterable[int]) -> bytes:
+    return _length_delimited(field, b''.join(_varint(v) for v in values))
+
+
+def _encode_value(value) -> bytes:
+    """Encode an attribute value as an MVT Value message."""
+    if isinstance(value, (bool, np.bool_)):
+        return _key(7, 0) + _varint(int(bool(value)))
+    if isinstance(value, (int, np.integer)):
+        value = int(value)
+        if value >= 0:
+            return _key(5, 0) + _varint(value)
+        return _key(6, 0) + _varint((value << 1) ^ (value >> 63))
+    if isinstance(value, (float, np.floating)):
+        return _key(3, 1) + np.float64(value).astype('<f8').tobytes()
+    return _length_delimited(1, str(value).encode('utf-8'))
+
+
+def _encode_ring(coords: np.ndarray, cursor: List[int]) -> List[int]:
+    """Encode one closed ring as MoveTo/LineTo/ClosePath commands."""
+    commands = []
+    dx = int(coords[0, 0]) - cursor[0]
+    dy = int(coords[0, 1]) - cursor[1]
+    commands.append((1 & 0x7) | (1 << 3))  # MoveTo, count 1
+    commands.append(_zigzag(dx))
+    commands.append(_zigzag(dy))
+    cursor[0] += dx
+    cursor[1] += dy
+
+    commands.append((2 & 0x7) | ((len(coords) - 1) << 3))  # LineTo
+    for px, py in coords[1:]:
+        dx = int(px) - cursor[0]
+        dy = int(py) - cursor[1]
+        commands.append(_zigzag(dx))
+        commands.append(_zigzag(dy))
+        cursor[0] += dx
+        cursor[1] += dy
+
+    commands.append((7 & 0x7) | (1 << 3))  # ClosePath
+    return commands
+
+
+def _ring_coords(ring) -> Optional[np.ndarray]:
+    """Return ring vertices without the closing point, or None if degenerate."""
+    coords = np.asarray(ring.coords)[:-1]
+    if len(coords) < 3:
+        return None
+    return coords
+
+
+def encode_polygon_geometry(geometry: Union[Polygon, MultiPolygon]) -> List[int]:
+    """
+    Encode a (tile-space, integer) polygon as MVT geometry commands.
+
+    Exterior rings are oriented to a positive area and interior rings to a
+    negative area in tile coordinates, as required by the MVT 2.1 spec.
+
+    Parameters
+    ----------
+    geometry : Polygon or MultiPolygon
+        Geometry already transformed and quantized to tile coordinates
+
+    Returns
+    -------
+    List[int]
+        Command integers (empty if the geometry degenerated)
+    """
+    polygons = geometry.geoms if geometry.geom_type == 'MultiPolygon' else [geometry]
+    cursor = [0, 0]
+    commands = []
+
+    for polygon in polygons:
+        if polygon.is_empty or polygon.area <= 0:
+            continue
+        polygon = orient(polygon, sign=1.0)
+        exterior = _ring_coords(polygon.exterior)
+        if exterior is None:
+            continue
+        commands.extend(_encode_ring(exterior, cursor))
+        for interior in polygon.interiors:
+            coords = _ring_coords(interior)
+            if coords is not None:
+                commands.extend(_encode_ring(coords, cursor))
+
+    return commands
+
+
+def encode_layer(
+    name: str,
+    geometries: Sequence,
+    properties: Sequence[Dict],
+    feature_ids: Optional[Sequence[int]] = None,
+    extent: int = 4096
+) -> bytes:
+    """
+    Encode a polygon layer as an MVT Layer message.
+
+    Parameters
+    ----------
+    name : str
+        Layer name
+    geometries : Sequence
+        Polygons in integer tile coordinates
+    properties : Sequence[Dict]
+        Attribute dict per geometry
+    feature_ids : Sequence[int], optional
+        Feature ids (unsigned)
+    extent : int
+        Tile extent in tile units
+
+    Returns
+    -------
+    bytes
+        Encoded layer (empty if no feature survived encoding)
+    """
+    keys: Dict[str, int] = {}
+    values: Dict[Tuple[type, object], int] = {}
+    value_messages: List[bytes] = []
+    features = []
+
+    for i, (geometry, props) in enumerate(zip(geometries, properties)):
+        commands = encode_polygon_geometry(geometry)
+        if not commands:
+            continue
+
+        tags = []
+        for key, value in props.items():
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                continue
+            key_index = keys.setdefault(key, len(keys))
+            value_key = (type(value), value)
+            if value_key not in values:
+                values[value_key] = len(value_messages)
+                value_messages.append(_encode_value(value))
+            tags.extend((key_index, values[value_key]))
+
+        feature = b''
+        if feature_ids is not None:
+            feature += _key(1, 0) + _varint(int(feature_ids[i]))
+        if tags:
+            feature += _packed(2, tags)
+        feature += _key(3, 0) + _varint(3)  # GeomType POLYGON
+        feature += _packed(4, commands)
+        features.append(_length_delimited(2, feature))
+
+    if not features:
+        return b''
+
+    layer = _key(15, 0) + _varint(2)  # version
+    layer += _length_delimited(1, name.encode('utf-8'))
+    layer += b''.join(features)
+    layer += b''.join(_length_delimited(3, k.encode('utf-8')) for k in keys)
+    layer += b''.join(_length_delimited(4, v) for v in value_messages)
+    layer += _key(5, 0) + _varint(extent)
+    return layer
+
+
+def encode_tile(layers: Sequence[bytes]) -> bytes:
+    """Wrap encoded layers into an MVT Tile message."""
+    return b''.join(_length_delimited(3, layer) for layer in layers if layer)
+
+
+# ============================================================================
+# Tile Renderer
+# ============================================================================
+
+class VectorTileRenderer:
+    """
+    Render building footprints as Mapbox Vector Tiles.
+
+    Buildings are projected to Web Mercator once; each tile then selects its
+    candidates through the spatial index (STRtree), clips, simplifies and
+    quantizes them. Encoded tiles are kept in an in-memory LRU cache and,
+    optionally, in a directory cache on disk.
+    """
+
+    def __init__(
+        self,
+        buildings_gdf: gpd.GeoDataFrame,
+        layer_name: str = 'buildings',
+        attributes: Optional[Sequence[str]] = None,
+        extent: int = 4096,
+        buffer: int = 64,
+        simplify_px: float = 1.0,
+        min_zoom: int = 0,
+        max_zoom: int = 22,
+        cache_size: int = 512,
+        cache_dir: Optional[Union[str, Path]] = None
+    ):
+        """
+        Initialize the renderer.
+
+        Parameters
+        ----------
+        buildings_gdf : gpd.GeoDataFrame
+            Buildings with polygon geometries and a defined CRS
+        layer_name : str
+            Name of the MVT layer
+        attributes : Sequence[str], optional
+            Columns attached to each feature (default: DEFAULT_TILE_ATTRIBUTES)
+        extent : int
+            Tile extent in tile units (4096 is the MVT default)
+        buffer : int
+            Clip buffer around the tile in tile units
+        simplify_px : float
+            Simplification tolerance in tile units (0 disables)
+        min_zoom, max_zoom : int
+            Zoom range served by the renderer
+        cache_size : int
+            Maximum number of encoded tiles kept in memory
+        cache_dir : str or Path, optional
+            Directory for the on-disk tile cache
+        """
+        if len(buildings_gdf) > 0 and buildings_gdf.crs is None:
+            raise ValueError("Buildings data has no CRS; cannot project to Web Mercator")
+
+        self.layer_name = layer_name
+        self.extent = extent
+        self.buffer = buffer
+        self.simplify_px = simplify_px
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.cache_size = cache_size
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+        if attributes is None:
+            attributes = DEFAULT_TILE_ATTRIBUTES
+        self.attributes = [c for c in attributes if c in buildings_gdf.columns]
+
+        if len(buildings_gdf) > 0:
+            projected = buildings_gdf.geometry.to_crs("EPSG:3857")
+            self.geometries = projected.values
+            self.sindex = projected.sindex
+        else:
+            self.geometries = np.array([], dtype=object)
+            self.sindex = None
+
+        self._properties = pd.DataFrame(buildings_gdf[self.attributes]).reset_index(drop=True)
+        self._cache: "OrderedDict[Tuple[int, int, int], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """Web Mercator bounds of all buildings."""
+        return tuple(shapely.total_bounds(np.asarray(self.geometries)))
+
+    def _cache_path(self, z: int, x: int, y: int) -> Path:
+        return self.cache_dir / str(z) / str(x) / f"{y}.mvt"
+
+    def _feature_properties(self, index: np.ndarray) -> List[Dict]:
+        """Convert attribute rows to plain Python values for encoding."""
+        records = self._properties.iloc[index].to_dict(orient='records')
+        for record in records:
+            for key, value in record.items():
+                if isinstance(value, np.generic):
+                    record[key] = value.item()
+        return records
+
+    def _tile_geometries(
+        self,
+        z: int,
+        x: int,
+        y: int,
+        extent: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Select, clip, simplify and quantize the buildings of one tile.
+
+        Parameters
+        ----------
+        z, x, y : int
+            XYZ tile coordinates
+        extent : int
+            Tile extent in tile units (pixels for raster tiles)
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Positional building indices and their tile-space geometries
+        """
+        empty = (np.array([], dtype=int), np.array([], dtype=object))
+        if self.sindex is None:
+            return empty
+
+        minx, miny, maxx, maxy = tile_bounds(z, x, y)
+        scale = extent / (maxx - minx)
+        pad = self.buffer * (extent / self.extent) / scale
+        clip_box = (minx - pad, miny - pad, maxx + pad, maxy + pad)
+
+        # Candidate selection through the spatial index
+        candidates = self.sindex.query(box(*clip_box), predicate='intersects')
+        if len(candidates) == 0:
+            return empty
+        candidates = np.sort(candidates)
+
+        geoms = shapely.clip_by_rect(self.geometries[candidates], *clip_box)
+        if self.simplify_px > 0:
+            geoms = shapely.simplify(geoms, self.simplify_px / scale, preserve_topology=True)
+
+        # Project into tile space (y axis pointing down) and quantize
+        geoms = shapely.transform(
+            geoms,
+            lambda c: np.column_stack(((c[:, 0] - minx) * scale, (maxy - c[:, 1]) * scale))
+        )
+        geoms = shapely.set_precision(geoms, 1.0)
+
+        keep = ~shapely.is_empty(geoms) & np.isin(
+            shapely.get_type_id(geoms), (3, 6)  # Polygon, MultiPolygon
+        )
+        return candidates[keep], geoms[keep]
+
+    def render_tile(self, z: int, x: int, y: int) -> bytes:
+        """
+        Render a single tile without consulting the caches.
+
+        Parameters
+        ----------
+        z, x, y : int
+            XYZ tile coordinates
+
+        Returns
+        -------
+        bytes
+            Encoded MVT tile (empty bytes if the tile has no buildings)
+        """
+        index, geoms = self._tile_geometries(z, x, y, self.extent)
+        if len(index) == 0:
+            return b''
+
+        layer = encode_layer(
+            self.layer_name,
+            geoms,
+            self._feature_properties(index),
+            feature_ids=index + 1,
+            extent=self.extent
+        )
+        return encode_tile([layer])
+
+    def render_png(
+        self,
+        z: int,
+        x: int,
+        y: int,
+        column: str = 'suitability_score',
+        size: int = 256,
+        vmin: float = 0.0,
+        vmax: float = 100.0
+    ) -> bytes:
+        """
+        Render a single choropleth raster tile (PNG).
+
+        Parameters
+        ----------
+        z, x, y : int
+            XYZ tile coordinates
+        column : str
+            Attribute used to color the footprints
+        size : int
+            Tile size in pixels
+        vmin, vmax : float
+            Value range mapped onto the color ramp
+
+        Returns
+        -------
+        bytes
+            PNG image (empty bytes if the tile has no buildings)
+        """
+        from PIL import Image, ImageDraw
+
+        if column not in self._properties.columns:
+            raise KeyError(f"Column '{column}' not found")
+
+        index, geoms = self._tile_geometries(z, x, y, size)
+        if len(index) == 0:
+            return b''
+
+        values = self._properties[column].to_numpy(dtype=float)[index]
+        colors = score_colors(values, vmin, vmax)
+
+        image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        for geometry, color in zip(geoms, colors):
+            fill = tuple(int(c) for c in color) + (220,)
+            polygons = geometry.geoms if geometry.geom_type == 'MultiPolygon' else [geometry]
+            for polygon in polygons:
+                draw.polygon([tuple(c) for c in polygon.exterior.coords], fill=fill)
+                for interior in polygon.interiors:
+                    draw.polygon([tuple(c) for c in interior.coords], fill=(0, 0, 0, 0))
+
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG', optimize=True)
+        return buffer.getvalue()
+
+    def get_tile(self, z: int, x: int, y: int) -> bytes:
+        """
+        Get an encoded tile, using the memory and disk caches.
+
+        Parameters
+        ----------
+        z, x, y : int
+            XYZ tile coordinates
+
+        Returns
+        -------
+        bytes
+            Encoded MVT tile
+        """
+        key = (z, x, y)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        data = None
+        if self.cache_dir is not None:
+            path = self._cache_path(z, x, y)
+            if path.exists():
+                data = path.read_bytes()
+
+        if data is None:
+            data = self.render_tile(z, x, y)
+            if self.cache_dir is not None:
+                path = self._cache_path(z, x, y)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+
+        with self._lock:
+            self._cache[key] = data
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return data
+
+    def clear_cache(self) -> None:
+        """Drop all tiles from the in-memory cache."""
+        with self._lock:
+            self._cache.clear()
+
+
+# ============================================================================
+# Tile Stores
+# ============================================================================
+
+class DirectoryTileStore:
+    """
+    Tile pyramid stored as static files (<root>/<z>/<x>/<y>.<format>).
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def path(self, z: int, x: int, y: int, fmt: str) -> Path:
+        """Path of a tile file (which may not exist)."""
+        return self.root / str(z) / str(x) / f"{y}.{fmt}"
+
+    def put(self, z: int, x: int, y: int, fmt: str, data: bytes) -> None:
+        path = self.path(z, x, y, fmt)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def get(self, z: int, x: int, y: int, fmt: str) -> Optional[bytes]:
+        path = self.path(z, x, y, fmt)
+        return path.read_bytes() if path.exists() else None
+
+    def close(self) -> None:
+        pass
+
+
+class MBTilesStore:
+    """
+    Tile pyramid stored in an MBTiles (SQLite) file.
+
+    MBTiles holds a single tile format and uses TMS row numbering; vector
+    tiles are stored gzip-compressed as required by the MBTiles 1.3 spec.
+    Connections are opened per thread so the store can be read by a
+    multi-threaded server.
+    """
+
+    def __init__(self, path: Union[str, Path], fmt: str = 'mvt', readonly: bool = True):
+        if fmt not in TILE_CONTENT_TYPES:
+            raise ValueError(f"Unsupported tile format '{fmt}'")
+        self.path = Path(path)
+        self.fmt = fmt
+        self.readonly = readonly
+        self._local = threading.local()
+
+        if not readonly:
+            conn = self._connection()
+            conn.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tiles "
+                "(zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB)"
+            )
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS tile_index "
+                "ON tiles (zoom_level, tile_column, tile_row)"
+            )
+            conn.commit()
+        elif self.path.exists():
+            row = self._connection().execute(
+                "SELECT value FROM metadata WHERE name = 'format'"
+            ).fetchone()
+            if row is not None:
+                self.fmt = 'mvt' if row[0] == 'pbf' else row[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if self.readonly:
+                conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                       check_same_thread=False)
+            else:
+                conn = sqlite3.connect(str(self.path))
+            self._local.conn = conn
+        return conn
+
+    def set_metadata(self, metadata: Dict[str, str]) -> None:
+        conn = self._connection()
+        conn.execute("DELETE FROM metadata")
+        conn.executemany("INSERT INTO metadata VALUES (?, ?)", list(metadata.items()))
+        conn.commit()
+
+    def put(self, z: int, x: int, y: int, fmt: str, data: bytes) -> None:
+        if fmt != self.fmt:
+            raise ValueError(f"MBTiles store holds '{self.fmt}' tiles, not '{fmt}'")
+        if fmt == 'mvt':
+            data = gzip.compress(data)
+        self._connection().execute(
+            "INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)",
+            (z, x, (2 ** z - 1) - y, sqlite3.Binary(data))
+        )
+
+    def get(self, z: int, x: int, y: int, fmt: str) -> Optional[bytes]:
+        """Get a tile; vector tiles are returned gzip-compressed."""
+        if fmt != self.fmt or not self.path.exists():
+            return None
+        row = self._connection().execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+            (z, x, (2 ** z - 1) - y)
+        ).fetchone()
+        return bytes(row[0]) if row is not None else None
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            if not self.readonly:
+                conn.commit()
+            conn.close()
+            self._local.conn = None
+
+
+def open_tile_store(
+    path: Union[str, Path],
+    fmt: str = 'mvt',
+    readonly: bool = True
+) -> Union[DirectoryTileStore, MBTilesStore]:
+    """
+    Open a tile store: MBTiles for '*.mbtiles' paths, a directory otherwise.
+    """
+    if str(path).endswith('.mbtiles'):
+        return MBTilesStore(path, fmt=fmt, readonly=readonly)
+    return DirectoryTileStore(path)
+
+
+# ============================================================================
+# Tile Pyramid Generation
+# ============================================================================
+
+# Renderer of the current worker process (set by _init_pyramid_worker)
+_worker_renderer: Optional[VectorTileRenderer] = None
+
+
+def _init_pyramid_worker(buildings_gdf: gpd.GeoDataFrame, renderer_kwargs: Dict) -> None:
+    global _worker_renderer
+    _worker_renderer = VectorTileRenderer(buildings_gdf, cache_size=0, **renderer_kwargs)
+
+
+def _render_pyramid_batch(
+    tiles: List[Tuple[int, int, int]],
+    formats: Sequence[str],
+    png_kwargs: Dict
+) -> List[Tuple[int, int, int, str, bytes]]:
+    results = []
+    for z, x, y in tiles:
+        for fmt in formats:
+            if fmt == 'mvt':
+                data = _worker_renderer.render_tile(z, x, y)
+            else:
+                data = _worker_renderer.render_png(z, x, y, **png_kwargs)
+            if data:
+                results.append((z, x, y, fmt, data))
+    return results
+
+
+def generate_tile_pyramid(
+    buildings_gdf: gpd.GeoDataFrame,
+    output_path: Union[str, Path],
+    min_zoom: int = 12,
+    max_zoom: int = 16,
+    formats: Sequence[str] = ('mvt',),
+    workers: Optional[int] = None,
+    batch_size: int = 64,
+    png_column: str = 'suitability_score',
+    png_size: int = 256,
+    **renderer_kwargs
+) -> Dict[str, Any]:
+    """
+    Pre-render a tile pyramid for the buildings into a tile store.
+
+    Tiles covering the data bounds are rendered in parallel worker
+    processes; tiles without buildings are skipped.
+
+    Parameters
+    ----------
+    buildings_gdf : gpd.GeoDataFrame
+        Ranked buildings
+    output_path : str or Path
+        Output directory, or a '*.mbtiles' file (single format only)
+    min_zoom, max_zoom : int
+        Zoom range to render (inclusive)
+    formats : Sequence[str]
+        Tile formats: 'mvt' and/or 'png'
+    workers : int, optional
+        Number of worker processes (default: CPU count; 1 renders in-process)
+    batch_size : int
+        Tiles per worker task
+    png_column : str
+        Attribute used to color raster tiles
+    png_size : int
+        Raster tile size in pixels
+    **renderer_kwargs
+        Passed to VectorTileRenderer (layer_name, attributes, extent, ...)
+
+    Returns
+    -------
+    Dict[str, Any]
+        Generation summary (tile counts per format, elapsed seconds)
+    """
+    formats = list(formats)
+    for fmt in formats:
+        if fmt not in TILE_CONTENT_TYPES:
+            raise ValueError(f"Unsupported tile format '{fmt}'")
+    if min_zoom > max_zoom:
+        raise ValueError("min_zoom must not exceed max_zoom")
+
+    is_mbtiles = str(output_path).endswith('.mbtiles')
+    if is_mbtiles and len(formats) != 1:
+        raise ValueError("An MBTiles store holds a single tile format")
+
+    start = time.perf_counter()
+    renderer = VectorTileRenderer(buildings_gdf, cache_size=0, **renderer_kwargs)
+    summary = {"tiles": {fmt: 0 for fmt in formats}, "zooms": [min_zoom, max_zoom]}
+    if renderer.sindex is None:
+        summary["elapsed_seconds"] = time.perf_counter() - start
+        return summary
+
+    bounds = renderer.bounds
+    tiles = [t for z in range(min_zoom, max_zoom + 1) for t in tiles_for_bounds(bounds, z)]
+    batches = [tiles[i:i + batch_size] for i in range(0, len(tiles), batch_size)]
+    png_kwargs = {"column": png_column, "size": png_size}
+
+    store = open_tile_store(output_path, fmt=formats[0], readonly=False)
+    executor = None
+    try:
+        if workers == 1:
+            _init_pyramid_worker(buildings_gdf, renderer_kwargs)
+            results = (_render_pyramid_batch(batch, formats, png_kwargs) for batch in batches)
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_pyramid_worker,
+                initargs=(buildings_gdf, renderer_kwargs)
+            )
+            results = executor.map(
+                _render_pyramid_batch,
+                batches,
+                [formats] * len(batches),
+                [png_kwargs] * len(batches)
+            )
+
+        for batch_result in results:
+            for z, x, y, fmt, data in batch_result:
+                store.put(z, x, y, fmt, data)
+                summary["tiles"][fmt] += 1
+
+        if is_mbtiles:
+            lon_lat = gpd.GeoSeries(
+                [box(*bounds)], crs="EPSG:3857"
+            ).to_crs("EPSG:4326").total_bounds
+            metadata = {
+                "name": Path(output_path).stem,
+                "format": 'pbf' if formats[0] == 'mvt' else formats[0],
+                "bounds": ",".join(f"{v:.6f}" for v in lon_lat),
+                "minzoom": str(min_zoom),
+                "maxzoom": str(max_zoom),
+                "type": "overlay",
+            }
+            if formats[0] == 'mvt':
+                metadata["json"] = json.dumps({"vector_layers": [{
+                    "id": renderer.layer_name,
+                    "fields": {c: "" for c in renderer.attributes},
+                    "minzoom": min_zoom,
+                    "maxzoom": max_zoom,
+                }]})
+            store.set_metadata(metadata)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        store.close()
+
+    summary["elapsed_seconds"] = time.perf_counter() - start
+    return summary
+
+
+def main():
+    """Command line entry point for tile pyramid generation."""
+    parser = argparse.ArgumentParser(
+        description="Pre-render a vector/raster tile pyramid of ranked buildings"
+    )
+    parser.add_argument("--input", default="data/ranked_buildings.json",
+                        help="Ranked buildings file (default: data/ranked_buildings.json)")
+    parser.add_argument("--output", default="outputs/tiles",
+                        help="Output directory or *.mbtiles file (default: outputs/tiles)")
+    parser.add_argument("--min-zoom", type=int, default=12)
+    parser.add_argument("--max-zoom", type=int, default=16)
+    parser.add_argument("--format", dest="formats", action="append", choices=["mvt", "png"],
+                        help="Tile format (repeat for several; default: mvt)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("TILE PYRAMID GENERATION")
+    print("=" * 70)
+
+    buildings = gpd.read_file(args.input)
+    print(f"✓ Loaded {len(buildings)} buildings from {args.input}")
+
+    summary = generate_tile_pyramid(
+        buildings,
+        args.output,
+        min_zoom=args.min_zoom,
+        max_zoom=args.max_zoom,
+        formats=args.formats or ['mvt'],
+        workers=args.workers
+    )
+
+    for fmt, count in summary["tiles"].items():
+        print(f"✓ Wrote {count} {fmt} tiles to {args.output}")
+    print(f"  Zoom {args.min_zoom}-{args.max_zoom} in {summary['elapsed_seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Unit tests for spatial aggregation.
+"""
+
+import pytest
+import numpy as np
+import geopandas as gpd
+import shapely
+from shapely.geometry import Point, box
+from src.aggregation import (
+    GridAggregator,
+    aggregate_buildings,
+    cell_centers,
+    cell_polygons,
+    hex_bins,
+    square_bins
+)
+
+
+@pytest.fixture
+def grid_buildings():
+    """Buildings on a regular 10 m lattice (EPSG:28992)."""
+    records = []
+    for i in range(10):
+        for j in range(10):
+            x, y = 120000 + i * 10 + 2, 487000 + j * 10 + 2
+            records.append({
+                'solar_potential_kwh': float(i + j),
+                'roof_area_m2': 50.0,
+                'geometry': box(x, y, x + 5, y + 5),
+            })
+    return gpd.GeoDataFrame(records, crs="EPSG:28992")
+
+
+def test_square_bins():
+    """Test square binning floors coordinates to the cell grid."""
+    coords = np.array([[0.0, 0.0], [99.9, 100.0], [-0.1, 250.0]])
+    assert square_bins(coords, 100).tolist() == [[0, 0], [0, 1], [-1, 2]]
+
+
+def test_hex_bins_contain_points():
+    """Test every point lies in the hexagon it is binned to."""
+    rng = np.random.default_rng(0)
+    coords = rng.uniform(-1000, 1000, size=(500, 2))
+    cells = hex_bins(coords, 100)
+    polygons = cell_polygons(cells, 100, 'hex')
+    assert shapely.covers(polygons, shapely.points(coords)).all()
+
+    # Neighbouring hexagon centres are one cell apart
+    centers = cell_centers(np.array([[0, 0], [1, 0], [0, 1]]), 100, 'hex')
+    assert np.allclose(np.linalg.norm(centers[1:] - centers[0], axis=1), 100)
+
+
+def test_aggregate_square_grid(grid_buildings):
+    """Test counts, sums and means per square cell."""
+    cells = aggregate_buildings(grid_buildings, 50, ['solar_potential_kwh', 'roof_area_m2'])
+
+    assert cells['count'].sum() == 100
+    assert len(cells) == 4
+    assert (cells['count'] == 25).all()
+    assert cells['roof_area_m2_sum'].tolist() == [1250.0] * 4
+    assert np.isclose(cells['solar_potential_kwh_sum'].sum(), grid_buildings['solar_potential_kwh'].sum())
+    assert cells.crs == grid_buildings.crs
+    assert cells.geometry.area.tolist() == [2500.0] * 4
+
+
+def test_binning_cached_per_cell_size(grid_buildings):
+    """Test the cell assignment is computed once per grid."""
+    aggregator = GridAggregator(grid_buildings)
+    first = aggregator.bins(50, 'hex')
+    assert aggregator.bins(50, 'hex') is first
+    assert aggregator.bins(100, 'hex') is not first
+
+    with pytest.raises(KeyError):
+        aggregator.aggregate(50, ['missing'])
+    with pytest.raises(ValueError):
+        aggregator.bins(50, 'triangle')
+
+
+def test_aggregate_missing_geometry_and_values():
+    """Test buildings without geometry are skipped and NaN values ignored."""
+    buildings = gpd.GeoDataFrame(
+        {'solar_potential_kwh': [10.0, np.nan, 5.0]},
+        geometry=[Point(1, 1), Point(2, 2), None],
+        crs="EPSG:28992"
+    )
+    cells = aggregate_buildings(buildings, 100)
+    assert cells['count'].tolist() == [2]
+    assert cells['solar_potential_kwh_sum'].tolist() == [10.0]
+    assert cells['solar_potential_kwh_mean'].tolist() == [10.0]
@@ -2,8 +2,10 @@
 Unit tests for REST API endpoints.
 """
 
+import threading
 import pytest
 from src.api import app
+from src.dataset import BuildingsDataset
 
 
 @pytest.fixture
@@ -82,3 +84,580 @@ def test_404_error(client):
     
     data = response.get_json()
     assert 'error' in data
+
+
+# ============================================================
+# Tests with a synthetic dataset
+# ============================================================
+
+@pytest.fixture
+def synthetic_buildings():
+    """Small ranked buildings dataset in central Amsterdam (EPSG:28992)."""
+    import geopandas as gpd
+    from shapely.geometry import box
+
+    records = []
+    for i in range(20):
+        x = 121000 + (i % 5) * 40
+        y = 487000 + (i // 5) * 40
+        records.append({
+            'building_id': f'B{i:03d}',
+            'suitability_score': float(100 - i * 4),
+            'category': 'Excellent' if i < 5 else 'Good',
+            'roof_area_m2': 100.0 + i,
+            'solar_potential_kwh': 15000.0 + 100 * i,
+            'rank': i + 1,
+            'geometry': box(x, y, x + 20, y + 15),
+        })
+    return gpd.GeoDataFrame(records, crs="EPSG:28992")
+
+
+@pytest.fixture
+def synthetic_client(monkeypatch, synthetic_buildings):
+    """Test client serving the synthetic dataset."""
+    import src.api as api
+
+    monkeypatch.setattr(api, '_dataset', BuildingsDataset(synthetic_buildings))
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_vector_tile_endpoint(synthetic_client):
+    """Test MVT tile covering the synthetic buildings."""
+    # Zoom 14 tile containing central Amsterdam
+    response = synthetic_client.get('/tiles/14/8414/5384.mvt')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/vnd.mapbox-vector-tile'
+    assert b'buildings' in response.data
+    assert b'suitability_score' in response.data
+
+
+def test_vector_tile_empty_and_invalid(synthetic_client):
+    """Test empty and out-of-range tiles."""
+    assert synthetic_client.get('/tiles/14/0/0.mvt').status_code == 204
+    assert synthetic_client.get('/tiles/2/9/0.mvt').status_code == 404
+
+
+def test_stored_tiles_served(monkeypatch, synthetic_client, synthetic_buildings, tmp_path):
+    """Test serving a pre-generated tile pyramid as static files."""
+    import src.api as api
+    from src.tiles import DirectoryTileStore, generate_tile_pyramid
+
+    generate_tile_pyramid(synthetic_buildings, tmp_path, min_zoom=14, max_zoom=14,
+                          formats=['mvt', 'png'], workers=1)
+    monkeypatch.setattr(api, 'tile_store', DirectoryTileStore(tmp_path))
+
+    response = synthetic_client.get('/tiles/14/8414/5384.png')
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+
+    response = synthetic_client.get('/tiles/14/8414/5384.mvt')
+    assert response.status_code == 200
+    assert response.data == (tmp_path / '14' / '8414' / '5384.mvt').read_bytes()
+    assert synthetic_client.get('/tiles/14/0/0.png').status_code == 204
+
+
+def test_mbtiles_vector_tiles_negotiate_gzip(monkeypatch, synthetic_client, synthetic_buildings, tmp_path):
+    """Test that gzip-stored MBTiles tiles honour Accept-Encoding q-values."""
+    import gzip
+    import src.api as api
+    from src.tiles import MBTilesStore, generate_tile_pyramid
+
+    generate_tile_pyramid(synthetic_buildings, tmp_path / 'b.mbtiles', min_zoom=14, max_zoom=14,
+                          formats=['mvt'], workers=1)
+    monkeypatch.setattr(api, 'tile_store', MBTilesStore(tmp_path / 'b.mbtiles'))
+
+    compressed = synthetic_client.get('/tiles/14/8414/5384.mvt',
+                                      headers={'Accept-Encoding': 'gzip, br'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+
+    plain = synthetic_client.get('/tiles/14/8414/5384.mvt', headers={'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+    assert plain.data == gzip.decompress(compressed.data)
+
+
+def _synthetic_lon_lat(x, y):
+    """Convert EPSG:28992 coordinates of the synthetic data to WGS84."""
+    from pyproj import Transformer
+    return Transformer.from_crs("EPSG:28992", "EPSG:4326", always_xy=True).transform(x, y)
+
+
+def test_nearest_buildings_endpoint(synthetic_client):
+    """Test k-nearest spatial query."""
+    lon, lat = _synthetic_lon_lat(121010, 487007)
+    response = synthetic_client.get(f'/buildings/nearest?lon={lon}&lat={lat}&k=3')
+    assert response.status_code == 200
+
+    data = response.get_json()
+    assert data['count'] == 3
+    assert data['buildings'][0]['building_id'] == 'B000'
+    assert data['buildings'][0]['distance_m'] < 1
+    assert 'geometry' not in data['buildings'][0]
+    distances = [b['distance_m'] for b in data['buildings']]
+    assert distances == sorted(distances)
+
+
+def test_buildings_within_endpoint(synthetic_client):
+    """Test radius spatial query."""
+    lon, lat = _synthetic_lon_lat(121010, 487007)
+    response = synthetic_client.get(f'/buildings/within?lon={lon}&lat={lat}&radius=45')
+    assert response.status_code == 200
+
+    ids = [b['building_id'] for b in response.get_json()['buildings']]
+    assert ids[0] == 'B000'
+    assert set(ids) == {'B000', 'B001', 'B005'}
+
+
+def test_buildings_bbox_endpoint(synthetic_client):
+    """Test bounding box spatial query."""
+    min_lon, min_lat = _synthetic_lon_lat(120990, 486990)
+    max_lon, max_lat = _synthetic_lon_lat(121050, 487030)
+    response = synthetic_client.get(
+        f'/buildings/bbox?min_lon={min_lon}&min_lat={min_lat}&max_lon={max_lon}&max_lat={max_lat}'
+    )
+    assert response.status_code == 200
+
+    ids = {b['building_id'] for b in response.get_json()['buildings']}
+    assert ids == {'B000', 'B001'}
+
+
+def test_spatial_endpoints_require_parameters(synthetic_client):
+    """Test validation of spatial query parameters."""
+    assert synthetic_client.get('/buildings/nearest?lon=4.9').status_code == 400
+    assert synthetic_client.get('/buildings/within?lon=4.9&lat=52.3').status_code == 400
+    assert synthetic_client.get('/buildings/bbox?min_lon=4.9').status_code == 400
+
+
+def test_buildings_records_synthetic(synthetic_client):
+    """Test /buildings records on the synthetic dataset."""
+    response = synthetic_client.get('/buildings?min_score=90&limit=2')
+    assert response.status_code == 200
+
+    data = response.get_json()
+    assert data['total'] == 3
+    assert data['count'] == 2
+    assert data['buildings'][0]['building_id'] == 'B000'
+    assert 'geometry' not in data['buildings'][0]
+
+
+def test_data_loaded_lazily_once(monkeypatch, synthetic_buildings, tmp_path):
+    """Test that concurrent first requests parse the data exactly once."""
+    import src.api as api
+    import src.dataset as dataset_module
+
+    synthetic_buildings.to_file(tmp_path / 'ranked_buildings.json', driver='GeoJSON')
+    monkeypatch.setattr(api, 'DATA_PATH', tmp_path)
+    monkeypatch.setattr(api, '_dataset', None)
+
+    calls = []
+    read_file = dataset_module.gpd.read_file
+    monkeypatch.setattr(dataset_module.gpd, 'read_file',
+                        lambda path: calls.append(path) or read_file(path))
+
+    threads = [threading.Thread(target=api.get_dataset) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(api.get_dataset()) == 20
+
+
+def test_health_reports_background_loading(monkeypatch, synthetic_buildings, tmp_path):
+    """Test that /health starts background loading and reports readiness."""
+    import src.api as api
+
+    synthetic_buildings.to_file(tmp_path / 'ranked_buildings.json', driver='GeoJSON')
+    monkeypatch.setattr(api, 'DATA_PATH', tmp_path)
+    monkeypatch.setattr(api, '_dataset', None)
+    monkeypatch.setattr(api, '_load_thread', None)
+
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        response = client.get('/health')
+        assert response.status_code in (200, 503)
+
+        api._load_thread.join(timeout=30)
+        response = client.get('/health')
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data['ready'] is True
+        assert data['buildings_count'] == 20
+        assert data['load_seconds'] >= 0
+
+
+def test_admin_reload_swaps_dataset(monkeypatch, synthetic_buildings, tmp_path):
+    """Test that a reload serves the new data while old snapshots stay intact."""
+    import src.api as api
+
+    data_file = tmp_path / 'ranked_buildings.json'
+    synthetic_buildings.to_file(data_file, driver='GeoJSON')
+    monkeypatch.setattr(api, 'DATA_PATH', tmp_path)
+    monkeypatch.setattr(api, 'ADMIN_TOKEN', 'secret')
+    monkeypatch.setattr(api, '_dataset', None)
+    api.load_buildings_data(build_indexes=True)
+    old = api.get_dataset()
+
+    synthetic_buildings.head(5).to_file(data_file, driver='GeoJSON')
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        response = client.post('/admin/reload?wait=true', headers={'X-Admin-Token': 'secret'})
+        assert response.status_code == 200
+        assert response.get_json()['buildings_count'] == 5
+
+        assert client.get('/stats').get_json()['total_buildings'] == 5
+
+    new = api.get_dataset()
+    assert new is not old
+    assert new.version != old.version
+    # Indexes were built before the swap
+    assert new._spatial_index is not None and new._stats is not None
+    # The previous snapshot is unchanged
+    assert len(old) == 20 and old.stats['total_buildings'] == 20
+
+
+def test_admin_reload_requires_token(monkeypatch):
+    """Test that the reload endpoint checks the admin token."""
+    import src.api as api
+
+    monkeypatch.setattr(api, 'ADMIN_TOKEN', 'secret')
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        assert client.post('/admin/reload').status_code == 403
+        assert client.post('/admin/reload', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+
+
+def test_admin_reload_disabled_without_token(monkeypatch):
+    """Test that the reload endpoint is disabled when no admin token is configured."""
+    import src.api as api
+
+    monkeypatch.setattr(api, 'ADMIN_TOKEN', None)
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        assert client.post('/admin/reload?wait=true').status_code == 404
+
+
+def test_cached_response_pins_dataset_snapshot(monkeypatch, synthetic_client, synthetic_buildings):
+    """Test that a reload between cache key and view does not mix versions."""
+    import src.api as api
+
+    old = api.get_dataset()
+    new = BuildingsDataset(synthetic_buildings.head(5))
+    make_etag = api.make_etag
+
+    def reload_then_make_etag(key):
+        api._dataset = new  # reload lands after the key was built
+        return make_etag(key)
+
+    monkeypatch.setattr(api, 'make_etag', reload_then_make_etag)
+    monkeypatch.setattr(api, 'response_cache', api.ResponseCache())
+    response = synthetic_client.get('/stats')
+
+    assert response.get_json()['total_buildings'] == len(old)
+    assert api._dataset is new
+
+
+def test_file_watcher_triggers_callback(tmp_path):
+    """Test that the file watcher notices modifications."""
+    import os
+    from src.dataset import FileWatcher
+
+    path = tmp_path / 'ranked_buildings.json'
+    path.write_text('{}')
+    calls = []
+    watcher = FileWatcher(path, lambda: calls.append(1))
+
+    assert watcher.check() is False
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert watcher.check() is True
+    assert calls == [1]
+
+
+def test_priority_uses_score_order(synthetic_client):
+    """Test priority list order on the synthetic dataset."""
+    data = synthetic_client.get('/priority?top_n=3').get_json()
+    assert [b['building_id'] for b in data['buildings']] == ['B000', 'B001', 'B002']
+    assert synthetic_client.get('/buildings/B003/suitability').get_json()['suitability_score'] == 88.0
+
+
+def test_geojson_export_streamed(synthetic_client, synthetic_buildings):
+    """Test the streamed FeatureCollection matches GeoDataFrame.to_json()."""
+    import json
+
+    response = synthetic_client.get('/map/geojson?category=Excellent')
+    assert response.status_code == 200
+    assert response.is_streamed
+
+    expected = json.loads(
+        synthetic_buildings[synthetic_buildings['category'] == 'Excellent'].to_json()
+    )
+    assert response.get_json() == expected
+
+
+def test_ndjson_exports(synthetic_client):
+    """Test newline-delimited record and feature exports."""
+    import json
+
+    response = synthetic_client.get('/buildings?format=ndjson&min_score=50')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(records) == 13
+    assert response.headers['X-Total-Count'] == '13'
+    assert records[0]['building_id'] == 'B000'
+    assert 'geometry' not in records[0]
+
+    response = synthetic_client.get('/map/geojson?format=ndjson&limit=4')
+    features = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(features) == 4
+    assert features[0]['type'] == 'Feature'
+    assert features[0]['geometry']['type'] == 'Polygon'
+
+    assert synthetic_client.get('/buildings?format=xml').status_code == 400
+
+
+def test_columnar_export_requires_pyarrow(monkeypatch, synthetic_client):
+    """Test Arrow/Parquet requests are refused when pyarrow is missing."""
+    import src.api as api
+
+    monkeypatch.setattr(api, 'PYARROW_AVAILABLE', False)
+    response = synthetic_client.get(
+        '/buildings', headers={'Accept': 'application/vnd.apache.arrow.stream'}
+    )
+    assert response.status_code == 406
+    assert synthetic_client.get('/map/geojson?format=parquet').status_code == 406
+    # Wildcards do not select the columnar formats
+    assert synthetic_client.get('/buildings', headers={'Accept': '*/*'}).status_code == 200
+
+
+def test_columnar_exports(synthetic_client):
+    """Test Arrow IPC and GeoParquet exports round-trip."""
+    import io
+    import geopandas as gpd
+    pa = pytest.importorskip('pyarrow')
+
+    response = synthetic_client.get(
+        '/buildings?min_score=50',
+        headers={'Accept': 'application/vnd.apache.arrow.stream'}
+    )
+    assert response.status_code == 200
+    assert response.mimetype == 'application/vnd.apache.arrow.stream'
+    table = pa.ipc.open_stream(response.data).read_all()
+    assert table.num_rows == 13
+    assert 'geometry' not in table.column_names
+    assert table.column('building_id')[0].as_py() == 'B000'
+
+    response = synthetic_client.get('/map/geojson?format=parquet&category=Excellent')
+    assert response.status_code == 200
+    buildings = gpd.read_parquet(io.BytesIO(response.data))
+    assert len(buildings) == 5
+    assert buildings.crs.to_epsg() == 28992
+
+
+def test_arrow_table_without_geopandas_to_arrow(monkeypatch, synthetic_buildings):
+    """Test the GeoArrow fallback for geopandas versions without to_arrow."""
+    pytest.importorskip('pyarrow')
+    import geopandas as gpd
+    from src.export import to_arrow_table
+
+    expected = to_arrow_table(synthetic_buildings)
+    monkeypatch.delattr(gpd.GeoDataFrame, 'to_arrow', raising=False)
+    table = to_arrow_table(synthetic_buildings)
+
+    assert table.column_names == expected.column_names
+    assert table.column('geometry').equals(expected.column('geometry'))
+    assert table.schema.field('geometry').metadata == expected.schema.field('geometry').metadata
+    assert table.drop(['geometry']).equals(expected.drop(['geometry']))
+
+
+def test_etag_and_response_cache(synthetic_client):
+    """Test ETags, conditional requests and the in-process response cache."""
+    first = synthetic_client.get('/stats')
+    assert first.status_code == 200
+    assert first.headers['X-Cache'] == 'MISS'
+    assert 'max-age' in first.headers['Cache-Control']
+    etag = first.headers['ETag']
+
+    second = synthetic_client.get('/stats')
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.headers['ETag'] == etag
+    assert second.get_json() == first.get_json()
+
+    not_modified = synthetic_client.get('/stats', headers={'If-None-Match': etag})
+    assert not_modified.status_code == 304
+    assert not_modified.data == b''
+
+    # Query parameter order does not matter, values do
+    a = synthetic_client.get('/map/geojson?category=Good&limit=3')
+    a.get_data()  # streamed bodies are cached once they have been sent
+    b = synthetic_client.get('/map/geojson?limit=3&category=Good')
+    c = synthetic_client.get('/map/geojson?limit=4&category=Good')
+    assert a.headers['ETag'] == b.headers['ETag'] != c.headers['ETag']
+    assert b.headers['X-Cache'] == 'HIT'
+    assert len(b.get_json()['features']) == 3
+
+
+def test_response_cache_lru_eviction():
+    """Test the response cache is bounded by size."""
+    from src.http_cache import CachedResponse, ResponseCache
+
+    cache = ResponseCache(max_bytes=100, max_entry_bytes=60)
+    cache.put('a', CachedResponse(b'x' * 40, 'application/json', 'a'))
+    cache.put('b', CachedResponse(b'x' * 40, 'application/json', 'b'))
+    assert cache.get('a') is not None  # 'b' is now least recently used
+    cache.put('c', CachedResponse(b'x' * 40, 'application/json', 'c'))
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.size == 80
+    assert not cache.put('d', CachedResponse(b'x' * 70, 'application/json', 'd'))
+
+
+def test_compressed_responses(synthetic_client):
+    """Test gzip negotiation and caching of the compressed payload."""
+    import gzip
+    import json
+    import src.api as api
+
+    plain = synthetic_client.get('/map/geojson')
+    plain.get_data()  # streamed bodies are cached once they have been sent
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    first = synthetic_client.get('/map/geojson', headers={'Accept-Encoding': 'gzip'})
+    assert first.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(first.data)) == plain.get_json()
+    assert first.headers['ETag'] != plain.headers['ETag']
+
+    # The compressed body is cached with the response and reused
+    etag = plain.headers['ETag'].strip('"')
+    entry = next(e for e in api.response_cache._entries.values() if e.etag == etag)
+    assert 'gzip' in entry.encodings
+    second = synthetic_client.get('/map/geojson', headers={'Accept-Encoding': 'gzip, br;q=0'})
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.data == entry.encodings['gzip']
+
+    not_modified = synthetic_client.get(
+        '/map/geojson',
+        headers={'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']}
+    )
+    assert not_modified.status_code == 304
+
+    # Small bodies are not worth compressing
+    small = synthetic_client.get('/buildings/B001/geojson', headers={'Accept-Encoding': 'gzip'})
+    assert small.status_code == 200
+    assert 'Content-Encoding' not in small.headers
+
+
+def test_streamed_compression_when_not_cached(monkeypatch, synthetic_client):
+    """Test responses too large for the cache are compressed while streaming."""
+    import gzip
+    import json
+    import src.api as api
+    from src.http_cache import ResponseCache
+
+    monkeypatch.setattr(api, 'response_cache', ResponseCache(max_bytes=0))
+    response = synthetic_client.get('/map/geojson', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(json.loads(gzip.decompress(response.data))['features']) == 20
+
+
+def test_streamed_export_cached_after_sending(monkeypatch, synthetic_client):
+    """Test streamed exports are sent unbuffered and cached once complete."""
+    import src.api as api
+    from src.http_cache import ResponseCache
+
+    monkeypatch.setattr(api, 'response_cache', ResponseCache())
+    first = synthetic_client.get('/map/geojson?format=ndjson')
+    assert first.is_streamed
+    assert first.headers['X-Cache'] == 'MISS'
+    assert len(api.response_cache) == 0
+    body = first.get_data()
+
+    assert len(api.response_cache) == 1
+    second = synthetic_client.get('/map/geojson?format=ndjson')
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.data == body
+
+    # A stream finishing after a reload is not cached under the old version
+    stale = synthetic_client.get('/map/geojson?format=ndjson&limit=5')
+    monkeypatch.setattr(api, '_dataset', BuildingsDataset(api._dataset.frame))
+    api.response_cache.clear()
+    stale.get_data()
+    assert len(api.response_cache) == 0
+
+
+def test_buildings_batch_endpoint(synthetic_client):
+    """Test batch lookup of suitability records."""
+    response = synthetic_client.post(
+        '/buildings/batch', json={'ids': ['B003', 'missing', 'B000', '7']}
+    )
+    assert response.status_code == 200
+
+    data = response.get_json()
+    assert data['requested'] == 4
+    assert data['count'] == 3
+    assert data['not_found'] == ['missing']
+    assert [b['building_id'] for b in data['buildings']] == ['B003', 'B000', '7']
+    assert data['buildings'][0] == synthetic_client.get('/buildings/B003/suitability').get_json()
+    assert data['buildings'][2]['suitability_score'] == 72.0
+
+    assert synthetic_client.post('/buildings/batch', json=['B001']).get_json()['count'] == 1
+    assert synthetic_client.post('/buildings/batch', json={'id': 'B001'}).status_code == 400
+
+
+def test_buildings_cursor_pagination(monkeypatch, synthetic_client, synthetic_buildings):
+    """Test keyset pagination walks the score order and survives reloads."""
+    import src.api as api
+
+    seen = []
+    cursor = ''
+    while cursor is not None:
+        data = synthetic_client.get(f'/buildings?limit=6&min_score=30&cursor={cursor}').get_json()
+        seen.extend(b['building_id'] for b in data['buildings'])
+        cursor = data['next_cursor']
+    expected = synthetic_buildings[synthetic_buildings['suitability_score'] >= 30]
+    assert seen == expected.sort_values('suitability_score', ascending=False)['building_id'].tolist()
+
+    # A cursor holds the key of the last building, not a position
+    first = synthetic_client.get('/buildings?limit=3&cursor=').get_json()
+    shuffled = synthetic_buildings.sample(frac=1, random_state=0).reset_index(drop=True)
+    monkeypatch.setattr(api, '_dataset', BuildingsDataset(shuffled))
+    second = synthetic_client.get(f"/buildings?limit=3&cursor={first['next_cursor']}").get_json()
+    assert [b['building_id'] for b in second['buildings']] == ['B003', 'B004', 'B005']
+
+    assert synthetic_client.get('/buildings?cursor=not-a-cursor').status_code == 400
+
+
+def test_buildings_cursor_rejects_offset_and_bulk_formats(synthetic_client):
+    """Test a cursor is not silently dropped with other formats or offset."""
+    assert synthetic_client.get('/buildings?cursor=&offset=5').status_code == 400
+    assert synthetic_client.get('/buildings?cursor=&format=ndjson').status_code == 400
+    response = synthetic_client.get(
+        '/buildings?cursor=', headers={'Accept': 'application/vnd.apache.arrow.stream'}
+    )
+    assert response.status_code == 400
+    assert 'cursor' in response.get_json()['error']
+
+
+def test_aggregate_endpoint(synthetic_client):
+    """Test grid aggregation of the synthetic buildings."""
+    response = synthetic_client.get('/aggregate?cell=500&metric=solar_potential_kwh,roof_area_m2')
+    assert response.status_code == 200
+
+    data = response.get_json()
+    assert data['type'] == 'FeatureCollection'
+    assert sum(f['properties']['count'] for f in data['features']) == 20
+    assert 'roof_area_m2_mean' in data['features'][0]['properties']
+
+    hexes = synthetic_client.get('/aggregate?cell=100&shape=hex').get_json()
+    assert sum(f['properties']['count'] for f in hexes['features']) == 20
+
+    assert synthetic_client.get('/aggregate?metric=category').status_code == 400
+    assert synthetic_client.get('/aggregate?cell=1').status_code == 400
+    assert synthetic_client.get('/aggregate?shape=triangle').status_code == 400
@@ -0,0 +1,126 @@
+"""
+Unit tests for the ASGI serving mode.
+"""
+
+import asyncio
+import json
+from src.asgi import ThreadPoolASGIApp, build_environ
+
+
+def _scope(path, query=b'', method='GET', headers=None):
+    return {
+        'type': 'http', 'method': method, 'path': path, 'query_string': query,
+        'headers': headers or [], 'http_version': '1.1', 'scheme': 'http',
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 5555), 'root_path': '',
+    }
+
+
+async def _request(app, scope, body=b'', on_chunk=None):
+    """Run one request through an ASGI app, returning status, headers and body."""
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    response = {'body': b''}
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = dict(message['headers'])
+        else:
+            response['body'] += message.get('body', b'')
+            if on_chunk is not None:
+                await on_chunk()
+
+    await app(scope, receive, send)
+    return response
+
+
+def test_build_environ():
+    """Test translation of an ASGI scope into a WSGI environ."""
+    environ = build_environ(
+        _scope('/buildings/a b', b'limit=5', headers=[(b'accept', b'a'), (b'accept', b'b'),
+                                                   (b'content-type', b'application/json')]),
+        b'{}'
+    )
+    assert environ['PATH_INFO'] == '/buildings/a b'
+    assert environ['QUERY_STRING'] == 'limit=5'
+    assert environ['HTTP_ACCEPT'] == 'a,b'
+    assert environ['CONTENT_TYPE'] == 'application/json'
+    assert environ['wsgi.input'].read() == b'{}'
+
+
+def test_flask_app_over_asgi(monkeypatch):
+    """Test the API endpoints through the ASGI adapter."""
+    import geopandas as gpd
+    from shapely.geometry import box
+    import src.api as api
+    from src.dataset import BuildingsDataset
+
+    buildings = gpd.GeoDataFrame(
+        {'building_id': [f'B{i}' for i in range(50)], 'suitability_score': range(50)},
+        geometry=[box(i, 0, i + 1, 1) for i in range(50)], crs="EPSG:28992"
+    )
+    monkeypatch.setattr(api, '_dataset', BuildingsDataset(buildings))
+    app = ThreadPoolASGIApp(api.app, max_workers=2)
+
+    response = asyncio.run(_request(app, _scope('/map/geojson', b'limit=50')))
+    assert response['status'] == 200
+    assert len(json.loads(response['body'])['features']) == 50
+
+    response = asyncio.run(_request(
+        app, _scope('/buildings/batch', method='POST',
+                    headers=[(b'content-type', b'application/json')]),
+        body=json.dumps({'ids': ['B3']}).encode()
+    ))
+    assert json.loads(response['body'])['count'] == 1
+
+
+def test_slow_client_does_not_block_threads():
+    """Test a client waiting between chunks holds no worker thread."""
+    def streaming_app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        if environ['PATH_INFO'] == '/slow':
+            return (b'chunk' for _ in range(3))
+        return [b'fast']
+
+    async def scenario():
+        gate = asyncio.Event()
+        app = ThreadPoolASGIApp(streaming_app, max_workers=1)
+
+        async def slow_reader():
+            await gate.wait()
+
+        slow = asyncio.create_task(_request(app, _scope('/slow'), on_chunk=slow_reader))
+        await asyncio.sleep(0.05)
+        fast = await asyncio.wait_for(_request(app, _scope('/fast')), timeout=5)
+        gate.set()
+        return fast, await asyncio.wait_for(slow, timeout=5)
+
+    fast, slow = asyncio.run(scenario())
+    assert fast['body'] == b'fast'
+    assert slow['body'] == b'chunk' * 3
+
+
+def test_threads_option_reaches_executor(monkeypatch):
+    """Test --threads sizes the thread pool of a single-process server."""
+    import sys
+    import src.asgi as asgi
+
+    calls = []
+
+    class FakeUvicorn:
+        @staticmethod
+        def run(application, **kwargs):
+            calls.append((application, kwargs))
+
+    monkeypatch.setattr(asgi, 'uvicorn', FakeUvicorn, raising=False)
+    monkeypatch.setattr(asgi, 'UVICORN_AVAILABLE', True)
+    monkeypatch.setattr(sys, 'argv', ['solar-api-asgi', '--threads', '3'])
+    asgi.main()
+
+    application, kwargs = calls[0]
+    assert kwargs['workers'] == 1
+    assert application.max_workers == 3
+    assert application.executor._max_workers == 3
+    application.executor.shutdown()
@@ -0,0 +1,147 @@
+"""
+Unit tests for the memory-mapped columnar dataset.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from shapely.geometry import box
+from src.columnar import (
+    ColumnarDataset,
+    write_columnar_dataset,
+    load_columnar_dataset
+)
+from src.dataset import load_buildings_dataset
+
+
+@pytest.fixture
+def sample_buildings_gdf():
+    """Create sample ranked buildings."""
+    data = {
+        'building_id': ['A', 'B', 'C', None],
+        'suitability_score': [45.0, 92.0, 67.0, 10.0],
+        'rank': [3, 1, 2, 4],
+        'b3_kas_warenhuis': [False, True, False, False],
+        'geometry': [
+            box(0, 0, 10, 10),
+            box(20, 0, 30, 10),
+            box(40, 0, 50, 10),
+            box(60, 0, 70, 10)
+        ]
+    }
+    return gpd.GeoDataFrame(data, crs="EPSG:28992")
+
+
+def _is_memory_mapped(array) -> bool:
+    """Check whether an array is a view on a memory mapping."""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+def test_columnar_roundtrip(sample_buildings_gdf, tmp_path):
+    """Test that writing and mapping preserves values, geometry and CRS."""
+    write_columnar_dataset(sample_buildings_gdf, tmp_path / 'b.cols')
+    loaded = load_columnar_dataset(tmp_path / 'b.cols')
+
+    assert list(loaded.columns) == list(sample_buildings_gdf.columns)
+    assert loaded.crs.to_epsg() == 28992
+    assert loaded['suitability_score'].tolist() == [45.0, 92.0, 67.0, 10.0]
+    assert loaded['rank'].tolist() == [3, 1, 2, 4]
+    assert loaded['b3_kas_warenhuis'].tolist() == [False, True, False, False]
+    assert loaded['building_id'].tolist()[:3] == ['A', 'B', 'C']
+    assert pd.isna(loaded['building_id'].iloc[3])
+    assert loaded.geometry.equals(sample_buildings_gdf.geometry)
+
+
+def test_columns_are_memory_mapped(sample_buildings_gdf, tmp_path):
+    """Test that attribute columns are read-only views on the mapping."""
+    write_columnar_dataset(sample_buildings_gdf, tmp_path / 'b.cols')
+    loaded = load_columnar_dataset(tmp_path / 'b.cols')
+
+    scores = loaded['suitability_score'].to_numpy()
+    assert _is_memory_mapped(scores)
+    assert not scores.flags.writeable
+    assert _is_memory_mapped(loaded['building_id'].array.codes)
+
+
+def test_precomputed_indexes(sample_buildings_gdf, tmp_path):
+    """Test the stored score order and centroid indexes."""
+    write_columnar_dataset(sample_buildings_gdf, tmp_path / 'b.cols', version='v1')
+    columnar = ColumnarDataset(tmp_path / 'b.cols')
+
+    assert columnar.version == 'v1'
+    assert columnar.index('score_order').tolist() == [1, 2, 0, 3]
+    assert columnar.index('centroids')[0].tolist() == [5.0, 5.0]
+
+
+def test_rewrite_replaces_dataset(sample_buildings_gdf, tmp_path):
+    """Test that rewriting swaps the whole directory."""
+    path = tmp_path / 'b.cols'
+    write_columnar_dataset(sample_buildings_gdf, path, version='v1')
+    write_columnar_dataset(sample_buildings_gdf.head(2), path, version='v2')
+
+    assert ColumnarDataset(path).version == 'v2'
+    assert len(load_columnar_dataset(path)) == 2
+    assert [p.name for p in tmp_path.iterdir()] == ['b.cols']
+
+
+def test_dataset_loads_columnar(sample_buildings_gdf, tmp_path):
+    """Test that the API dataset loader prefers the columnar dataset."""
+    write_columnar_dataset(sample_buildings_gdf, tmp_path / 'b.cols', version='v1')
+    dataset = load_buildings_dataset(tmp_path, columnar_path=tmp_path / 'b.cols')
+
+    assert dataset.version == 'v1'
+    assert len(dataset) == 4
+    assert dataset.score_order.tolist() == [1, 2, 0, 3]
+    assert dataset.find_building('C') == 2
+
+
+def test_dataset_uses_stored_centroids(sample_buildings_gdf, tmp_path, monkeypatch):
+    """Test that the spatial index and aggregator reuse the centroid index."""
+    write_columnar_dataset(sample_buildings_gdf, tmp_path / 'b.cols')
+    dataset = load_buildings_dataset(tmp_path, columnar_path=tmp_path / 'b.cols')
+
+    monkeypatch.setattr(gpd.GeoSeries, 'centroid',
+                        property(lambda self: pytest.fail("centroids recomputed")))
+    monkeypatch.setattr('shapely.centroid', lambda *a, **k: pytest.fail("centroids recomputed"))
+    assert dataset.spatial_index.coordinates[:, 0].tolist() == [5.0, 25.0, 45.0, 65.0]
+    cells = dataset.aggregator.aggregate(20.0, ['suitability_score'])
+    assert cells['count'].tolist() == [1, 1, 1, 1]
+
+
+def test_dataset_indexes_share_mapping(sample_buildings_gdf, tmp_path):
+    """Test that the spatial index reuses the mapping and heavy indexes stay lazy."""
+    write_columnar_dataset(sample_buildings_gdf, tmp_path / 'b.cols')
+    dataset = load_buildings_dataset(tmp_path, columnar_path=tmp_path / 'b.cols')
+    dataset.build_indexes()
+
+    assert dataset.spatial_index.buildings_gdf is dataset.frame
+    assert _is_memory_mapped(dataset.spatial_index.coordinates)
+    assert _is_memory_mapped(dataset.frame['suitability_score'].to_numpy())
+    assert dataset._strtree is None
+    assert dataset._tile_renderer is None
+    assert dataset._aggregator is None
+
+
+def test_geometries_decoded_in_batches(sample_buildings_gdf, tmp_path):
+    """Test that batched WKB decoding matches the original geometries."""
+    sample_buildings_gdf.loc[2, 'geometry'] = None
+    write_columnar_dataset(sample_buildings_gdf, tmp_path / 'b.cols')
+    geometries = ColumnarDataset(tmp_path / 'b.cols').geometries(batch_size=3)
+
+    assert [g is None for g in geometries] == [False, False, True, False]
+    assert geometries[3].equals(box(60, 0, 70, 10))
+
+
+def test_missing_geometry_roundtrip(sample_buildings_gdf, tmp_path):
+    """Test that missing geometries survive the WKB buffer."""
+    sample_buildings_gdf.loc[1, 'geometry'] = None
+    write_columnar_dataset(sample_buildings_gdf, tmp_path / 'b.cols')
+    loaded = load_columnar_dataset(tmp_path / 'b.cols')
+
+    assert loaded.geometry.isna().tolist() == [False, True, False, False]
+    assert loaded.geometry.iloc[2].equals(box(40, 0, 50, 10))
@@ -3,16 +3,187 @@ Unit tests for data acquisition module.
 """
 
 import pytest
+import numpy as np
 import geopandas as gpd
-from shapely.geometry import box, Point
+from shapely.affinity import translate
+from shapely.geometry import box, shape, Point
 import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 from unittest.mock import patch, Mock, MagicMock
+import requests
+from src import data_acquisition
+from tools.mock_pvgis import MockPVGIS
 from src.data_acquisition import (
     fetch_pdok_buildings,
+    request_with_retry,
+    DownloadCheckpoint,
+    PVGISCache,
+    iter_wfs_pages,
+    wfs_tiles,
+    stream_pdok_buildings,
+    read_streamed_buildings,
+    refresh_pdok_buildings,
+    apply_building_delta,
+    feature_hash,
     PVGISPVCalcClient
 )
 
 
+# ============================================================
+# Local stand-in for the BAG3D WFS
+# ============================================================
+
+TEST_BBOX = (4.88, 52.36, 4.89, 52.37)
+
+
+class StandInServer:
+    """
+    Local HTTP server answering GET requests with `query(params)` as JSON.
+
+    Records the requests and their concurrency; can add latency and answer
+    503 once `fail_after` requests were served.
+    """
+
+    path = "/"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.fail_after = None
+        self.requests = []
+        self.times = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def query(self, params):
+        raise NotImplementedError
+
+    def start(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                with stand_in._lock:
+                    if stand_in.fail_after is not None and len(stand_in.requests) >= stand_in.fail_after:
+                        self.send_error(503)
+                        return
+                    stand_in.requests.append(params)
+                    stand_in.times.append(time.monotonic())
+                    stand_in.in_flight += 1
+                    stand_in.max_in_flight = max(stand_in.max_in_flight, stand_in.in_flight)
+                time.sleep(stand_in.delay)
+                body = json.dumps(stand_in.query(params)).encode()
+                with stand_in._lock:
+                    stand_in.in_flight -= 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}{self.path}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StandInWFS(StandInServer):
+    """
+    Minimal WFS 2.0 GetFeature server for tests.
+
+    Serves square footprints on a regular grid inside the projected test
+    bbox, filtered by the `bbox` parameter and paged with
+    `startIndex`/`count` in a stable order.
+    """
+
+    path = "/wfs"
+
+    def __init__(self, n=95, number_matched=True, delay=0.0, honour_property_name=True):
+        super().__init__(delay)
+        area = gpd.GeoSeries([box(*TEST_BBOX)], crs="EPSG:4326").to_crs("EPSG:28992")
+        minx, miny, maxx, maxy = area.total_bounds
+        side = int(np.ceil(np.sqrt(n)))
+        xs = np.linspace(minx + 150, maxx - 150, side)
+        ys = np.linspace(miny + 150, maxy - 150, side)
+        self.features = []
+        for i in range(n):
+            x, y = xs[i % side], ys[i // side]
+            self.features.append({
+                "type": "Feature",
+                "id": f"lod12.{i}",
+                "geometry": box(x - 4, y - 4, x + 4, y + 4).__geo_interface__,
+                "properties": {
+                    "identificatie": f"NL.IMBAG.Pand.{i:016d}",
+                    "b3_h_max": 10.0 + i % 7,
+                    "b3_h_dak_max": 9.0 + i % 5,
+                    "b3_pw_datum": "2022-03-01",
+                    "b3_kas_warenhuis": False,
+                },
+            })
+        self.bounds = [(xs[i % side] - 4, ys[i // side] - 4, xs[i % side] + 4, ys[i // side] + 4)
+                       for i in range(n)]
+        self.number_matched = number_matched
+        self.honour_property_name = honour_property_name
+        self.returned = 0
+
+    def query(self, params):
+        minx, miny, maxx, maxy = map(float, params["bbox"].split(","))
+        matched = [  # bbox intersects the footprint
+            feature for feature, (fminx, fminy, fmaxx, fmaxy) in zip(self.features, self.bounds)
+            if fminx <= maxx and fmaxx >= minx and fminy <= maxy and fmaxy >= miny
+        ]
+        start, count = int(params.get("startIndex", 0)), int(params.get("count", 1000))
+        page = matched[start:start + count]
+        if "propertyName" in params and self.honour_property_name:
+            names = params["propertyName"].split(",")
+            page = [dict(f, properties={k: v for k, v in f["properties"].items() if k in names})
+                    for f in page]
+        with self._lock:
+            self.returned += len(page)
+        data = {"type": "FeatureCollection", "features": page, "numberReturned": len(page)}
+        if self.number_matched:
+            data["numberMatched"] = len(matched)
+        return data
+
+
+@pytest.fixture
+def stand_in_wfs():
+    servers = []
+
+    def start(**kwargs):
+        servers.append(StandInWFS(**kwargs).start())
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def stand_in_pvgis():
+    """PVGIS mock shared with the benchmark (tools/mock_pvgis.py), without latency or rate limit."""
+    servers = []
+
+    def start(**kwargs):
+        servers.append(MockPVGIS(**{"latency": 0.0, "limit": None, **kwargs}).start())
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
 # ============================================================
 # Tests for fetch_pdok_buildings
 # ============================================================
@@ -76,6 +247,336 @@ def test_fetch_pdok_buildings_api_error(mock_get):
         fetch_pdok_buildings(bbox, output_path=None)
 
 
+@pytest.mark.parametrize("number_matched", [True, False])
+def test_fetch_pdok_buildings_concurrent_matches_sequential(stand_in_wfs, number_matched):
+    """Concurrent paging returns the same buildings in the same order."""
+    wfs = stand_in_wfs(n=95, number_matched=number_matched)
+
+    sequential = fetch_pdok_buildings(TEST_BBOX, output_path=None, page_size=10, url=wfs.url)
+    concurrent = fetch_pdok_buildings(
+        TEST_BBOX, output_path=None, page_size=10, concurrency=4, url=wfs.url
+    )
+
+    assert len(sequential) == 95
+    assert list(concurrent["identificatie"]) == list(sequential["identificatie"])
+    assert concurrent.crs.to_string() == "EPSG:28992"
+
+
+def test_iter_wfs_pages_runs_requests_in_parallel(stand_in_wfs):
+    """Pages are requested concurrently, within the concurrency limit."""
+    wfs = stand_in_wfs(n=95, delay=0.05)
+    bbox = (0, 0, 1e6, 1e6)
+
+    pages = list(iter_wfs_pages(bbox, page_size=10, concurrency=3, url=wfs.url))
+
+    assert [len(page) for page in pages] == [10] * 9 + [5]
+    assert 1 < wfs.max_in_flight <= 3
+
+
+def test_iter_wfs_pages_detects_end(stand_in_wfs):
+    """No pages beyond numberMatched are requested; exact multiples end cleanly."""
+    wfs = stand_in_wfs(n=40)
+    bbox = (0, 0, 1e6, 1e6)
+
+    pages = list(iter_wfs_pages(bbox, page_size=10, concurrency=8, url=wfs.url))
+
+    assert [len(page) for page in pages] == [10] * 4
+    starts = sorted(int(params["startIndex"]) for params in wfs.requests)
+    assert max(starts) < 40 + 8 * 10  # bounded overshoot before numberMatched is known
+    assert sum(start < 40 for start in starts) == 4
+
+
+def test_iter_wfs_pages_empty_result(stand_in_wfs):
+    """An empty result set yields no pages."""
+    wfs = stand_in_wfs(n=10)
+
+    assert list(iter_wfs_pages((0, 0, 1, 1), page_size=10, concurrency=4, url=wfs.url)) == []
+
+
+def test_wfs_tiles_cover_area():
+    """Tiles are aligned to the grid and cover the area bounds."""
+    area = gpd.GeoDataFrame(geometry=[box(1000, 2000, 3500, 2900)], crs="EPSG:28992")
+
+    tiles = wfs_tiles(area, 1000)
+
+    assert len(tiles) == 3
+    assert tiles[0] == (1000.0, 2000.0, 2000.0, 3000.0)
+    assert tiles[-1] == (3000.0, 2000.0, 4000.0, 3000.0)
+    with pytest.raises(ValueError):
+        wfs_tiles(area, 0)
+
+
+def test_fetch_pdok_buildings_tiled_deduplicates(stand_in_wfs):
+    """Tiled fetching returns every building once, even across tile borders."""
+    wfs = stand_in_wfs(n=100)
+
+    untiled = fetch_pdok_buildings(TEST_BBOX, output_path=None, page_size=10, url=wfs.url)
+    tiled = fetch_pdok_buildings(
+        TEST_BBOX, output_path=None, page_size=10, concurrency=4, url=wfs.url, tile_size=97
+    )
+
+    # Footprints straddle tile borders, so tiles return overlapping features
+    assert wfs.returned > len(untiled) * 2
+    assert tiled["identificatie"].is_unique
+    assert sorted(tiled["identificatie"]) == sorted(untiled["identificatie"])
+    assert tiled.crs.to_string() == "EPSG:28992"
+
+
+@pytest.mark.parametrize("tile_size", [None, 150])
+def test_stream_pdok_buildings_matches_fetch(stand_in_wfs, tmp_path, tile_size):
+    """Streaming to disk writes the same clipped buildings as fetching."""
+    wfs = stand_in_wfs(n=100)
+    # Cut through the footprints of the third column and fourth row
+    minx, miny = wfs.bounds[0][:2]
+    cut_x, cut_y = wfs.bounds[2][0] + 3, wfs.bounds[30][1] + 5
+    area = gpd.GeoDataFrame(geometry=[box(minx - 10, miny - 10, cut_x, cut_y)], crs="EPSG:28992")
+
+    expected = fetch_pdok_buildings(
+        area, output_path=None, page_size=10, url=wfs.url, tile_size=tile_size
+    )
+    output = tmp_path / "buildings.geojsonl"
+    written = stream_pdok_buildings(
+        area, output_path=output, page_size=10, concurrency=3, url=wfs.url, tile_size=tile_size
+    )
+    streamed = read_streamed_buildings(output)
+
+    assert written == len(expected) == len(streamed)
+    assert not (tmp_path / "buildings.geojsonl.part").exists()
+    assert streamed.crs.to_string() == "EPSG:28992"
+    if tile_size is None:
+        assert streamed["identificatie"].is_monotonic_increasing  # WFS order
+    streamed = streamed.set_index("identificatie")
+    expected = expected.set_index("identificatie").loc[streamed.index]
+    assert (streamed.geometry.area < 64).any()  # clipped footprints
+    assert np.allclose(streamed.geometry.area, expected.geometry.area)
+
+
+def test_stream_pdok_buildings_writes_per_page(stand_in_wfs, tmp_path):
+    """Pages are appended to the output as they arrive."""
+    wfs = stand_in_wfs(n=30)
+    output = tmp_path / "buildings.geojsonl"
+    part = tmp_path / "buildings.geojsonl.part"
+    sizes = []
+
+    original = wfs.query
+
+    def query(params):
+        if part.exists():
+            sizes.append(part.stat().st_size)
+        return original(params)
+
+    wfs.query = query
+    stream_pdok_buildings(TEST_BBOX, output_path=output, page_size=10, url=wfs.url)
+
+    assert sizes[0] == 0 and sizes[-1] > sizes[1] > 0
+    assert len(output.read_text().splitlines()) == 30
+
+
+# ============================================================
+# Tests for retries and checkpoints
+# ============================================================
+
+def _response(status, **kwargs):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(kwargs)
+    return response
+
+
+def test_request_with_retry_backs_off(monkeypatch):
+    """Transient errors are retried with exponentially growing delays."""
+    delays = []
+    monkeypatch.setattr(data_acquisition.time, "sleep", delays.append)
+    get = Mock(side_effect=[
+        requests.ConnectionError("reset"), _response(503), _response(429, **{"Retry-After": "7"}),
+        _response(200),
+    ])
+
+    r = request_with_retry(get, "http://wfs", params={"a": 1}, retries=5, backoff=0.5)
+
+    assert r.status_code == 200
+    assert get.call_count == 4
+    assert delays == [0.5, 1.0, 7.0]
+
+
+def test_request_with_retry_gives_up(monkeypatch):
+    """Client errors are not retried; transient ones only `retries` times."""
+    monkeypatch.setattr(data_acquisition.time, "sleep", lambda delay: None)
+
+    get = Mock(return_value=_response(404))
+    with pytest.raises(requests.HTTPError):
+        request_with_retry(get, "http://wfs", retries=3)
+    assert get.call_count == 1
+
+    get = Mock(return_value=_response(502))
+    with pytest.raises(requests.HTTPError):
+        request_with_retry(get, "http://wfs", retries=3)
+    assert get.call_count == 4
+
+
+def test_checkpoint_survives_partial_lines(tmp_path):
+    """A manifest line cut off by a crash is ignored; other downloads reset it."""
+    checkpoint = DownloadCheckpoint(tmp_path / "ckpt", {"bbox": [1, 2, 3, 4]})
+    checkpoint.add("a", 1.5)
+    checkpoint.store("page-0", {"features": [1, 2]})
+    with open(checkpoint.manifest_path, "a") as f:
+        f.write('{"key": "b", "val')
+
+    resumed = DownloadCheckpoint(tmp_path / "ckpt", {"bbox": (1, 2, 3, 4)})
+    assert len(resumed) == 2 and "b" not in resumed
+    assert resumed.get("a") == 1.5
+    assert resumed.load("page-0") == {"features": [1, 2]}
+    resumed.add("c", 3)
+    assert "c" in DownloadCheckpoint(tmp_path / "ckpt", {"bbox": [1, 2, 3, 4]})
+
+    other = DownloadCheckpoint(tmp_path / "ckpt", {"bbox": [0, 0, 1, 1]})
+    assert len(other) == 0
+    assert not list((tmp_path / "ckpt").glob("*.json"))
+
+
+@pytest.mark.parametrize("concurrency,tile_size", [(1, None), (3, None), (2, 150)])
+def test_fetch_pdok_buildings_resumes_from_checkpoint(stand_in_wfs, tmp_path, concurrency, tile_size):
+    """An interrupted download resumes without refetching completed pages."""
+    wfs = stand_in_wfs(n=95)
+    checkpoint = tmp_path / "checkpoint"
+    expected = fetch_pdok_buildings(TEST_BBOX, output_path=None, page_size=10, url=wfs.url)
+
+    wfs.requests.clear()
+    wfs.fail_after = 4
+    with pytest.raises(requests.HTTPError):
+        fetch_pdok_buildings(
+            TEST_BBOX, output_path=None, page_size=10, url=wfs.url, concurrency=concurrency,
+            tile_size=tile_size, checkpoint=checkpoint, retries=0
+        )
+    assert (checkpoint / "manifest.jsonl").exists()
+
+    wfs.fail_after = None
+    first_run = list(wfs.requests)
+    wfs.requests.clear()
+    resumed = fetch_pdok_buildings(
+        TEST_BBOX, output_path=None, page_size=10, url=wfs.url, concurrency=concurrency,
+        tile_size=tile_size, checkpoint=checkpoint, retries=0
+    )
+
+    assert sorted(resumed["identificatie"]) == sorted(expected["identificatie"])
+    if tile_size is None:
+        assert list(resumed["identificatie"]) == list(expected["identificatie"])
+        refetched = {p["startIndex"] for p in first_run} & {p["startIndex"] for p in wfs.requests}
+        assert not refetched
+    assert not checkpoint.exists()
+
+
+# ============================================================
+# Tests for property whitelists
+# ============================================================
+
+@pytest.mark.parametrize("honour", [True, False])
+def test_fetch_pdok_buildings_property_whitelist(stand_in_wfs, honour):
+    """Only whitelisted attributes are requested and kept, even if the server ignores the selection."""
+    wfs = stand_in_wfs(honour_property_name=honour)
+    buildings = fetch_pdok_buildings(
+        TEST_BBOX, output_path=None, page_size=20, url=wfs.url,
+        properties=["identificatie", "b3_h_max"]
+    )
+
+    assert len(buildings) == 95
+    assert set(buildings.columns) == {"geometry", "identificatie", "b3_h_max"}
+    assert all(r["propertyName"] == "geom,identificatie,b3_h_max" for r in wfs.requests)
+
+
+def test_pipeline_properties_feed_geometry_stage(stand_in_wfs, tmp_path):
+    """Buildings fetched with PIPELINE_PROPERTIES still provide the roof height."""
+    from src.geometry import ROOF_HEIGHT_COLUMNS, BuildingGeometryProcessor
+
+    assert ROOF_HEIGHT_COLUMNS[0] in data_acquisition.PIPELINE_PROPERTIES
+    path = tmp_path / "footprints.json"
+    fetch_pdok_buildings(TEST_BBOX, output_path=str(path), url=stand_in_wfs().url,
+                         properties=data_acquisition.PIPELINE_PROPERTIES)
+
+    processor = BuildingGeometryProcessor(str(path), str(tmp_path / "no_solar.json"))
+    buildings = processor.compute_roof_properties()
+    assert buildings["building_height_m"].notna().all()
+    assert set(buildings["building_height_m"]) == {9.0, 10.0, 11.0, 12.0, 13.0}
+
+
+def test_fetch_pdok_buildings_without_whitelist_keeps_all_attributes(stand_in_wfs):
+    wfs = stand_in_wfs()
+    buildings = fetch_pdok_buildings(TEST_BBOX, output_path=None, url=wfs.url)
+
+    assert "b3_pw_datum" in buildings.columns
+    assert "propertyName" not in wfs.requests[0]
+
+
+# ============================================================
+# Tests for incremental refresh
+# ============================================================
+
+def _pand(i):
+    return f"NL.IMBAG.Pand.{i:016d}"
+
+
+def test_refresh_pdok_buildings_reports_delta(stand_in_wfs, tmp_path):
+    """Added, changed and removed buildings are detected against the previous snapshot."""
+    snapshot = tmp_path / "buildings.geojsonl"
+    first = refresh_pdok_buildings(TEST_BBOX, snapshot_path=str(snapshot), url=stand_in_wfs(n=90).url)
+    assert (len(first.added), len(first.changed), len(first.removed)) == (90, 0, 0)
+
+    # Same grid with 5 more buildings, two modified and one demolished
+    wfs = stand_in_wfs(n=95)
+    wfs.features[3]["properties"]["b3_h_max"] = 42.0
+    wfs.features[7]["geometry"] = translate(shape(wfs.features[7]["geometry"]), xoff=0.5).__geo_interface__
+    del wfs.features[10], wfs.bounds[10]
+
+    delta = refresh_pdok_buildings(TEST_BBOX, snapshot_path=str(snapshot), page_size=20,
+                                   concurrency=2, url=wfs.url)
+
+    assert set(delta.added) == {_pand(i) for i in range(90, 95)}
+    assert set(delta.changed) == {_pand(3), _pand(7)}
+    assert delta.removed == [_pand(10)]
+    assert len(read_streamed_buildings(snapshot)) == 94
+
+    # Updated buildings are read back from the new snapshot
+    updated = delta.updated_buildings()
+    assert set(updated["identificatie"]) == set(delta.added) | set(delta.changed)
+    assert updated.loc[updated["identificatie"] == _pand(3), "b3_h_max"].item() == 42.0
+
+    # Nothing changed since the last refresh
+    assert len(refresh_pdok_buildings(TEST_BBOX, snapshot_path=str(snapshot), url=wfs.url)) == 0
+
+
+def test_feature_hash_ignores_key_order():
+    feature = {"properties": {"a": 1, "b": 2}, "geometry": {"type": "Point", "coordinates": [1, 2]}}
+    reordered = {"geometry": feature["geometry"], "properties": {"b": 2, "a": 1}}
+
+    assert feature_hash(feature) == feature_hash(reordered)
+    assert feature_hash(feature) != feature_hash(dict(feature, properties={"a": 1, "b": 3}))
+
+
+def test_apply_building_delta_merges_updated_results(stand_in_wfs, tmp_path):
+    snapshot = tmp_path / "buildings.geojsonl"
+    refresh_pdok_buildings(TEST_BBOX, snapshot_path=str(snapshot), url=stand_in_wfs(n=90).url)
+    previous = read_streamed_buildings(snapshot)
+    previous["score"] = 1.0
+
+    wfs = stand_in_wfs(n=95)
+    wfs.features[3]["properties"]["b3_h_max"] = 42.0
+    del wfs.features[10], wfs.bounds[10]
+    delta = refresh_pdok_buildings(TEST_BBOX, snapshot_path=str(snapshot), url=wfs.url)
+
+    updated = delta.updated_buildings()
+    updated["score"] = 2.0
+    merged = apply_building_delta(previous, delta, updated)
+
+    assert sorted(merged["identificatie"]) == sorted(read_streamed_buildings(snapshot)["identificatie"])
+    assert merged["identificatie"].is_unique
+    rescored = set(merged.loc[merged["score"] == 2.0, "identificatie"])
+    assert rescored == {_pand(3)} | {_pand(i) for i in range(90, 95)}
+    assert merged.crs.to_string() == "EPSG:28992"
+
+    with pytest.raises(KeyError):
+        apply_building_delta(previous.drop(columns="identificatie"), delta, updated)
+
+
 # ============================================================
 # Tests for PVGISPVCalcClient
 # ============================================================
@@ -159,6 +660,184 @@ def test_pvgis_fetch_bbox_geojson(mock_get):
     assert feature['properties']['source'] == 'PVGIS PVcalc'
 
 
+@patch('src.data_acquisition.requests.get')
+def test_pvgis_fetch_bbox_geojson_resumes_from_checkpoint(mock_get, tmp_path):
+    """Completed grid points are not fetched again after an interruption."""
+    ok = Mock(status_code=200)
+    ok.json.return_value = {"outputs": {"totals": {"fixed": {"E_y": 1000.0}}}}
+    mock_get.side_effect = [ok, ok, ok, requests.ConnectionError("reset")]
+
+    client = PVGISPVCalcClient(retries=0)
+    bbox = (4.88, 52.36, 4.883, 52.363)  # 3 x 3 grid at 100 m
+    checkpoint = tmp_path / "pvgis"
+    with pytest.raises(requests.ConnectionError):
+        client.fetch_bbox_geojson(bbox, step_km=0.1, sleep=0, checkpoint=checkpoint)
+
+    mock_get.side_effect = None
+    mock_get.return_value = ok
+    mock_get.reset_mock()
+    geojson = client.fetch_bbox_geojson(bbox, step_km=0.1, sleep=0, checkpoint=checkpoint)
+
+    assert mock_get.call_count == len(geojson["features"]) - 3
+    assert [f["id"] for f in geojson["features"]] == list(range(1, len(geojson["features"]) + 1))
+    assert all(f["properties"]["E_y"] == 1000.0 for f in geojson["features"])
+    assert not checkpoint.exists()
+
+
+def test_pvgis_fetch_bbox_geojson_concurrent(stand_in_pvgis):
+    """Concurrent fetching returns the sequential result in grid order."""
+    pvgis = stand_in_pvgis(latency=0.02)
+    client = PVGISPVCalcClient(base_url=pvgis.url)
+    bbox = (4.88, 52.36, 4.885, 52.364)
+
+    sequential = client.fetch_bbox_geojson(bbox, step_km=0.1, sleep=0)
+    pvgis.max_in_flight = 0
+    concurrent = client.fetch_bbox_geojson(bbox, step_km=0.1, concurrency=4, rate=1000)
+
+    assert concurrent == sequential
+    assert 1 < pvgis.max_in_flight <= 4
+    for feature in concurrent["features"]:
+        lon, lat = feature["geometry"]["coordinates"]
+        assert feature["properties"]["E_y"] == pvgis.energy_at(lat, lon)
+
+
+def test_pvgis_fetch_points_rate_limited(stand_in_pvgis):
+    """The token bucket keeps the request rate at the limit."""
+    pvgis = stand_in_pvgis()
+    client = PVGISPVCalcClient(base_url=pvgis.url)
+    points = [(52.36 + i * 0.001, 4.88) for i in range(16)]
+
+    start = time.monotonic()
+    energies = client.fetch_points(points, concurrency=8, rate=40)
+    elapsed = time.monotonic() - start
+
+    assert energies == [pvgis.energy_at(lat, lon) for lat, lon in points]
+    assert elapsed >= 15 / 40 * 0.9
+    times = np.array(sorted(pvgis.times))
+    # No more than the limit (plus one) in any window of 0.2 s
+    assert max(np.searchsorted(times, t + 0.2) - i for i, t in enumerate(times)) <= 40 * 0.2 + 1
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_pvgis_cache_fetches_only_new_points(stand_in_pvgis, tmp_path, concurrency):
+    """A run over an overlapping bbox only requests the points not cached yet."""
+    pvgis = stand_in_pvgis()
+    client = PVGISPVCalcClient(base_url=pvgis.url, cache=tmp_path / "pvgis.sqlite")
+    small = client.fetch_bbox_geojson((4.88, 52.36, 4.883, 52.363), step_km=0.1, sleep=0,
+                                      concurrency=concurrency, rate=1000)
+    first_requests = len(pvgis.requests)
+
+    large = client.fetch_bbox_geojson((4.88, 52.36, 4.885, 52.365), step_km=0.1, sleep=0,
+                                      concurrency=concurrency, rate=1000)
+
+    assert first_requests == len(small["features"])
+    assert len(pvgis.requests) - first_requests == len(large["features"]) - len(small["features"])
+    cached = {tuple(f["geometry"]["coordinates"]): f["properties"]["E_y"] for f in small["features"]}
+    for feature in large["features"]:
+        coordinates = tuple(feature["geometry"]["coordinates"])
+        if coordinates in cached:
+            assert feature["properties"]["E_y"] == cached[coordinates]
+    assert client.cache.hits == len(small["features"])
+
+
+def test_pvgis_cache_keys_and_eviction(tmp_path):
+    """Entries are keyed by rounded coordinates and parameters, and evicted by age and count."""
+    cache = PVGISCache(tmp_path / "cache.sqlite", precision=3, ttl_days=1, max_entries=3)
+    response = {"outputs": {"totals": {"fixed": {"E_y": 1000.0}}}}
+
+    cache.put(52.36001, 4.88002, 1, 14, response)
+    assert cache.get(52.3604, 4.8799, 1, 14) == response  # same rounded point
+    assert cache.get(52.3604, 4.8799, 2, 14) is None      # other peakpower
+    assert cache.get(52.3616, 4.88, 1, 14) is None
+
+    for i in range(1, 5):
+        cache.put(52.36 + i * 0.01, 4.88, 1, 14, response)
+    cache.get(52.36, 4.88, 1, 14)  # recently used: kept
+    assert cache.evict() == 2
+    assert len(cache) == 3
+    assert cache.get(52.36, 4.88, 1, 14) == response
+    assert cache.get(52.37, 4.88, 1, 14) is None
+
+    cache.ttl = 0.0
+    assert cache.get(52.40, 4.88, 1, 14) is None  # expired
+    assert cache.evict() == 3 and len(cache) == 0
+
+
+def test_pvgis_fetch_adaptive_geojson_refines_gradients(stand_in_pvgis, tmp_path):
+    """Refinement concentrates requests where E_y changes, at uniform-grid accuracy."""
+    from scipy.interpolate import griddata
+    from src.geometry import load_solar_data
+
+    def energy(lat, lon):
+        return 1000.0 if lon < 4.9 else 1100.0
+
+    pvgis = stand_in_pvgis(energy=energy)
+    client = PVGISPVCalcClient(base_url=pvgis.url)
+    bbox = (4.85, 52.34, 4.95, 52.40)
+
+    adaptive = client.fetch_adaptive_geojson(
+        bbox, initial_step_km=2.0, min_step_km=0.25, tolerance=10, sleep=0, concurrency=4, rate=1000
+    )
+    adaptive_requests = len(pvgis.requests)
+    uniform = client.fetch_bbox_geojson(bbox, step_km=0.25, sleep=0, concurrency=4, rate=1000)
+
+    assert adaptive_requests == len(adaptive["features"])
+    assert adaptive_requests < len(uniform["features"]) / 3
+    assert [f["id"] for f in adaptive["features"]] == list(range(1, adaptive_requests + 1))
+
+    # Same format as the uniform grid: loadable by load_solar_data
+    path = tmp_path / "adaptive_solar.json"
+    client.save_geojson(adaptive, path)
+    coords, values = load_solar_data(str(path))
+    assert coords.shape == (adaptive_requests, 2)
+
+    rng = np.random.default_rng(0)
+    queries = np.column_stack([rng.uniform(4.86, 4.94, 2000), rng.uniform(52.345, 52.395, 2000)])
+    truth = np.where(queries[:, 0] < 4.9, 1000.0, 1100.0)
+    errors = {}
+    for name, geojson in (("adaptive", adaptive), ("uniform", uniform)):
+        points = np.array([f["geometry"]["coordinates"] for f in geojson["features"]])
+        e_y = np.array([f["properties"]["E_y"] for f in geojson["features"]])
+        errors[name] = np.abs(griddata(points, e_y, queries, method="linear") - truth).mean()
+    assert errors["adaptive"] <= errors["uniform"] * 1.5
+
+
+def test_pvgis_fetch_adaptive_geojson_flat_field(stand_in_pvgis):
+    """A flat field keeps the initial grid."""
+    pvgis = stand_in_pvgis(energy=lambda lat, lon: 1000.0)
+    client = PVGISPVCalcClient(base_url=pvgis.url)
+    step = 1.0 / 111.0
+
+    geojson = client.fetch_adaptive_geojson(
+        (4.85, 52.34, 4.85 + 3 * step, 52.34 + 2 * step), initial_step_km=1.0, min_step_km=0.125,
+        sleep=0
+    )
+
+    assert len(geojson["features"]) == len(pvgis.requests) == 4 * 3
+    with pytest.raises(ValueError):
+        client.fetch_adaptive_geojson((4.85, 52.34, 4.9, 52.4), initial_step_km=0.1, min_step_km=0.5)
+
+
+def test_pvgis_fetch_adaptive_geojson_stays_inside_bbox(stand_in_pvgis):
+    """Cells overhanging the bbox never sample points outside it."""
+    pvgis = stand_in_pvgis(energy=lambda lat, lon: 1000.0 + 5000.0 * (lon - 4.85))
+    client = PVGISPVCalcClient(base_url=pvgis.url)
+    bbox = (4.85, 52.34, 4.873, 52.351)  # not a multiple of the initial step
+
+    geojson = client.fetch_adaptive_geojson(
+        bbox, initial_step_km=1.0, min_step_km=0.25, tolerance=10, sleep=0
+    )
+
+    coordinates = [tuple(f["geometry"]["coordinates"]) for f in geojson["features"]]
+    assert len(coordinates) == len(set(coordinates)) == len(pvgis.requests)
+    for lon, lat in coordinates:
+        assert bbox[0] <= lon <= bbox[2]
+        assert bbox[1] <= lat <= bbox[3]
+    # The clipped edge is still sampled
+    assert max(lon for lon, _ in coordinates) == bbox[2]
+    assert max(lat for _, lat in coordinates) == bbox[3]
+
+
 @patch('src.data_acquisition.requests.get')
 def test_pvgis_api_error_handling(mock_get):
     """Test PVGIS API error handling."""
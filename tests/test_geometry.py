@@ -5,6 +5,7 @@ Unit tests for geometry module.
 import pytest
 import numpy as np
 import json
+import os
 from pathlib import Path
 from shapely.geometry import Polygon, MultiPolygon, Point
 import geopandas as gpd
@@ -169,6 +170,78 @@ def test_get_roof_vertices_triangle():
 # Solar Data Tests
 # =============================================================================
 
+def _write_solar(path, points):
+    """Write solar points [(lon, lat, E_y), ...] as a FeatureCollection."""
+    features = [
+        {"type": "Feature", "geometry": {"type": "Point", "coordinates": [lon, lat]},
+         "properties": {"id": i, "E_y": e_y}}
+        for i, (lon, lat, e_y) in enumerate(points)
+    ]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+
+
+def test_load_solar_data(tmp_path):
+    """Coordinates are [lon, lat] rows and values E_y, in file order."""
+    path = tmp_path / "solar.json"
+    _write_solar(path, [(4.88, 52.36, 950.5), (4.89, 52.36, 960.0), (4.88, 52.37, None)])
+
+    coords, values = load_solar_data(str(path))
+
+    assert coords.shape == (3, 2) and coords.dtype == np.float64
+    np.testing.assert_array_equal(coords, [[4.88, 52.36], [4.89, 52.36], [4.88, 52.37]])
+    np.testing.assert_array_equal(values[:2], [950.5, 960.0])
+    assert np.isnan(values[2])
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("coordinates", [[4.88, 52.36, 1.5], [4.88]])
+def test_load_solar_data_rejects_malformed_points(tmp_path, coordinates, streaming):
+    """Points without exactly [lon, lat] raise instead of misaligning the arrays."""
+    if streaming:
+        pytest.importorskip("ijson")
+    path = tmp_path / "solar.json"
+    _write_solar(path, [(4.88, 52.36, 950.0), (4.89, 52.37, 960.0)])
+    data = json.loads(path.read_text())
+    data["features"][0]["geometry"]["coordinates"] = coordinates
+    path.write_text(json.dumps(data))
+
+    with pytest.raises(ValueError):
+        load_solar_data(str(path), streaming=streaming)
+
+
+def test_load_solar_data_cache(tmp_path, monkeypatch):
+    """The .npz cache is reused until the source file changes."""
+    path = tmp_path / "solar.json"
+    _write_solar(path, [(4.88, 52.36, 950.0), (4.89, 52.37, 960.0)])
+
+    coords, values = load_solar_data(str(path), use_cache=True)
+    assert (tmp_path / "solar.json.npz").exists()
+
+    with monkeypatch.context() as m:
+        m.setattr(json, "load", lambda f: pytest.fail("cache not used"))
+        cached_coords, cached_values = load_solar_data(str(path), use_cache=True)
+    np.testing.assert_array_equal(cached_coords, coords)
+    np.testing.assert_array_equal(cached_values, values)
+
+    _write_solar(path, [(4.88, 52.36, 1000.0)])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    coords, values = load_solar_data(str(path), use_cache=True)
+    np.testing.assert_array_equal(values, [1000.0])
+
+
+def test_load_solar_data_streaming(tmp_path):
+    pytest.importorskip("ijson")
+    path = tmp_path / "solar.json"
+    _write_solar(path, [(4.88, 52.36, 950.5), (4.89, 52.37, None)])
+
+    coords, values = load_solar_data(str(path))
+    streamed_coords, streamed_values = load_solar_data(str(path), streaming=True)
+
+    np.testing.assert_array_equal(streamed_coords, coords)
+    np.testing.assert_array_equal(streamed_values, values)
+
+
 def test_interpolate_solar_at_point_nearest():
     """Test solar interpolation using nearest neighbor."""
     coords = np.array([[0, 0], [10, 0], [0, 10], [10, 10]])
@@ -38,8 +38,9 @@ def test_spatial_index_creation(sample_buildings_gdf):
     
     assert spatial_index.kdtree is not None
     assert len(spatial_index.coordinates) == 5
-    assert spatial_index.buildings_gdf['x'].notna().all()
-    assert spatial_index.buildings_gdf['y'].notna().all()
+    assert not np.isnan(spatial_index.coordinates).any()
+    # The index references the frame instead of copying it
+    assert spatial_index.buildings_gdf is sample_buildings_gdf
 
 
 def test_find_nearest_neighbors(sample_buildings_gdf):
@@ -0,0 +1,171 @@
+"""
+Unit tests for vector tile module.
+"""
+
+import gzip
+import pytest
+import geopandas as gpd
+from shapely.geometry import Polygon, box
+from src.tiles import (
+    tile_bounds,
+    is_valid_tile,
+    tiles_for_bounds,
+    encode_polygon_geometry,
+    VectorTileRenderer,
+    MBTilesStore,
+    generate_tile_pyramid,
+    WEB_MERCATOR_ORIGIN
+)
+
+
+@pytest.fixture
+def sample_buildings_gdf():
+    """Create sample buildings around central Amsterdam."""
+    data = {
+        'building_id': ['A', 'B', 'C'],
+        'suitability_score': [92.5, 60.0, 30.0],
+        'category': ['Excellent', 'Good', 'Poor'],
+        'rank': [1, 2, 3],
+        'geometry': [
+            box(121000, 487000, 121020, 487015),
+            box(121100, 487100, 121130, 487120),
+            box(121200, 487000, 121210, 487010),
+        ]
+    }
+    return gpd.GeoDataFrame(data, crs="EPSG:28992")
+
+
+# Tile (z=14) containing the sample buildings
+TILE = (14, 8414, 5384)
+
+
+def test_tile_bounds_world():
+    """Test that the zoom 0 tile covers the whole Web Mercator world."""
+    minx, miny, maxx, maxy = tile_bounds(0, 0, 0)
+    assert minx == pytest.approx(-WEB_MERCATOR_ORIGIN)
+    assert maxy == pytest.approx(WEB_MERCATOR_ORIGIN)
+    assert maxx == pytest.approx(WEB_MERCATOR_ORIGIN)
+
+
+def test_is_valid_tile():
+    """Test tile coordinate validation."""
+    assert is_valid_tile(0, 0, 0)
+    assert is_valid_tile(3, 7, 7)
+    assert not is_valid_tile(3, 8, 0)
+    assert not is_valid_tile(-1, 0, 0)
+
+
+def test_tiles_for_bounds_roundtrip():
+    """Test that enumerated tiles cover the input bounds."""
+    bounds = tile_bounds(*TILE)
+    inner = (bounds[0] + 1, bounds[1] + 1, bounds[2] - 1, bounds[3] - 1)
+    assert list(tiles_for_bounds(inner, 14)) == [TILE]
+    assert len(list(tiles_for_bounds(inner, 15))) == 4
+
+
+def test_encode_polygon_geometry_commands():
+    """Test MVT command encoding of a square."""
+    square = Polygon([(0, 0), (0, 10), (10, 10), (10, 0)])
+    commands = encode_polygon_geometry(square)
+
+    # MoveTo(1), 2 params, LineTo(3), 6 params, ClosePath
+    assert commands[0] == 9
+    assert commands[3] == (2 | (3 << 3))
+    assert commands[-1] == 15
+    assert len(commands) == 1 + 2 + 1 + 6 + 1
+
+
+def test_render_tile_contains_buildings(sample_buildings_gdf):
+    """Test that a tile over the buildings is encoded with attributes."""
+    renderer = VectorTileRenderer(sample_buildings_gdf)
+    tile = renderer.render_tile(*TILE)
+
+    assert len(tile) > 0
+    assert b'buildings' in tile
+    assert b'suitability_score' in tile
+    assert b'Excellent' in tile
+
+
+def test_render_tile_empty(sample_buildings_gdf):
+    """Test that tiles away from the buildings are empty."""
+    renderer = VectorTileRenderer(sample_buildings_gdf)
+    assert renderer.render_tile(14, 0, 0) == b''
+
+
+def test_render_tile_decodes(sample_buildings_gdf):
+    """Test the tile against an independent MVT decoder."""
+    mapbox_vector_tile = pytest.importorskip("mapbox_vector_tile")
+    renderer = VectorTileRenderer(sample_buildings_gdf)
+    decoded = mapbox_vector_tile.decode(renderer.render_tile(*TILE))
+
+    features = decoded['buildings']['features']
+    assert len(features) == 3
+    scores = sorted(f['properties']['suitability_score'] for f in features)
+    assert scores == [30.0, 60.0, 92.5]
+    assert all(f['geometry']['type'] == 'Polygon' for f in features)
+
+
+def test_tile_cache(sample_buildings_gdf, tmp_path):
+    """Test the LRU and on-disk tile caches."""
+    renderer = VectorTileRenderer(sample_buildings_gdf, cache_size=1, cache_dir=tmp_path)
+    tile = renderer.get_tile(*TILE)
+
+    assert (tmp_path / '14' / '8414' / '5384.mvt').read_bytes() == tile
+    renderer.get_tile(14, 0, 0)
+    assert len(renderer._cache) == 1
+
+    # Served from disk after the memory cache evicted it
+    assert renderer.get_tile(*TILE) == tile
+
+
+def test_renderer_requires_crs(sample_buildings_gdf):
+    """Test that buildings without CRS are rejected."""
+    with pytest.raises(ValueError, match="no CRS"):
+        VectorTileRenderer(sample_buildings_gdf.set_crs(None, allow_override=True))
+
+
+def test_render_png(sample_buildings_gdf):
+    """Test choropleth raster tile rendering."""
+    pytest.importorskip("PIL")
+    renderer = VectorTileRenderer(sample_buildings_gdf)
+
+    png = renderer.render_png(*TILE)
+    assert png.startswith(b'\x89PNG')
+    assert renderer.render_png(14, 0, 0) == b''
+
+
+def test_generate_tile_pyramid_directory(sample_buildings_gdf, tmp_path):
+    """Test pyramid generation into a directory store."""
+    summary = generate_tile_pyramid(
+        sample_buildings_gdf, tmp_path, min_zoom=13, max_zoom=14,
+        formats=['mvt', 'png'], workers=1
+    )
+
+    assert summary['tiles']['mvt'] >= 2
+    assert summary['tiles']['png'] == summary['tiles']['mvt']
+    assert (tmp_path / '14' / '8414' / '5384.mvt').exists()
+    assert (tmp_path / '14' / '8414' / '5384.png').exists()
+
+
+def test_generate_tile_pyramid_mbtiles_parallel(sample_buildings_gdf, tmp_path):
+    """Test parallel pyramid generation into an MBTiles store."""
+    output = tmp_path / 'buildings.mbtiles'
+    summary = generate_tile_pyramid(
+        sample_buildings_gdf, output, min_zoom=14, max_zoom=15, workers=2
+    )
+    assert summary['tiles']['mvt'] >= 2
+
+    store = MBTilesStore(output)
+    tile = store.get(*TILE, 'mvt')
+    store.close()
+
+    renderer = VectorTileRenderer(sample_buildings_gdf)
+    assert gzip.decompress(tile) == renderer.render_tile(*TILE)
+
+
+def test_mbtiles_single_format(sample_buildings_gdf, tmp_path):
+    """Test that MBTiles output rejects multiple formats."""
+    with pytest.raises(ValueError, match="single tile format"):
+        generate_tile_pyramid(
+            sample_buildings_gdf, tmp_path / 'x.mbtiles', formats=['mvt', 'png']
+        )
@@ -0,0 +1,421 @@
+"""Load-testing harness for the solar suitability API.
+
+Starts the API locally, drives concurrent requests against every endpoint
+and reports requests per second, p50/p95/p99 latency and server memory per
+endpoint as a JSON artifact.
+
+Scenarios:
+    endpoints  each endpoint on its own, for --duration seconds
+    mix        a weighted mix of all endpoints, while slow clients stream
+               large GeoJSON exports
+
+Serving modes:
+    wsgi  Flask server (threaded), as started by `python src/api.py`
+    asgi  ASGI adapter on uvicorn (`python -m src.asgi`)
+
+Without --data, a synthetic city of --rows buildings is generated first
+(see tools/synthetic_city.py).
+
+Usage:
+    python tools/load_test.py --rows 100000 --duration 10 --output load_test.json
+    python tools/load_test.py --data data --modes wsgi asgi --scenarios mix \
+        --concurrency 16 --slow-clients 8
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import geopandas as gpd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "tools"))
+
+from synthetic_city import generate_city, write_city  # noqa: E402
+
+# A request: (method, path, JSON body or None)
+Request = Tuple[str, str, Optional[bytes]]
+
+SLOW_CLIENT_PATH = "/map/geojson?format=ndjson"
+
+
+# ============================================================================
+# Request mix
+# ============================================================================
+
+def _tile(lon: float, lat: float, z: int) -> Tuple[int, int]:
+    n = 2 ** z
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return x, y
+
+
+def build_endpoints(buildings: gpd.GeoDataFrame, sample_size: int = 1000,
+                    seed: int = 0) -> Dict[str, Tuple[int, Callable[[random.Random], Request]]]:
+    """
+    Request generators for every endpoint, with weights for the mix.
+
+    Requests are parameterized with ids and locations sampled from the
+    served dataset, so they hit real buildings.
+    """
+    rng = np.random.default_rng(seed)
+    sample = buildings.iloc[rng.choice(len(buildings), min(sample_size, len(buildings)), replace=False)]
+    ids = sample["building_id"].astype(str).tolist()
+    centroids = sample.geometry.centroid.to_crs("EPSG:4326")
+    points = list(zip(centroids.x.tolist(), centroids.y.tolist()))
+
+    def point(r):
+        return r.choice(points)
+
+    def bbox(r):
+        lon, lat = point(r)
+        return f"min_lon={lon - 0.002}&min_lat={lat - 0.0015}&max_lon={lon + 0.002}&max_lat={lat + 0.0015}"
+
+    def tile(r):
+        lon, lat = point(r)
+        x, y = _tile(lon, lat, 15)
+        return f"/tiles/15/{x}/{y}.mvt"
+
+    def batch(r):
+        body = json.dumps({"ids": r.sample(ids, min(200, len(ids)))}).encode()
+        return ("POST", "/buildings/batch", body)
+
+    get = lambda path: ("GET", path, None)  # noqa: E731
+    return {
+        "home": (1, lambda r: get("/")),
+        "health": (1, lambda r: get("/health")),
+        "buildings": (6, lambda r: get(f"/buildings?limit=100&offset={r.randrange(0, 5000)}")),
+        "buildings_filtered": (3, lambda r: get(f"/buildings?min_score={r.randrange(40, 90)}&limit=100")),
+        "buildings_cursor": (2, lambda r: get("/buildings?limit=100&cursor=")),
+        "buildings_ndjson": (1, lambda r: get("/buildings?format=ndjson&min_score=85&limit=5000")),
+        "building": (6, lambda r: get(f"/buildings/{r.choice(ids)}")),
+        "suitability": (6, lambda r: get(f"/buildings/{r.choice(ids)}/suitability")),
+        "building_geojson": (3, lambda r: get(f"/buildings/{r.choice(ids)}/geojson")),
+        "batch": (1, batch),
+        "nearest": (4, lambda r: get("/buildings/nearest?lon={}&lat={}&k=10".format(*point(r)))),
+        "within": (3, lambda r: get("/buildings/within?lon={}&lat={}&radius=200".format(*point(r)))),
+        "bbox": (3, lambda r: get(f"/buildings/bbox?{bbox(r)}")),
+        "priority": (2, lambda r: get(f"/priority?top_n={r.choice([10, 50, 100])}")),
+        "stats": (2, lambda r: get("/stats")),
+        "map_geojson": (2, lambda r: get(f"/map/geojson?min_score={r.randrange(60, 95)}&limit=1000")),
+        "aggregate": (2, lambda r: get(
+            f"/aggregate?cell={r.choice([250, 500, 1000])}&shape={r.choice(['square', 'hex'])}")),
+        "tiles": (4, lambda r: get(tile(r))),
+    }
+
+
+# ============================================================================
+# Server control
+# ============================================================================
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode: str, port: int, data_path: Path, threads: int = 16) -> subprocess.Popen:
+    """Start the API in a subprocess in the given serving mode."""
+    env = dict(os.environ, SOLAR_API_DATA=str(data_path), SOLAR_API_THREADS=str(threads))
+    if mode == "wsgi":
+        command = [
+            sys.executable, "-c",
+            "from src.api import app, start_background_loading; "
+            "start_background_loading(); "
+            f"app.run(host='127.0.0.1', port={port}, threaded=True)"
+        ]
+    elif mode == "asgi":
+        command = [sys.executable, "-m", "src.asgi", "--host", "127.0.0.1",
+                   "--port", str(port), "--threads", str(threads)]
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_ready(port: int, timeout: float = 600.0) -> float:
+    """Poll /health until the data is loaded; returns the seconds waited."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/health")
+            response = conn.getresponse()
+            response.read()
+            conn.close()
+            if response.status == 200:
+                return time.perf_counter() - start
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"API on port {port} not ready after {timeout:.0f}s")
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process in MB (Linux /proc; None elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024.0, 1)
+    except OSError:
+        pass
+    return None
+
+
+class MemorySampler:
+    """Sample the resident memory of a process in the background."""
+
+    def __init__(self, pid: int, interval: float = 0.1):
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[float] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            value = rss_mb(self.pid)
+            if value is not None:
+                self.samples.append(value)
+
+    def __enter__(self):
+        self.start_mb = rss_mb(self.pid)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.end_mb = rss_mb(self.pid)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        return {
+            "rss_start_mb": self.start_mb,
+            "rss_peak_mb": max(self.samples) if self.samples else self.end_mb,
+            "rss_end_mb": self.end_mb,
+        }
+
+
+# ============================================================================
+# Load generation
+# ============================================================================
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    """Throughput and latency percentiles (milliseconds) of one endpoint."""
+    values = np.asarray(latencies) * 1000.0
+    summary = {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    for p in (50, 95, 99):
+        summary[f"p{p}_ms"] = round(float(np.percentile(values, p)), 2) if len(values) else None
+    return summary
+
+
+def slow_client(port: int, path: str, stop: threading.Event, chunk: int = 4096,
+                pause: float = 0.05):
+    """Download a large response slowly, over and over, until stopped."""
+    while not stop.is_set():
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            conn.request("GET", path)
+            response = conn.getresponse()
+            while not stop.is_set() and response.read(chunk):
+                time.sleep(pause)
+            conn.close()
+        except OSError:
+            time.sleep(pause)
+
+
+def run_load(port: int, endpoints: Dict[str, Tuple[int, Callable]], concurrency: int = 16,
+             duration: float = 20.0, slow_clients: int = 0,
+             seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Drive a weighted request mix with `concurrency` closed-loop clients.
+
+    Returns per-endpoint throughput/latency summaries (plus `_all`).
+    """
+    names = list(endpoints)
+    weights = [endpoints[name][0] for name in names]
+
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def worker(worker_id: int):
+        rng = random.Random(seed + worker_id)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        while not stop.is_set():
+            name = rng.choices(names, weights)[0]
+            method, path, body = endpoints[name][1](rng)
+            headers = {"Content-Type": "application/json"} if body else {}
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status < 500
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    latencies[name].append(elapsed)
+                else:
+                    errors[name] += 1
+        conn.close()
+
+    slow_stop = threading.Event()
+    slow_threads = [
+        threading.Thread(target=slow_client, args=(port, SLOW_CLIENT_PATH, slow_stop), daemon=True)
+        for _ in range(slow_clients)
+    ]
+    for thread in slow_threads:
+        thread.start()
+    time.sleep(0.5 if slow_clients else 0)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    slow_stop.set()
+
+    results = {name: summarize(latencies[name], errors[name], elapsed) for name in names}
+    results["_all"] = summarize(
+        [value for values in latencies.values() for value in values],
+        sum(errors.values()), elapsed
+    )
+    return results
+
+
+def run_mode(mode: str, data_path: Path, endpoints, scenarios: List[str], threads: int,
+             concurrency: int, duration: float, slow_clients: int) -> Dict:
+    """Start the API in one mode, run the scenarios and shut it down."""
+    port = free_port()
+    server = start_server(mode, port, data_path, threads)
+    result: Dict = {}
+    try:
+        result["ready_seconds"] = round(wait_ready(port), 2)
+        result["rss_ready_mb"] = rss_mb(server.pid)
+        print(f"[{mode}] ready after {result['ready_seconds']:.1f}s "
+              f"({result['rss_ready_mb']} MB)")
+
+        if "endpoints" in scenarios:
+            result["endpoints"] = {}
+            for name in endpoints:
+                print(f"[{mode}] {name}...")
+                with MemorySampler(server.pid) as memory:
+                    stats = run_load(port, {name: endpoints[name]}, concurrency, duration)[name]
+                result["endpoints"][name] = {**stats, **memory.summary()}
+
+        if "mix" in scenarios:
+            print(f"[{mode}] mix with {slow_clients} slow clients...")
+            with MemorySampler(server.pid) as memory:
+                mix = run_load(port, endpoints, concurrency, duration, slow_clients)
+            result["mix"] = {"endpoints": mix, **memory.summary()}
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    return result
+
+
+def print_table(title: str, rows: Dict[str, Dict]):
+    print(f"\n{title}")
+    print(f"  {'endpoint':<20} {'req':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} "
+          f"{'p99':>8} {'rss MB':>8}")
+    for name, s in rows.items():
+        p = [f"{s[k]:.1f}" if s[k] is not None else "-" for k in ("p50_ms", "p95_ms", "p99_ms")]
+        rss = s.get("rss_peak_mb")
+        print(f"  {name:<20} {s['requests']:>7} {s['errors']:>5} {s['rps']:>8} "
+              f"{p[0]:>8} {p[1]:>8} {p[2]:>8} {rss if rss is not None else '':>8}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load test the solar suitability API")
+    parser.add_argument("--data", help="data directory served by the API "
+                                       "(default: generate a synthetic city)")
+    parser.add_argument("--rows", type=int, default=100000,
+                        help="buildings in the synthetic city (10k-1M)")
+    parser.add_argument("--modes", nargs="+", default=["wsgi", "asgi"], choices=["wsgi", "asgi"])
+    parser.add_argument("--scenarios", nargs="+", default=["endpoints", "mix"],
+                        choices=["endpoints", "mix"])
+    parser.add_argument("--only", nargs="+", help="restrict to these endpoints")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--slow-clients", type=int, default=8,
+                        help="clients slowly downloading large exports during the mix")
+    parser.add_argument("--threads", type=int, default=16, help="ASGI worker threads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="load_test.json", help="JSON artifact")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="solar-load-") as tmp:
+        if args.data:
+            data_path = Path(args.data).resolve()
+            buildings = gpd.read_file(data_path / "ranked_buildings.json")
+        else:
+            data_path = Path(tmp)
+            start = time.perf_counter()
+            buildings = generate_city(args.rows, args.seed)
+            write_city(buildings, data_path)
+            print(f"✓ Generated synthetic city of {len(buildings)} buildings "
+                  f"in {time.perf_counter() - start:.1f}s")
+
+        endpoints = build_endpoints(buildings, seed=args.seed)
+        if args.only:
+            endpoints = {name: spec for name, spec in endpoints.items() if name in args.only}
+
+        report = {
+            "config": {
+                "data": args.data or f"synthetic:{args.rows}", "buildings": len(buildings),
+                "duration": args.duration, "concurrency": args.concurrency,
+                "slow_clients": args.slow_clients, "threads": args.threads,
+                "scenarios": args.scenarios,
+            },
+            "modes": {},
+        }
+        del buildings
+
+        for mode in args.modes:
+            result = run_mode(
+                mode, data_path, endpoints, args.scenarios, args.threads,
+                args.concurrency, args.duration, args.slow_clients
+            )
+            report["modes"][mode] = result
+            if "endpoints" in result:
+                print_table(f"{mode.upper()} - endpoints", result["endpoints"])
+            if "mix" in result:
+                print_table(f"{mode.upper()} - mix (peak {result['mix']['rss_peak_mb']} MB)",
+                            result["mix"]["endpoints"])
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
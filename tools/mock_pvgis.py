@@ -0,0 +1,182 @@
+"""Local mock of the PVGIS PVcalc API, and a grid-fetch benchmark against it.
+
+The mock answers PVcalc requests with a smooth synthetic E_y after a
+configurable latency and enforces a per-second rate limit like PVGIS
+(429 with Retry-After beyond the limit). The test suite runs the same mock
+(tests/test_data_acquisition.py).
+
+Usage:
+    # Serve the mock on port 8081
+    python tools/mock_pvgis.py serve --port 8081 --latency 0.2 --limit 30
+
+    # Benchmark sequential vs concurrent grid fetching against the mock
+    python tools/mock_pvgis.py benchmark --step-km 0.5 --concurrency 1 4 8 16
+"""
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.data_acquisition import PVGISPVCalcClient  # noqa: E402
+
+AMSTERDAM_BBOX = (4.728, 52.278, 5.079, 52.431)
+
+
+def mock_energy(lat: float, lon: float) -> float:
+    """Synthetic annual PV energy of 1 kWp at 14% loss (kWh/year), smooth with some local variation."""
+    return 950.0 - 40.0 * (lat - 52.0) + 15.0 * math.sin(lon * 40.0) * math.cos(lat * 30.0)
+
+
+class MockPVGIS:
+    """
+    Threaded HTTP server imitating PVGIS PVcalc.
+
+    E_y comes from `energy(lat, lon)` (for 1 kWp at 14% loss), scaled by
+    the requested peakpower and loss. Admitted requests are recorded in
+    `requests` (query parameters) and `times`, with the peak number of
+    concurrent requests in `max_in_flight`; `limit=None` disables the
+    rate limit.
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.2, limit: Optional[int] = 30,
+                 energy: Callable[[float, float], float] = mock_energy):
+        self.latency = latency
+        self.limit = limit
+        self.energy = energy
+        self.requests: List[dict] = []
+        self.times: List[float] = []
+        self.rejected = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._recent = deque()
+        self._lock = threading.Lock()
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                if not mock._admit(params):
+                    self.send_response(429)
+                    self.send_header("Retry-After", "1")
+                    self.end_headers()
+                    return
+                time.sleep(mock.latency)
+                e_y = mock.energy_at(float(params["lat"]), float(params["lon"]),
+                                     float(params.get("peakpower", 1)), float(params.get("loss", 14)))
+                with mock._lock:
+                    mock.in_flight -= 1
+                body = json.dumps({"outputs": {"totals": {"fixed": {"E_y": e_y}}}}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/v5_3/PVcalc"
+
+    def energy_at(self, lat: float, lon: float, peakpower: float = 1.0, loss: float = 14.0) -> float:
+        """E_y served for a request (kWh/year)."""
+        return round(self.energy(lat, lon) * peakpower * (1 - loss / 100) / 0.86, 3)
+
+    def _admit(self, params: dict) -> bool:
+        """Sliding one-second window rate limit; records admitted requests."""
+        with self._lock:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            if self.limit is not None and len(self._recent) >= self.limit:
+                self.rejected += 1
+                return False
+            self._recent.append(now)
+            self.requests.append(params)
+            self.times.append(now)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return True
+
+    def start(self) -> "MockPVGIS":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def benchmark(bbox, step_km: float, levels: List[int], latency: float, limit: int,
+              rate: float) -> List[dict]:
+    """Fetch the grid at each concurrency level and time it."""
+    results = []
+    for concurrency in levels:
+        mock = MockPVGIS(latency=latency, limit=limit).start()
+        client = PVGISPVCalcClient(base_url=mock.url)
+        start = time.perf_counter()
+        geojson = client.fetch_bbox_geojson(
+            bbox, step_km=step_km, sleep=0.05, concurrency=concurrency, rate=rate
+        )
+        elapsed = time.perf_counter() - start
+        mock.stop()
+        points = len(geojson["features"])
+        results.append({
+            "concurrency": concurrency, "points": points, "seconds": round(elapsed, 2),
+            "points_per_second": round(points / elapsed, 1), "rejected_429": mock.rejected,
+        })
+        print(f"  concurrency {concurrency:>3}: {points} points in {elapsed:6.1f}s "
+              f"({points / elapsed:5.1f}/s, {mock.rejected} rejected)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock PVGIS PVcalc server and benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="run the mock server")
+    serve.add_argument("--port", type=int, default=8081)
+    serve.add_argument("--latency", type=float, default=0.2, help="seconds per request")
+    serve.add_argument("--limit", type=int, default=30, help="requests per second")
+
+    bench = sub.add_parser("benchmark", help="time grid fetching against the mock")
+    bench.add_argument("--bbox", type=float, nargs=4, default=AMSTERDAM_BBOX)
+    bench.add_argument("--step-km", type=float, default=1.0)
+    bench.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    bench.add_argument("--latency", type=float, default=0.2)
+    bench.add_argument("--limit", type=int, default=30)
+    bench.add_argument("--rate", type=float, default=PVGISPVCalcClient.RATE_LIMIT,
+                       help="client rate limit (requests per second)")
+    bench.add_argument("--output", help="JSON results")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        mock = MockPVGIS(args.port, args.latency, args.limit)
+        print(f"Mock PVGIS on {mock.url} (latency {args.latency}s, {args.limit} req/s)")
+        try:
+            mock.server.serve_forever()
+        except KeyboardInterrupt:
+            mock.stop()
+        return
+
+    print(f"PVGIS grid fetch, step {args.step_km} km, latency {args.latency}s, "
+          f"server limit {args.limit}/s, client rate {args.rate}/s")
+    results = benchmark(tuple(args.bbox), args.step_km, args.concurrency,
+                        args.latency, args.limit, args.rate)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Generate a synthetic ranked-buildings dataset for load testing the API.
+
+Buildings are laid out in city blocks (rows of terraced houses along
+streets, blocks rotated independently) in EPSG:28992 around Amsterdam.
+Footprints are rectangles or L-shapes of realistic sizes, and the solar
+attributes are derived from the footprint like the pipeline does:
+roof area -> energy potential -> suitability score -> category -> rank.
+
+Usage:
+    python tools/synthetic_city.py --rows 100000 --output data/synthetic
+    python tools/synthetic_city.py --rows 1000000 --output data/synthetic --columnar
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import geopandas as gpd
+import shapely
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+# South-west corner of the synthetic city (EPSG:28992, Amsterdam)
+CITY_ORIGIN = (118000.0, 484000.0)
+
+LOT_WIDTH = 12.0      # average frontage per building (m)
+ROW_DEPTH = 30.0      # lot depth of one row of buildings (m)
+BLOCK_LOTS = 8        # buildings per row in a block
+STREET_WIDTH = 15.0   # street between blocks (m)
+
+
+def _block_layout(n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lot centre coordinates and block rotation of n buildings."""
+    per_block = 2 * BLOCK_LOTS  # two back-to-back rows per block
+    n_blocks = int(np.ceil(n / per_block))
+    blocks_per_side = int(np.ceil(np.sqrt(n_blocks)))
+
+    block_w = BLOCK_LOTS * LOT_WIDTH + STREET_WIDTH
+    block_h = 2 * ROW_DEPTH + STREET_WIDTH
+    block = np.arange(n) // per_block
+    lot = np.arange(n) % per_block
+    bx = (block % blocks_per_side) * block_w
+    by = (block // blocks_per_side) * block_h
+
+    # Lot position inside the block, relative to the block centre
+    lx = ((lot % BLOCK_LOTS) + 0.5) * LOT_WIDTH - BLOCK_LOTS * LOT_WIDTH / 2
+    ly = np.where(lot < BLOCK_LOTS, -ROW_DEPTH / 2, ROW_DEPTH / 2)
+
+    angles = rng.normal(0, 0.15, n_blocks)[block]  # blocks follow slightly bent streets
+    cos, sin = np.cos(angles), np.sin(angles)
+    cx = CITY_ORIGIN[0] + bx + BLOCK_LOTS * LOT_WIDTH / 2 + lx * cos - ly * sin
+    cy = CITY_ORIGIN[1] + by + ROW_DEPTH + ly * cos + lx * sin
+    return cx, cy, angles
+
+
+def _footprints(cx, cy, angles, rng: np.random.Generator) -> np.ndarray:
+    """Rectangular and L-shaped footprints around the lot centres."""
+    n = len(cx)
+    width = rng.uniform(0.55, 0.95, n) * LOT_WIDTH
+    depth = rng.uniform(8.0, 0.8 * ROW_DEPTH, n)
+    l_shaped = rng.random(n) < 0.2
+
+    hw, hd = width / 2, depth / 2
+    # Rectangle corners (counter-clockwise), padded to the 6 vertices of an L
+    xs = np.column_stack([-hw, hw, hw, hw, -hw, -hw])
+    ys = np.column_stack([-hd, -hd, -hd, hd, hd, hd])
+    # L-shape: cut a notch of 40-60% out of the back corner
+    notch_w = rng.uniform(0.4, 0.6, n) * width
+    notch_d = rng.uniform(0.4, 0.6, n) * depth
+    xs[l_shaped] = np.column_stack([
+        -hw, hw, hw, hw - notch_w, hw - notch_w, -hw
+    ])[l_shaped]
+    ys[l_shaped] = np.column_stack([
+        -hd, -hd, hd - notch_d, hd - notch_d, hd, hd
+    ])[l_shaped]
+
+    cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    x = cx[:, None] + xs * cos - ys * sin
+    y = cy[:, None] + ys * cos + xs * sin
+    rings = np.stack([x, y], axis=-1)
+    rings = np.concatenate([rings, rings[:, :1]], axis=1)  # close the rings
+
+    # Rectangles only use 4 of the 6 vertices (the others are padding)
+    geometries = np.empty(n, dtype=object)
+    geometries[l_shaped] = shapely.polygons(rings[l_shaped])
+    geometries[~l_shaped] = shapely.polygons(rings[~l_shaped][:, [0, 1, 3, 4, 0]])
+    return geometries
+
+
+def generate_city(n: int = 10000, seed: int = 0) -> gpd.GeoDataFrame:
+    """
+    Generate a synthetic ranked-buildings dataset.
+
+    Parameters
+    ----------
+    n : int
+        Number of buildings
+    seed : int
+        Random seed
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        Buildings with the columns of ranked_buildings.json (EPSG:28992),
+        ordered by rank
+    """
+    rng = np.random.default_rng(seed)
+    cx, cy, angles = _block_layout(n, rng)
+    geometries = _footprints(cx, cy, angles, rng)
+
+    roof_area = shapely.area(geometries)
+    irradiance = rng.normal(1000.0, 40.0, n)
+    shading = rng.beta(2.0, 6.0, n)
+    orientation = (np.degrees(angles) + rng.choice([0, 90, 180, 270], n)) % 360
+    usable = roof_area * 0.7
+    energy = usable * irradiance * 0.18 * (1 - shading)
+
+    orientation_score = (1 + np.cos(np.radians(orientation - 180))) / 2
+    score = 100 * (
+        0.3 * np.clip(roof_area / 200, 0, 1)
+        + 0.3 * np.clip(energy / 25000, 0, 1)
+        + 0.25 * (1 - shading)
+        + 0.15 * orientation_score
+    )
+    category = np.select(
+        [score >= 80, score >= 60, score >= 40, score >= 20],
+        ["Excellent", "Good", "Moderate", "Poor"], "Unsuitable"
+    )
+    savings = energy * 0.25
+    payback = usable * 250.0 / np.maximum(savings, 1.0)
+
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.argsort(-score, kind='stable')] = np.arange(1, n + 1)
+
+    buildings = gpd.GeoDataFrame({
+        "building_id": np.char.add("NL.IMBAG.Pand.", np.arange(n).astype(str)),
+        "suitability_score": score.round(2),
+        "category": category,
+        "roof_area_m2": roof_area.round(1),
+        "solar_potential_kwh": energy.round(0),
+        "solar_irradiance": irradiance.round(1),
+        "shading_factor": shading.round(3),
+        "roof_orientation_deg": orientation.round(1),
+        "annual_savings_eur": savings.round(2),
+        "payback_period_years": payback.round(1),
+        "rank": rank,
+    }, geometry=geometries, crs="EPSG:28992")
+
+    # Ranked output is ordered by rank, like rank_buildings()
+    return buildings.iloc[np.argsort(rank)].reset_index(drop=True)
+
+
+def write_city(buildings: gpd.GeoDataFrame, output: Path, columnar: bool = False) -> Path:
+    """Write the dataset as <output>/ranked_buildings.json (and .cols)."""
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    path = output / "ranked_buildings.json"
+    buildings.to_file(path, driver="GeoJSON")
+    if columnar:
+        from src.columnar import write_columnar_dataset
+        write_columnar_dataset(buildings, output / "ranked_buildings.cols", source=path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic ranked-buildings dataset")
+    parser.add_argument("--rows", type=int, default=10000, help="number of buildings")
+    parser.add_argument("--output", default="data/synthetic", help="output directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--columnar", action="store_true",
+                        help="also write the memory-mapped columnar dataset")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    buildings = generate_city(args.rows, args.seed)
+    path = write_city(buildings, Path(args.output), args.columnar)
+    print(f"✓ Generated {len(buildings)} buildings in {path} "
+          f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()